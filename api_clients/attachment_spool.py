@@ -0,0 +1,118 @@
+"""
+Streaming attachment downloads with byte budgets.
+Attachments are written to spooled temporary files in chunks (memory first, disk past a
+threshold) so large solicitation packages never sit in worker RAM as one bytes object.
+"""
+
+import os
+import logging
+import tempfile
+import threading
+from typing import BinaryIO, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Defaults sized for DLA/NAVSUP solicitation packages
+DEFAULT_MAX_BYTES_PER_DOC = 100 * 1024 * 1024          # 100 MB
+DEFAULT_MAX_BYTES_PER_OPPORTUNITY = 250 * 1024 * 1024  # 250 MB
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024               # Keep up to 8 MB in memory, then roll to disk
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+class AttachmentTooLarge(Exception):
+    """Raised when a download would exceed its per-document or per-opportunity byte cap."""
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is abandoned because its opportunity no longer needs it."""
+
+
+class ByteBudget:
+    """Thread-safe byte allowance shared by all attachment downloads of one opportunity."""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def reserve(self, n: int) -> None:
+        """Claim n bytes, raising AttachmentTooLarge if the opportunity budget would be exceeded."""
+        with self._lock:
+            if self.limit is not None and self.used + n > self.limit:
+                raise AttachmentTooLarge(f"per-opportunity byte cap of {self.limit:,} bytes reached")
+            self.used += n
+
+    def release(self, n: int) -> None:
+        """Return bytes claimed by a download that was abandoned."""
+        with self._lock:
+            self.used = max(0, self.used - n)
+
+
+def new_spool_file(spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE, spool_dir: Optional[str] = None) -> BinaryIO:
+    """Create a spooled temp file that stays in memory up to spool_max_size bytes."""
+    if spool_dir:
+        os.makedirs(spool_dir, exist_ok=True)
+    return tempfile.SpooledTemporaryFile(max_size=spool_max_size, mode='w+b', dir=spool_dir)
+
+
+def check_declared_size(content_length: Optional[str], max_bytes_per_doc: Optional[int]) -> None:
+    """Reject a download up front when its Content-Length already exceeds the per-document cap."""
+    if not content_length or max_bytes_per_doc is None:
+        return
+    try:
+        declared = int(content_length)
+    except (TypeError, ValueError):
+        return
+    if declared > max_bytes_per_doc:
+        raise AttachmentTooLarge(f"Content-Length {declared:,} exceeds per-document cap of {max_bytes_per_doc:,} bytes")
+
+
+class SpoolWriter:
+    """
+    Writes downloaded chunks to a spool file while enforcing both byte caps.
+
+    Used by the sync client (requests iter_content) and the async client
+    (aiohttp iter_chunked) so both apply identical limits.
+    """
+
+    def __init__(self, budget: ByteBudget, max_bytes_per_doc: Optional[int],
+                 spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE, spool_dir: Optional[str] = None):
+        self.budget = budget
+        self.max_bytes_per_doc = max_bytes_per_doc
+        self.file = new_spool_file(spool_max_size, spool_dir)
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        if self.max_bytes_per_doc is not None and self.size + len(chunk) > self.max_bytes_per_doc:
+            raise AttachmentTooLarge(f"per-document byte cap of {self.max_bytes_per_doc:,} bytes exceeded")
+        self.budget.reserve(len(chunk))
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def write_all(self, chunks: Iterable[bytes], cancel: Optional[threading.Event] = None) -> None:
+        """Write every chunk; if `cancel` gets set, stop at the next chunk with DownloadCancelled."""
+        for chunk in chunks:
+            if cancel is not None and cancel.is_set():
+                raise DownloadCancelled("download cancelled")
+            self.write(chunk)
+
+    def finish(self) -> BinaryIO:
+        """Rewind and hand over the spool file (the caller owns closing it)."""
+        self.file.seek(0)
+        return self.file
+
+    def abort(self) -> None:
+        """Discard a partial download and give its bytes back to the opportunity budget."""
+        self.budget.release(self.size)
+        self.file.close()
+        self.size = 0
+
+
+def read_spooled(content_file: BinaryIO) -> bytes:
+    """Read a spool file from the start without disturbing its position for later readers."""
+    content_file.seek(0)
+    data = content_file.read()
+    content_file.seek(0)
+    return data
@@ -0,0 +1,181 @@
+"""
+Content-addressed attachment store.
+Blobs are stored once per sha256 no matter how many opportunities attach them
+(SOWs, wage determinations, DLA boilerplate). A separate URL index remembers which
+hash and validators (ETag / Last-Modified) each download URL last returned, so repeat
+runs can send conditional GETs and skip unchanged downloads entirely.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import BinaryIO, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that must never become part of a cache key
+_SECRET_PARAMS = {'api_key'}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a document URL for indexing: drop the API key and sort the query string."""
+    parsed = urlparse(url)
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if k not in _SECRET_PARAMS)
+    return urlunparse(parsed._replace(query=urlencode(query), fragment=''))
+
+
+def sha256_file(content_file: BinaryIO, block_size: int = 1024 * 1024) -> str:
+    """Hash a binary file in blocks and rewind it."""
+    digest = hashlib.sha256()
+    content_file.seek(0)
+    for block in iter(lambda: content_file.read(block_size), b''):
+        digest.update(block)
+    content_file.seek(0)
+    return digest.hexdigest()
+
+
+class AttachmentStore:
+    """
+    sha256 blob store plus URL -> hash index for attachment downloads.
+
+    Layout:
+        <root>/blobs/<aa>/<sha256>   attachment bytes, written once
+        <root>/blobs.json           sha256 -> {size, content_type, text_preview, first_seen}
+        <root>/urls.json            normalized URL -> {sha256, etag, last_modified, fetched_at}
+    """
+
+    def __init__(self, root: str = "attachment_store"):
+        """
+        Open (or create) a store rooted at the given directory.
+
+        Args:
+            root: Directory holding blobs and the two JSON indexes
+        """
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._blobs_file = os.path.join(root, 'blobs.json')
+        self._urls_file = os.path.join(root, 'urls.json')
+        self._lock = threading.Lock()
+        self.blobs: Dict[str, Dict] = self._load(self._blobs_file)
+        self.urls: Dict[str, Dict] = self._load(self._urls_file)
+
+    @staticmethod
+    def _load(path: str) -> Dict:
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load attachment index {path}: {e} - starting empty")
+            return {}
+
+    @staticmethod
+    def _write_json(path: str, data: Dict) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def save(self) -> None:
+        """Persist both indexes atomically."""
+        with self._lock:
+            self._write_json(self._blobs_file, self.blobs)
+            self._write_json(self._urls_file, self.urls)
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256[:2], sha256)
+
+    def has_blob(self, sha256: str) -> bool:
+        return sha256 in self.blobs and os.path.exists(self.blob_path(sha256))
+
+    def open_blob(self, sha256: str) -> BinaryIO:
+        """Open a stored attachment for reading (the caller closes it)."""
+        return open(self.blob_path(sha256), 'rb')
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Validators for a conditional GET of this URL.
+
+        Only offered when the blob they describe is still on disk; otherwise a 304
+        would leave us with nothing to serve.
+        """
+        entry = self.urls.get(normalize_url(url))
+        if not entry or not self.has_blob(entry.get('sha256', '')):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def resolve_not_modified(self, url: str) -> Tuple[str, Dict]:
+        """
+        Look up the stored blob for a URL that just answered 304 Not Modified.
+
+        Returns:
+            (sha256, blob metadata)
+        """
+        entry = self.urls[normalize_url(url)]
+        sha256 = entry['sha256']
+        with self._lock:
+            entry['fetched_at'] = datetime.now().isoformat()
+        return sha256, self.blobs.get(sha256, {})
+
+    def ingest(self, url: str, content_file: BinaryIO, response_headers: Mapping[str, str],
+               content_type: str = '') -> Tuple[str, bool]:
+        """
+        Record a freshly downloaded attachment.
+
+        The file is hashed; its bytes are copied into the blob store only if this hash
+        has never been seen. The URL index is updated with the response validators.
+
+        Args:
+            url: Download URL (normalized internally, API key removed)
+            content_file: Seekable binary file holding the download (rewound on return)
+            response_headers: Response headers (ETag / Last-Modified are recorded)
+            content_type: Lower-cased Content-Type of the response
+
+        Returns:
+            (sha256, already_known) - already_known is True when the content was in the store
+        """
+        sha256 = sha256_file(content_file)
+        already_known = self.has_blob(sha256)
+
+        if not already_known:
+            path = self.blob_path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as out:
+                shutil.copyfileobj(content_file, out, 1024 * 1024)
+            os.replace(tmp_path, path)
+            content_file.seek(0)
+
+        with self._lock:
+            blob = self.blobs.setdefault(sha256, {'first_seen': datetime.now().isoformat()})
+            blob['size'] = os.path.getsize(self.blob_path(sha256))
+            if content_type:
+                blob['content_type'] = content_type
+            self.urls[normalize_url(url)] = {
+                'sha256': sha256,
+                'etag': response_headers.get('ETag') or response_headers.get('etag'),
+                'last_modified': response_headers.get('Last-Modified') or response_headers.get('last-modified'),
+                'fetched_at': datetime.now().isoformat()
+            }
+        return sha256, already_known
+
+    def get_text_preview(self, sha256: str) -> Optional[str]:
+        """Preview text extracted the first time this blob was seen, if any."""
+        return self.blobs.get(sha256, {}).get('text_preview')
+
+    def set_text_preview(self, sha256: str, text_preview: str) -> None:
+        with self._lock:
+            if sha256 in self.blobs:
+                self.blobs[sha256]['text_preview'] = text_preview
@@ -0,0 +1,595 @@
+"""
+Native asyncio HigherGov API client.
+Async sibling of EnhancedHigherGovClient: same methods, one event loop and
+semaphore-bounded concurrency so hundreds of detail and document requests can be
+in flight at once. BlockingHigherGovClient wraps it for existing synchronous scripts.
+"""
+
+import os
+import asyncio
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+import aiohttp
+from dotenv import load_dotenv
+
+from api_clients.highergov_client_enhanced import DEFAULT_BASE_URL, EnhancedHigherGovClient
+from api_clients.attachment_store import AttachmentStore
+from api_clients.response_cache import ResponseCache, STALE
+from api_clients.resilience import (
+    CircuitBreaker, HigherGovAPIError, RetryPolicy, TokenBucket, parse_retry_after,
+    DEFAULT_BURST, DEFAULT_REQUESTS_PER_SECOND
+)
+from api_clients.attachment_spool import (
+    AttachmentTooLarge, ByteBudget, SpoolWriter, check_declared_size,
+    DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BYTES_PER_DOC, DEFAULT_MAX_BYTES_PER_OPPORTUNITY, DEFAULT_SPOOL_MAX_SIZE
+)
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHigherGovClient:
+    """
+    Asyncio HigherGov API client for the SOS opportunity assessment pipeline.
+
+    Use as an async context manager so the underlying aiohttp session is closed:
+
+        async with AsyncHigherGovClient() as client:
+            details = await client.gather_opportunity_details(ids)
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = 50, max_concurrent_downloads: int = 4,
+                 request_timeout: float = 60, download_timeout: float = 45,
+                 max_bytes_per_doc: Optional[int] = DEFAULT_MAX_BYTES_PER_DOC,
+                 max_bytes_per_opportunity: Optional[int] = DEFAULT_MAX_BYTES_PER_OPPORTUNITY,
+                 spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE, spool_dir: Optional[str] = None,
+                 attachment_store: Optional[AttachmentStore] = None,
+                 requests_per_second: Optional[float] = None, max_retries: int = 4,
+                 allow_mock_fallback: bool = False, response_cache: Optional[ResponseCache] = None):
+        """
+        Initialize the async HigherGov API client.
+
+        Args:
+            api_key: HigherGov API key. If not provided, will look for HIGHERGOV_API_KEY env var.
+            base_url: Base URL for the HigherGov API (defaults to HIGHERGOV_BASE_URL env var, then the public API;
+                      point it at a local replay server for offline runs).
+            max_concurrency: Maximum requests in flight across the whole client.
+            max_concurrent_downloads: Attachments fetched in parallel per opportunity.
+            request_timeout: Timeout in seconds for API calls.
+            download_timeout: Timeout in seconds for each attachment download.
+            max_bytes_per_doc: Byte cap for a single attachment (None = unlimited).
+            max_bytes_per_opportunity: Byte cap across all attachments of one opportunity (None = unlimited).
+            spool_max_size: Attachment bytes kept in memory before the spool file rolls over to disk.
+            spool_dir: Directory for spooled attachment files (defaults to the system temp dir).
+            attachment_store: Content-addressed store for attachments; enables conditional GETs
+                              and de-duplication of attachments shared across opportunities.
+            requests_per_second: Sustained API request rate (defaults to HIGHERGOV_REQUESTS_PER_SECOND env var).
+            max_retries: Retries for 429/5xx responses and connection errors, with jittered backoff.
+            allow_mock_fallback: Return mock opportunities when a call fails instead of raising
+                                 HigherGovAPIError. Only meant for offline testing.
+            response_cache: On-disk cache for API responses (per-endpoint TTLs, stale-while-revalidate).
+        """
+        self.api_key = api_key or os.getenv('HIGHERGOV_API_KEY')
+        self.saved_search_id = os.getenv('SAVED_SEARCH_ID')
+        self.use_mock_data = not self.api_key  # Use mock data if no API key
+        self.base_url = (base_url or os.getenv('HIGHERGOV_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_concurrent_downloads = max(1, max_concurrent_downloads)
+        self.request_timeout = request_timeout
+        self.download_timeout = download_timeout
+        self.max_bytes_per_doc = max_bytes_per_doc
+        self.max_bytes_per_opportunity = max_bytes_per_opportunity
+        self.spool_max_size = spool_max_size
+        self.spool_dir = spool_dir
+        self.attachment_store = attachment_store
+        self.allow_mock_fallback = allow_mock_fallback
+
+        rate = requests_per_second or float(os.getenv('HIGHERGOV_REQUESTS_PER_SECOND', DEFAULT_REQUESTS_PER_SECOND))
+        self.rate_limiter = TokenBucket(rate, DEFAULT_BURST)
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
+        self.circuit_breaker = CircuitBreaker()
+        self.response_cache = response_cache
+        self._revalidate_tasks: Set[asyncio.Task] = set()
+
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        if self.api_key:
+            print(f"Using real HigherGov API (async) with saved search: {self.saved_search_id}")
+        else:
+            print("No API key found - using mock data for testing")
+
+    async def __aenter__(self) -> "AsyncHigherGovClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        """Create the shared aiohttp session and concurrency semaphore on the running loop."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers={
+                    'Content-Type': 'application/json',
+                    'User-Agent': 'SOS-Automation-Pipeline/1.0'
+                }
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self) -> None:
+        """Close the aiohttp session (after any background cache refreshes finish)."""
+        if self._revalidate_tasks:
+            await asyncio.gather(*self._revalidate_tasks, return_exceptions=True)
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._semaphore = None
+
+    async def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Make a rate-limited GET request to the HigherGov API, or return mock data in mock mode.
+
+        Retries, backoff and circuit breaking match EnhancedHigherGovClient._get.
+
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+
+        Returns:
+            JSON response as dictionary
+
+        Raises:
+            HigherGovAPIError: The request failed and allow_mock_fallback is off
+        """
+        # If using mock data, return mock data immediately
+        if self.use_mock_data:
+            print(f"Using mock data for endpoint: {endpoint}")
+            return EnhancedHigherGovClient._get_mock_data()
+
+        await self.open()
+
+        # Remove leading slash from endpoint to avoid double slash
+        endpoint = endpoint.lstrip('/')
+
+        if self.response_cache:
+            cached, state = self.response_cache.get(endpoint, params)
+            if cached is not None:
+                if state == STALE:
+                    self._revalidate_in_background(endpoint, params)
+                return cached
+
+        return await self._fetch(endpoint, params)
+
+    def _revalidate_in_background(self, endpoint: str, params: Optional[Dict]) -> None:
+        """Refresh a stale cache entry in a background task (at most one refresh per key)."""
+        if not self.response_cache.begin_revalidate(endpoint, params):
+            return
+
+        async def refresh():
+            try:
+                await self._fetch(endpoint, dict(params or {}))
+            except Exception as e:
+                logger.warning(f"Background refresh of {endpoint} failed: {e}")
+            finally:
+                self.response_cache.end_revalidate(endpoint, params)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._revalidate_tasks.add(task)
+        task.add_done_callback(self._revalidate_tasks.discard)
+
+    async def _fetch(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """Request an endpoint from the network and store the response in the cache."""
+        url = f"{self.base_url}/{endpoint}"
+
+        # aiohttp only accepts str/int/float query values
+        query = {k: (str(v).lower() if isinstance(v, bool) else v) for k, v in (params or {}).items()}
+        query['api_key'] = self.api_key
+
+        try:
+            logger.info(f"Making async API request to: {url}")
+            data = await self._send_with_retries(url, query)
+
+            # Handle both 'opportunities' and 'results' response formats
+            opp_count = len(data.get('opportunities', [])) or len(data.get('results', []))
+            logger.info(f"API request successful. Received {opp_count} opportunities.")
+
+            if self.response_cache:
+                self.response_cache.put(endpoint, params, data)
+            return data
+
+        except (HigherGovAPIError, aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"API request failed: {e}")
+            if self.allow_mock_fallback:
+                return EnhancedHigherGovClient._get_mock_data()
+            if isinstance(e, HigherGovAPIError):
+                raise
+            raise HigherGovAPIError(f"HigherGov request to {endpoint} failed: {e}") from e
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Wait until the token bucket lets the next API request through."""
+        wait = self.rate_limiter.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _send_with_retries(self, url: str, query: Dict) -> Dict:
+        """
+        GET with rate limiting, retries and circuit breaking.
+
+        Returns:
+            The decoded JSON body (non-retryable 4xx responses raise ClientResponseError at once)
+        """
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            self.circuit_breaker.before_request()
+            recorded = False
+            try:
+                await self._wait_for_rate_limit()
+
+                retry_after = None
+                try:
+                    async with self._semaphore:
+                        async with self.session.get(url, params=query,
+                                                    timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as response:
+                            if not policy.is_retryable_status(response.status):
+                                # The server answered, so the circuit closes; a 4xx is our request's fault, not an outage
+                                self.circuit_breaker.record_success()
+                                recorded = True
+                                response.raise_for_status()
+                                return await response.json(content_type=None)
+                            failure = f"HTTP {response.status}"
+                            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    failure = str(e) or type(e).__name__
+            finally:
+                # Every outcome is recorded (an unexpected exception or cancellation as a
+                # failure), so a half-open trial is never left in flight
+                if not recorded:
+                    self.circuit_breaker.record_failure()
+
+            if failure.startswith('HTTP 429') and retry_after:
+                # Throttled: hold back every task sharing this client, not just this one
+                self.rate_limiter.pause(retry_after)
+
+            if attempt == policy.max_retries:
+                break
+            delay = policy.backoff_delay(attempt, retry_after)
+            logger.warning(f"API request failed ({failure}); retry {attempt + 1}/{policy.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        raise HigherGovAPIError(f"HigherGov request failed after {policy.max_retries + 1} attempts: {failure}")
+
+    async def get_saved_search_opportunities(self, search_id: str, limit: int = 50) -> Dict:
+        """
+        Fetch opportunities from a saved search.
+
+        Args:
+            search_id: The HigherGov saved search ID
+            limit: Maximum number of opportunities to fetch
+
+        Returns:
+            Dictionary containing opportunities and metadata
+        """
+        params = {
+            'search_id': search_id,
+            'limit': limit,
+            'include_documents': True
+        }
+
+        return await self._get('opportunity', params=params)
+
+    async def get_all_saved_search_opportunities(self, search_id: str, page_size: int = 100,
+                                                 **extra_params) -> List[Dict]:
+        """
+        Fetch every page of a saved search.
+
+        Page 1 is read first to learn the page count from meta.pagination; the remaining
+        pages are then requested concurrently and concatenated in page order.
+
+        Args:
+            search_id: The HigherGov saved search ID
+            page_size: Records per page (HigherGov max is 100)
+            **extra_params: Additional query parameters (e.g. source_type='sam')
+
+        Returns:
+            List of opportunity dictionaries in saved-search order
+        """
+        params = {
+            'search_id': search_id,
+            'page_size': min(int(page_size), 100),
+            'include_documents': True
+        }
+        params.update(extra_params)
+
+        first = await self._get('opportunity/', params=dict(params, page_number=1))
+        results = list(first.get('results', []))
+        if self.use_mock_data or first.get('is_mock') or not results:
+            return results
+
+        pages = ((first.get('meta') or {}).get('pagination') or {}).get('pages')
+        if not pages:
+            # No page count available - fall back to following links.next one page at a time
+            page_number, data = 1, first
+            while True:
+                next_page = EnhancedHigherGovClient._next_page_number(data, page_number)
+                if next_page is None:
+                    return results
+                data = await self._get('opportunity/', params=dict(params, page_number=next_page))
+                if data.get('is_mock') or not data.get('results'):
+                    return results
+                results.extend(data['results'])
+                page_number = next_page
+
+        remaining = await asyncio.gather(*[
+            self._get('opportunity/', params=dict(params, page_number=page))
+            for page in range(2, int(pages) + 1)
+        ])
+        for data in remaining:
+            if not data.get('is_mock'):
+                results.extend(data.get('results', []))
+        return results
+
+    async def get_opportunity_details(self, opportunity_id: str) -> Dict:
+        """
+        Fetch detailed information for a specific opportunity.
+
+        Args:
+            opportunity_id: The opportunity source_id or HigherGov ID
+
+        Returns:
+            Dictionary containing detailed opportunity information
+        """
+        return await self._get(f'opportunity/{opportunity_id}')
+
+    async def gather_opportunity_details(self, opportunity_ids: Iterable[str]) -> List[Dict]:
+        """Fetch details for many opportunities concurrently, returned in input order."""
+        return await asyncio.gather(*[self.get_opportunity_details(opp_id) for opp_id in opportunity_ids])
+
+    async def search_opportunities(self, query: str, filters: Optional[Dict] = None) -> Dict:
+        """
+        Search for opportunities using text query and filters.
+
+        Args:
+            query: Text search query
+            filters: Additional search filters
+
+        Returns:
+            Dictionary containing search results
+        """
+        params = {
+            'q': query,
+            'include_documents': True
+        }
+
+        if filters:
+            params.update(filters)
+
+        return await self._get('opportunity/search', params=params)
+
+    async def _process_document(self, index: int, doc: Dict, max_text_per_doc: Optional[int],
+                                download_slots: asyncio.Semaphore, budget: ByteBudget) -> Dict:
+        """
+        Download and prepare a single attachment for RAG processing.
+
+        The body is streamed in chunks to a spooled temp file within the byte caps.
+        With an attachment store, the request is conditional; a 304 is served from the store.
+
+        Args:
+            index: Position of the document in the API listing (used for fallback names)
+            doc: Document metadata from the HigherGov document endpoint
+            max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+            download_slots: Per-opportunity download semaphore
+            budget: Per-opportunity byte budget
+
+        Returns:
+            Copy of the document metadata enriched with content fields
+        """
+        doc_name = doc.get('file_name', f'Document_{index+1}')
+        doc_url = doc.get('document_url') or doc.get('file_url')
+
+        processed_doc = doc.copy()
+
+        if doc_url:
+            writer = None
+            store = self.attachment_store
+            try:
+                conditional_headers = store.conditional_headers(doc_url) if store else {}
+                response_headers = {}
+
+                async with download_slots, self._semaphore:
+                    async with self.session.get(doc_url, headers=conditional_headers,
+                                                timeout=aiohttp.ClientTimeout(total=self.download_timeout)) as doc_response:
+                        not_modified = doc_response.status == 304 and bool(conditional_headers)
+                        if not not_modified:
+                            doc_response.raise_for_status()
+                            check_declared_size(doc_response.headers.get('content-length'), self.max_bytes_per_doc)
+
+                            writer = SpoolWriter(budget, self.max_bytes_per_doc, self.spool_max_size, self.spool_dir)
+                            async for chunk in doc_response.content.iter_chunked(DEFAULT_CHUNK_SIZE):
+                                writer.write(chunk)
+                            content_type = doc_response.headers.get('content-type', '').lower()
+                            response_headers = dict(doc_response.headers)
+
+                if not_modified:
+                    # Unchanged since the last run - serve the stored blob, nothing is downloaded
+                    sha256, blob = store.resolve_not_modified(doc_url)
+                    content_file = await asyncio.to_thread(store.open_blob, sha256)
+                    size_bytes = blob.get('size', 0)
+                    content_type = blob.get('content_type', '')
+                    EnhancedHigherGovClient._use_stored_attachment(processed_doc, store, sha256, True)
+                    logger.info(f"Document {doc_name} not modified - using stored attachment {sha256[:12]}")
+                else:
+                    content_file, size_bytes = writer.finish(), writer.size
+                    if store:
+                        # Hashing and copying into the blob store is disk work - keep it off the event loop
+                        sha256, already_known = await asyncio.to_thread(
+                            store.ingest, doc_url, content_file, response_headers, content_type
+                        )
+                        EnhancedHigherGovClient._use_stored_attachment(processed_doc, store, sha256, already_known)
+
+                # PDF preview extraction is CPU work - keep it off the event loop
+                await asyncio.to_thread(
+                    EnhancedHigherGovClient._prepare_document_content,
+                    processed_doc, doc_name, content_file, size_bytes, content_type, max_text_per_doc
+                )
+                if store:
+                    EnhancedHigherGovClient._remember_preview(processed_doc, store)
+
+            except AttachmentTooLarge as e:
+                if writer:
+                    writer.abort()
+                EnhancedHigherGovClient._mark_over_budget(processed_doc, doc_name, str(e))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if writer:
+                    writer.abort()
+                logger.error(f"Failed to fetch document content for {doc_name}: {e}")
+                # Keep the original document metadata even if content fetch failed
+            except Exception as e:
+                if writer:
+                    writer.abort()
+                logger.error(f"Error processing document {doc_name}: {e}")
+
+        # Handle existing text_extract with size limits (for non-PDF docs)
+        elif 'text_extract' in processed_doc and processed_doc['text_extract']:
+            EnhancedHigherGovClient._truncate_existing_text(processed_doc, doc_name, max_text_per_doc)
+
+        return processed_doc
+
+    async def get_opportunity_documents(self, document_path: str, max_docs: int = 10,
+                                        max_text_per_doc: Optional[int] = 50000,
+                                        max_concurrent: Optional[int] = None) -> Dict:
+        """
+        Fetch opportunity documents, streaming PDFs to spooled temp files ('pdf_file').
+
+        Attachments are downloaded concurrently (bounded per opportunity and across the
+        client); results keep the order of the API listing.
+
+        Args:
+            document_path: Full URL to the documents API endpoint
+            max_docs: Maximum number of documents to fetch
+            max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+            max_concurrent: Per-opportunity download concurrency (defaults to max_concurrent_downloads)
+
+        Returns:
+            Dictionary containing document results with both text and spooled PDF files
+        """
+        if self.use_mock_data:
+            return {"results": []}
+
+        await self.open()
+
+        try:
+            # The document_path already contains the full URL with API key
+            logger.info(f"Fetching documents with RAG support: max_docs={max_docs}, max_text_per_doc={max_text_per_doc}")
+            await self._wait_for_rate_limit()
+            async with self._semaphore:
+                async with self.session.get(document_path,
+                                            timeout=aiohttp.ClientTimeout(total=self.request_timeout)) as response:
+                    response.raise_for_status()
+                    raw_data = await response.json(content_type=None)
+
+            if 'results' in raw_data and raw_data['results']:
+                download_slots = asyncio.Semaphore(max_concurrent or self.max_concurrent_downloads)
+                budget = ByteBudget(self.max_bytes_per_opportunity)
+                processed_docs = await asyncio.gather(*[
+                    self._process_document(i, doc, max_text_per_doc, download_slots, budget)
+                    for i, doc in enumerate(raw_data['results'][:max_docs])
+                ])
+
+                raw_data['results'] = list(processed_docs)
+                raw_data['rag_ready'] = True
+                raw_data['downloaded_bytes'] = budget.used
+                if self.attachment_store:
+                    await asyncio.to_thread(self.attachment_store.save)
+                logger.info(f"Successfully processed {len(processed_docs)} documents with RAG support")
+
+            return raw_data
+
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout fetching documents from {document_path} - documents may be too large")
+            return {"results": [], "error": "timeout"}
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch documents from {document_path}: {e}")
+            return {"results": [], "error": str(e)}
+        except Exception as e:
+            logger.error(f"Unexpected error processing documents with RAG support: {e}")
+            return {"results": [], "error": str(e)}
+
+    async def gather_opportunity_documents(self, document_paths: Iterable[str], **kwargs) -> List[Dict]:
+        """Fetch documents for many opportunities concurrently, returned in input order."""
+        return await asyncio.gather(*[self.get_opportunity_documents(path, **kwargs) for path in document_paths])
+
+
+class BlockingHigherGovClient:
+    """
+    Synchronous wrapper around AsyncHigherGovClient for the existing scripts.
+
+    Runs one private event loop on a background thread, so callers get the same
+    blocking method signatures as EnhancedHigherGovClient while the gather_* helpers
+    still overlap many requests on that single loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Accepts the same arguments as AsyncHigherGovClient."""
+        self._async_client = AsyncHigherGovClient(*args, **kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='highergov-async', daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "BlockingHigherGovClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __getattr__(self, name):
+        # Expose plain attributes (api_key, use_mock_data, ...) of the async client
+        if name == '_async_client':
+            raise AttributeError(name)
+        return getattr(self._async_client, name)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close(self) -> None:
+        """Close the session and stop the background loop."""
+        if self._loop.is_running():
+            self._run(self._async_client.close())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        return self._run(self._async_client._get(endpoint, params=params))
+
+    def get_saved_search_opportunities(self, search_id: str, limit: int = 50) -> Dict:
+        return self._run(self._async_client.get_saved_search_opportunities(search_id, limit=limit))
+
+    def get_all_saved_search_opportunities(self, search_id: str, page_size: int = 100, **extra_params) -> List[Dict]:
+        return self._run(self._async_client.get_all_saved_search_opportunities(search_id, page_size=page_size, **extra_params))
+
+    def get_opportunity_details(self, opportunity_id: str) -> Dict:
+        return self._run(self._async_client.get_opportunity_details(opportunity_id))
+
+    def gather_opportunity_details(self, opportunity_ids: Iterable[str]) -> List[Dict]:
+        return self._run(self._async_client.gather_opportunity_details(list(opportunity_ids)))
+
+    def search_opportunities(self, query: str, filters: Optional[Dict] = None) -> Dict:
+        return self._run(self._async_client.search_opportunities(query, filters=filters))
+
+    def get_opportunity_documents(self, document_path: str, max_docs: int = 10,
+                                  max_text_per_doc: Optional[int] = 50000,
+                                  max_concurrent: Optional[int] = None) -> Dict:
+        return self._run(self._async_client.get_opportunity_documents(
+            document_path, max_docs=max_docs, max_text_per_doc=max_text_per_doc, max_concurrent=max_concurrent
+        ))
+
+    def gather_opportunity_documents(self, document_paths: Iterable[str], **kwargs) -> List[Dict]:
+        return self._run(self._async_client.gather_opportunity_documents(list(document_paths), **kwargs))
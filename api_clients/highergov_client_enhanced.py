@@ -1,36 +1,96 @@
 import os
+import time
 import requests
 import logging
-from typing import Dict, List, Optional
-from urllib.parse import urlparse
+import threading
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional
+from urllib.parse import urlparse, parse_qs
 from dotenv import load_dotenv
 
+from api_clients.sync_state import SyncWatermarkStore
+from api_clients.attachment_store import AttachmentStore
+from api_clients.response_cache import ResponseCache, STALE
+from api_clients.resilience import (
+    CircuitBreaker, HigherGovAPIError, RetryPolicy, TokenBucket, parse_retry_after,
+    DEFAULT_BURST, DEFAULT_REQUESTS_PER_SECOND
+)
+from api_clients.attachment_spool import (
+    AttachmentTooLarge, ByteBudget, DownloadCancelled, SpoolWriter, check_declared_size, read_spooled,
+    DEFAULT_CHUNK_SIZE, DEFAULT_MAX_BYTES_PER_DOC, DEFAULT_MAX_BYTES_PER_OPPORTUNITY, DEFAULT_SPOOL_MAX_SIZE
+)
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "https://www.highergov.com/api-external"
+
 class EnhancedHigherGovClient:
     """
     Enhanced HigherGov API client for SOS opportunity assessment pipeline.
     Supports configurable daily endpoint URLs.
     """
 
-    def __init__(self, api_key: Optional[str] = None, base_url: str = "https://www.highergov.com/api-external"):
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrent_downloads: int = 4,
+                 max_bytes_per_doc: Optional[int] = DEFAULT_MAX_BYTES_PER_DOC,
+                 max_bytes_per_opportunity: Optional[int] = DEFAULT_MAX_BYTES_PER_OPPORTUNITY,
+                 spool_max_size: int = DEFAULT_SPOOL_MAX_SIZE, spool_dir: Optional[str] = None,
+                 attachment_store: Optional[AttachmentStore] = None,
+                 requests_per_second: Optional[float] = None, max_retries: int = 4,
+                 request_timeout: float = 60, allow_mock_fallback: bool = False,
+                 response_cache: Optional[ResponseCache] = None):
         """
         Initialize the HigherGov API client.
         
         Args:
             api_key: HigherGov API key. If not provided, will look for HIGHERGOV_API_KEY env var.
-            base_url: Base URL for the HigherGov API.
+            base_url: Base URL for the HigherGov API (defaults to HIGHERGOV_BASE_URL env var, then the public API;
+                      point it at a local replay server for offline runs).
+            max_concurrent_downloads: Attachments fetched in parallel per opportunity.
+            max_bytes_per_doc: Byte cap for a single attachment (None = unlimited).
+            max_bytes_per_opportunity: Byte cap across all attachments of one opportunity (None = unlimited).
+            spool_max_size: Attachment bytes kept in memory before the spool file rolls over to disk.
+            spool_dir: Directory for spooled attachment files (defaults to the system temp dir).
+            attachment_store: Content-addressed store for attachments; enables conditional GETs
+                              and de-duplication of attachments shared across opportunities.
+            requests_per_second: Sustained API request rate (defaults to HIGHERGOV_REQUESTS_PER_SECOND env var).
+            max_retries: Retries for 429/5xx responses and connection errors, with jittered backoff.
+            request_timeout: Timeout in seconds for API calls.
+            allow_mock_fallback: Return mock opportunities when a call fails instead of raising
+                                 HigherGovAPIError. Only meant for offline testing.
+            response_cache: On-disk cache for API responses (per-endpoint TTLs, stale-while-revalidate).
         """
         self.api_key = api_key or os.getenv('HIGHERGOV_API_KEY')
         self.saved_search_id = os.getenv('SAVED_SEARCH_ID')
         self.use_mock_data = not self.api_key  # Use mock data if no API key
+        self.max_concurrent_downloads = max(1, max_concurrent_downloads)
+        self.max_bytes_per_doc = max_bytes_per_doc
+        self.max_bytes_per_opportunity = max_bytes_per_opportunity
+        self.spool_max_size = spool_max_size
+        self.spool_dir = spool_dir
+        self.attachment_store = attachment_store
+        self.request_timeout = request_timeout
+        self.allow_mock_fallback = allow_mock_fallback
+        
+        # One bucket / breaker per client so the prefetch and download threads share the quota
+        rate = requests_per_second or float(os.getenv('HIGHERGOV_REQUESTS_PER_SECOND', DEFAULT_REQUESTS_PER_SECOND))
+        self.rate_limiter = TokenBucket(rate, DEFAULT_BURST)
+        self.retry_policy = RetryPolicy(max_retries=max_retries)
+        self.circuit_breaker = CircuitBreaker()
+        self.response_cache = response_cache
+        self._revalidate_executor: Optional[ThreadPoolExecutor] = None
         
         if self.api_key:
-            self.base_url = base_url
+            self.base_url = (base_url or os.getenv('HIGHERGOV_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
             self.session = requests.Session()
+            # Size the keep-alive pool so every concurrent attachment download reuses a connection
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.max_concurrent_downloads + 2)
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
             # HigherGov uses API key as a query parameter, not in headers
             self.session.headers.update({
                 'Content-Type': 'application/json',
@@ -42,7 +102,12 @@ class EnhancedHigherGovClient:
 
     def _get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """
-        Make a GET request to the HigherGov API or return mock data.
+        Make a rate-limited GET request to the HigherGov API, or return mock data in mock mode.
+        
+        With a response cache, fresh entries are returned without a request and stale ones
+        are returned while a background refresh runs. Otherwise 429/5xx responses and
+        connection errors are retried with jittered exponential backoff (Retry-After is
+        honored); repeated failures open the circuit breaker so later calls fail fast.
         
         Args:
             endpoint: API endpoint 
@@ -50,49 +115,133 @@ class EnhancedHigherGovClient:
             
         Returns:
             JSON response as dictionary
+            
+        Raises:
+            HigherGovAPIError: The request failed and allow_mock_fallback is off
         """
         # If using mock data, return mock data immediately
         if self.use_mock_data:
             print(f"Using mock data for endpoint: {endpoint}")
             return self._get_mock_data()
         
-        # Construct the proper API URL
         # Remove leading slash from endpoint to avoid double slash
         endpoint = endpoint.lstrip('/')
+        
+        if self.response_cache:
+            cached, state = self.response_cache.get(endpoint, params)
+            if cached is not None:
+                if state == STALE:
+                    self._revalidate_in_background(endpoint, params)
+                return cached
+        
+        return self._fetch(endpoint, params)
+
+    def _revalidate_in_background(self, endpoint: str, params: Optional[Dict]) -> None:
+        """Refresh a stale cache entry on a background thread (at most one refresh per key)."""
+        if not self.response_cache.begin_revalidate(endpoint, params):
+            return
+        if self._revalidate_executor is None:
+            self._revalidate_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='hg-revalidate')
+        
+        def refresh():
+            try:
+                self._fetch(endpoint, dict(params or {}))
+            except Exception as e:
+                logger.warning(f"Background refresh of {endpoint} failed: {e}")
+            finally:
+                self.response_cache.end_revalidate(endpoint, params)
+        
+        self._revalidate_executor.submit(refresh)
+
+    def _fetch(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """Request an endpoint from the network and store the response in the cache."""
         url = f"{self.base_url}/{endpoint}"
         
-        # Set up parameters
-        if not params:
-            params = {}
+        # Set up parameters (copied so the caller's dict never carries the API key)
+        params = dict(params or {})
         params['api_key'] = self.api_key
         
         try:
             logger.info(f"Making API request to: {url}")
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
+            response = self._send_with_retries(url, params)
             
             data = response.json()
             # Handle both 'opportunities' and 'results' response formats
             opp_count = len(data.get('opportunities', [])) or len(data.get('results', []))
             logger.info(f"API request successful. Received {opp_count} opportunities.")
             
+            if self.response_cache:
+                self.response_cache.put(endpoint, params, data)
             return data
             
-        except requests.exceptions.RequestException as e:
+        except (HigherGovAPIError, requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"API request failed: {e}")
-            # For testing purposes, return mock data if API fails
-            return self._get_mock_data()
-        except Exception as e:
-            logger.error(f"Unexpected error in API request: {e}")
-            return self._get_mock_data()
+            if self.allow_mock_fallback:
+                return self._get_mock_data()
+            if isinstance(e, HigherGovAPIError):
+                raise
+            raise HigherGovAPIError(f"HigherGov request to {endpoint} failed: {e}") from e
 
-    def _get_mock_data(self) -> Dict:
+    def _wait_for_rate_limit(self) -> None:
+        """Block until the token bucket lets the next API request through."""
+        wait = self.rate_limiter.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _send_with_retries(self, url: str, params: Dict) -> requests.Response:
         """
-        Return mock data for testing when API is unavailable.
+        GET with rate limiting, retries and circuit breaking.
+        
+        Returns:
+            The successful response (non-retryable 4xx responses raise HTTPError at once)
+        """
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            self.circuit_breaker.before_request()
+            recorded = False
+            try:
+                self._wait_for_rate_limit()
+                
+                retry_after = None
+                try:
+                    response = self.session.get(url, params=params, timeout=self.request_timeout)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    failure = str(e)
+                else:
+                    if not policy.is_retryable_status(response.status_code):
+                        # The server answered, so the circuit closes; a 4xx is our request's fault, not an outage
+                        self.circuit_breaker.record_success()
+                        recorded = True
+                        response.raise_for_status()
+                        return response
+                    failure = f"HTTP {response.status_code}"
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if response.status_code == 429 and retry_after:
+                        # Throttled: hold back every thread sharing this client, not just this one
+                        self.rate_limiter.pause(retry_after)
+            finally:
+                # Every outcome is recorded (an unexpected exception as a failure), so a
+                # half-open trial is never left in flight
+                if not recorded:
+                    self.circuit_breaker.record_failure()
+            
+            if attempt == policy.max_retries:
+                break
+            delay = policy.backoff_delay(attempt, retry_after)
+            logger.warning(f"API request failed ({failure}); retry {attempt + 1}/{policy.max_retries} in {delay:.1f}s")
+            time.sleep(delay)
+        
+        raise HigherGovAPIError(f"HigherGov request failed after {policy.max_retries + 1} attempts: {failure}")
+
+    @staticmethod
+    def _get_mock_data() -> Dict:
+        """
+        Return mock data for testing (no API key, or a failed call with allow_mock_fallback).
         """
         logger.warning("Using mock data for testing - API call failed or not configured")
         
         return {
+            "is_mock": True,
             "results": [
                 {
                     "source_id": "MOCK-001-SAR-TEST",
@@ -144,20 +293,191 @@ class EnhancedHigherGovClient:
         """
         Fetch opportunities from a saved search.
         
+        Pages are followed until `limit` opportunities are collected (see
+        iter_saved_search_opportunities, which streams them instead of holding the list).
+        
         Args:
             search_id: The HigherGov saved search ID
             limit: Maximum number of opportunities to fetch
             
         Returns:
-            Dictionary containing opportunities and metadata
+            Dictionary with the opportunities under 'results', like a single API page
         """
-        params = {
+        results = list(self.iter_saved_search_opportunities(search_id, max_opportunities=limit))
+        return {'results': results}
+
+    @staticmethod
+    def _next_page_number(data: Dict, current_page: int) -> Optional[int]:
+        """
+        Work out the next page_number from a paginated HigherGov response.
+        
+        Prefers the 'links.next' URL documented by HigherGov and falls back to
+        'meta.pagination' when the links block is missing.
+        
+        Args:
+            data: Parsed JSON response for the current page
+            current_page: page_number that produced the response
+            
+        Returns:
+            The next page number, or None when this was the last page
+        """
+        links = data.get('links') or {}
+        if 'next' in links:
+            next_url = links.get('next')
+            if not next_url:
+                return None
+            query = parse_qs(urlparse(next_url).query)
+            try:
+                return int(query.get('page_number', [current_page + 1])[0])
+            except (TypeError, ValueError):
+                return current_page + 1
+        
+        pagination = (data.get('meta') or {}).get('pagination') or {}
+        pages = pagination.get('pages')
+        if pages and current_page < int(pages):
+            return current_page + 1
+        return None
+
+    def iter_saved_search_pages(self, search_id: str, page_size: int = 100,
+                                max_pages: Optional[int] = None, prefetch: bool = True,
+                                **extra_params) -> Iterator[List[Dict]]:
+        """
+        Walk every page of a saved search, yielding one list of opportunities per page.
+        
+        While the caller is working on page N, page N+1 is already being fetched on a
+        background thread so the filter never waits on the network between pages.
+        
+        Args:
+            search_id: The HigherGov saved search ID
+            page_size: Records per page (HigherGov max is 100)
+            max_pages: Stop after this many pages (None = walk the whole search)
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **extra_params: Additional query parameters (e.g. source_type='sam')
+            
+        Yields:
+            The 'results' list of each page, in page order
+        """
+        base_params = {
             'search_id': search_id,
-            'limit': limit,
+            'page_size': min(int(page_size), 100),
             'include_documents': True
         }
+        base_params.update(extra_params)
+        
+        def fetch(page_number: int) -> Dict:
+            params = dict(base_params)
+            params['page_number'] = page_number
+            return self._get('opportunity/', params=params)
+        
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page_number = 1
+            pages_fetched = 0
+            data = fetch(page_number)
+            
+            while True:
+                pages_fetched += 1
+                results = data.get('results', [])
+                next_page = self._next_page_number(data, page_number)
+                
+                # Mock data never paginates, and an empty page is always the last one
+                if self.use_mock_data or data.get('is_mock') or not results:
+                    next_page = None
+                if max_pages is not None and pages_fetched >= max_pages:
+                    next_page = None
+                
+                pending = None
+                if next_page is not None and executor:
+                    pending = executor.submit(fetch, next_page)
+                
+                logger.info(f"Saved search {search_id}: page {page_number} returned {len(results)} opportunities")
+                if results:
+                    yield results
+                
+                if next_page is None:
+                    break
+                
+                data = pending.result() if pending else fetch(next_page)
+                page_number = next_page
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_saved_search_opportunities(self, search_id: str, page_size: int = 100,
+                                        max_opportunities: Optional[int] = None,
+                                        prefetch: bool = True, **extra_params) -> Iterator[Dict]:
+        """
+        Stream every opportunity in a saved search, one at a time.
+        
+        Thin wrapper over iter_saved_search_pages that flattens pages and
+        stops once max_opportunities have been yielded.
+        
+        Args:
+            search_id: The HigherGov saved search ID
+            page_size: Records per page (HigherGov max is 100)
+            max_opportunities: Stop after this many opportunities (None = all)
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **extra_params: Additional query parameters (e.g. source_type='sam')
+            
+        Yields:
+            Opportunity dictionaries in saved-search order
+        """
+        max_pages = None
+        if max_opportunities is not None:
+            page_size = min(page_size, max(max_opportunities, 1))
+            max_pages = -(-max_opportunities // min(page_size, 100))
+        
+        yielded = 0
+        pages = self.iter_saved_search_pages(search_id, page_size=page_size, max_pages=max_pages,
+                                             prefetch=prefetch, **extra_params)
+        try:
+            for page in pages:
+                for opp in page:
+                    if max_opportunities is not None and yielded >= max_opportunities:
+                        return
+                    yielded += 1
+                    yield opp
+        finally:
+            pages.close()
+
+    def iter_changed_saved_search_opportunities(self, search_id: str, watermark_store: SyncWatermarkStore,
+                                                page_size: int = 100, prefetch: bool = True,
+                                                **extra_params) -> Iterator[Dict]:
+        """
+        Stream only the opportunities added or updated since the last sync of a saved search.
+        
+        Pages are requested newest-first (ordering=-captured_date) and paging stops as soon
+        as a record older than the stored captured_date watermark is reached. Records on the
+        watermark date itself are still yielded; callers use watermark_store.is_unchanged()
+        to drop versions that were already assessed.
+        
+        Args:
+            search_id: The HigherGov saved search ID
+            watermark_store: Store holding the captured_date / version_key watermarks
+            page_size: Records per page (HigherGov max is 100)
+            prefetch: Fetch the next page in the background while the current one is consumed
+            **extra_params: Additional query parameters (e.g. source_type='sam')
+            
+        Yields:
+            Opportunity dictionaries captured on or after the watermark, newest first
+        """
+        watermark = watermark_store.get_watermark(search_id)
+        watermark_day = watermark[:10] if watermark else None
+        logger.info(f"Incremental sync for {search_id} from captured_date watermark: {watermark or 'none (full sync)'}")
         
-        return self._get('opportunity', params=params)
+        extra_params['ordering'] = '-captured_date'
+        pages = self.iter_saved_search_pages(search_id, page_size=page_size, prefetch=prefetch, **extra_params)
+        try:
+            for page in pages:
+                for opp in page:
+                    captured_date = opp.get('captured_date')
+                    if watermark_day and captured_date and str(captured_date)[:10] < watermark_day:
+                        logger.info(f"Reached captured_date watermark {watermark} - stopping incremental sync")
+                        return
+                    watermark_store.observe_captured_date(search_id, captured_date)
+                    yield opp
+        finally:
+            pages.close()
 
     def get_opportunity_details(self, opportunity_id: str) -> Dict:
         """
@@ -192,18 +512,224 @@ class EnhancedHigherGovClient:
             
         return self._get('opportunity/search', params=params)
 
-    def get_opportunity_documents(self, document_path: str, max_docs: int = 10, max_text_per_doc: Optional[int] = 50000) -> Dict:
+    @staticmethod
+    def _prepare_document_content(processed_doc: Dict, doc_name: str, content_file: BinaryIO, size_bytes: int,
+                                  content_type: str, max_text_per_doc: Optional[int]) -> None:
+        """
+        Fill in content fields for a downloaded attachment (shared by the sync and async clients).
+        
+        PDFs are handed downstream as the spooled file itself ('pdf_file', rewound to the
+        start) rather than as raw bytes; the consumer owns closing it.
+        
+        Args:
+            processed_doc: Copy of the document metadata to enrich in place
+            doc_name: File name used for logging and PDF detection
+            content_file: Spooled temp file holding the downloaded bytes
+            size_bytes: Number of bytes downloaded
+            content_type: Lower-cased Content-Type header
+            max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+        """
+        processed_doc['size_bytes'] = size_bytes
+        processed_doc['content_type'] = content_type
+        
+        # Handle PDF files - provide the spooled file for RAG processing
+        if 'pdf' in content_type or doc_name.lower().endswith('.pdf'):
+            processed_doc['pdf_file'] = content_file
+            processed_doc['is_pdf'] = True
+            
+            # Quick text extraction for immediate analysis (limited)
+            if 'text_extract' not in processed_doc or not processed_doc.get('text_extract'):
+                try:
+                    import PyPDF2
+                    
+                    pdf_reader = PyPDF2.PdfReader(content_file)
+                    text_content = ""
+                    
+                    # Extract from first few pages for quick preview
+                    for page_num, page in enumerate(pdf_reader.pages[:5]):
+                        try:
+                            text_content += page.extract_text() + "\n"
+                        except:
+                            continue
+                    
+                    processed_doc['text_extract'] = text_content[:2000] + f"\n\n[PDF PREVIEW - Full {size_bytes} byte PDF available for RAG processing]"
+                    
+                except Exception as e:
+                    logger.warning(f"Could not extract preview from PDF {doc_name}: {e}")
+                    processed_doc['text_extract'] = f"[PDF Content - {size_bytes} bytes - Use RAG processor for full text]"
+                finally:
+                    content_file.seek(0)
+            
+            logger.info(f"Prepared PDF {doc_name} ({size_bytes} bytes) for RAG processing")
+        
+        # Handle other file types
+        else:
+            try:
+                # Try to decode as text
+                text_content = read_spooled(content_file).decode('utf-8', errors='ignore')
+                content_file.close()
+                
+                # Apply size limits for non-PDF files
+                if max_text_per_doc and len(text_content) > max_text_per_doc:
+                    first_part = text_content[:int(max_text_per_doc * 0.7)]
+                    last_part = text_content[-int(max_text_per_doc * 0.3):]
+                    processed_doc['text_extract'] = first_part + f"\n\n[... TRUNCATED {len(text_content) - max_text_per_doc} CHARACTERS ...]\n\n" + last_part
+                    logger.warning(f"Truncated text document {doc_name} from {len(text_content)} to ~{max_text_per_doc} chars")
+                else:
+                    processed_doc['text_extract'] = text_content
+                    
+            except UnicodeDecodeError:
+                processed_doc['text_extract'] = f"[Binary content - {size_bytes} bytes]"
+                processed_doc['raw_file'] = content_file
+
+    @staticmethod
+    def _mark_over_budget(processed_doc: Dict, doc_name: str, reason: str) -> None:
+        """Record that an attachment was not downloaded because it exceeded a byte cap."""
+        logger.warning(f"Skipping document {doc_name}: {reason}")
+        processed_doc['skipped_reason'] = reason
+        if not processed_doc.get('text_extract'):
+            processed_doc['text_extract'] = f"[Document not downloaded - {reason}]"
+
+    @staticmethod
+    def _use_stored_attachment(processed_doc: Dict, store: AttachmentStore, sha256: str, already_known: bool) -> None:
+        """
+        Tag an attachment with its content hash and reuse what the store already knows about it.
+        
+        A known PDF gets its stored preview text, so neither the preview nor (via
+        content_sha256) the full RAG extraction is repeated downstream.
+        """
+        processed_doc['content_sha256'] = sha256
+        processed_doc['from_attachment_store'] = already_known
+        if already_known and not processed_doc.get('text_extract'):
+            preview = store.get_text_preview(sha256)
+            if preview:
+                processed_doc['text_extract'] = preview
+
+    @staticmethod
+    def _remember_preview(processed_doc: Dict, store: AttachmentStore) -> None:
+        """Keep the PDF preview text of a newly stored attachment for later runs."""
+        sha256 = processed_doc.get('content_sha256')
+        if sha256 and processed_doc.get('is_pdf') and processed_doc.get('text_extract') and not store.get_text_preview(sha256):
+            store.set_text_preview(sha256, processed_doc['text_extract'])
+
+    @staticmethod
+    def _truncate_existing_text(processed_doc: Dict, doc_name: str, max_text_per_doc: Optional[int]) -> None:
+        """Apply the per-document size limit to a text_extract the API already provided."""
+        original_length = len(processed_doc['text_extract'])
+        if max_text_per_doc and original_length > max_text_per_doc:
+            first_part = processed_doc['text_extract'][:int(max_text_per_doc * 0.7)]
+            last_part = processed_doc['text_extract'][-int(max_text_per_doc * 0.3):]
+            processed_doc['text_extract'] = first_part + f"\n\n[... TRUNCATED {original_length - max_text_per_doc} CHARACTERS ...]\n\n" + last_part
+            logger.warning(f"Truncated existing text for {doc_name} from {original_length} to ~{max_text_per_doc} chars")
+
+    def _process_document(self, index: int, doc: Dict, max_text_per_doc: Optional[int],
+                          budget: Optional[ByteBudget] = None, cancel: Optional[threading.Event] = None) -> Dict:
+        """
+        Download and prepare a single attachment for RAG processing.
+        
+        Runs on the document download pool, so it only touches its own copy of the
+        document metadata and shares nothing but the pooled session and byte budget.
+        The body is streamed in chunks to a spooled temp file, never held as one bytes object.
+        With an attachment store, the request is conditional; a 304 is served from the store.
+        
+        Args:
+            index: Position of the document in the API listing (used for fallback names)
+            doc: Document metadata from the HigherGov document endpoint
+            max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+            budget: Per-opportunity byte budget shared by all of this opportunity's downloads
+            cancel: Once set, the download is skipped or abandoned between chunks ('cancelled' is marked)
+            
+        Returns:
+            Copy of the document metadata enriched with content fields
+        """
+        doc_name = doc.get('file_name', f'Document_{index+1}')
+        doc_url = doc.get('document_url') or doc.get('file_url')
+        budget = budget or ByteBudget(self.max_bytes_per_opportunity)
+        
+        processed_doc = doc.copy()
+        if cancel is not None and cancel.is_set():
+            processed_doc['cancelled'] = True
+            return processed_doc
+        
+        # If we have a document URL, stream the content to disk for RAG processing
+        if doc_url:
+            writer = None
+            store = self.attachment_store
+            try:
+                conditional_headers = store.conditional_headers(doc_url) if store else {}
+                
+                # Fetch the actual document content over the pooled keep-alive session
+                with self.session.get(doc_url, timeout=45, stream=True, headers=conditional_headers) as doc_response:
+                    if doc_response.status_code == 304 and conditional_headers:
+                        # Unchanged since the last run - serve the stored blob, nothing is downloaded
+                        sha256, blob = store.resolve_not_modified(doc_url)
+                        content_file = store.open_blob(sha256)
+                        size_bytes = blob.get('size', 0)
+                        content_type = blob.get('content_type', '')
+                        self._use_stored_attachment(processed_doc, store, sha256, True)
+                        logger.info(f"Document {doc_name} not modified - using stored attachment {sha256[:12]}")
+                    else:
+                        doc_response.raise_for_status()
+                        check_declared_size(doc_response.headers.get('content-length'), self.max_bytes_per_doc)
+                        
+                        writer = SpoolWriter(budget, self.max_bytes_per_doc, self.spool_max_size, self.spool_dir)
+                        writer.write_all(doc_response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE), cancel)
+                        content_type = doc_response.headers.get('content-type', '').lower()
+                        content_file, size_bytes = writer.finish(), writer.size
+                        
+                        if store:
+                            sha256, already_known = store.ingest(doc_url, content_file, doc_response.headers, content_type)
+                            self._use_stored_attachment(processed_doc, store, sha256, already_known)
+                
+                self._prepare_document_content(
+                    processed_doc, doc_name, content_file, size_bytes, content_type, max_text_per_doc
+                )
+                if store:
+                    self._remember_preview(processed_doc, store)
+            
+            except AttachmentTooLarge as e:
+                if writer:
+                    writer.abort()
+                self._mark_over_budget(processed_doc, doc_name, str(e))
+            except DownloadCancelled:
+                if writer:
+                    writer.abort()
+                processed_doc['cancelled'] = True
+                logger.info(f"Download of {doc_name} cancelled")
+            except requests.RequestException as e:
+                if writer:
+                    writer.abort()
+                logger.error(f"Failed to fetch document content for {doc_name}: {e}")
+                # Keep the original document metadata even if content fetch failed
+            except Exception as e:
+                if writer:
+                    writer.abort()
+                logger.error(f"Error processing document {doc_name}: {e}")
+        
+        # Handle existing text_extract with size limits (for non-PDF docs)
+        elif 'text_extract' in processed_doc and processed_doc['text_extract']:
+            self._truncate_existing_text(processed_doc, doc_name, max_text_per_doc)
+        
+        return processed_doc
+
+    def get_opportunity_documents(self, document_path: str, max_docs: int = 10, max_text_per_doc: Optional[int] = 50000,
+                                  max_concurrent: Optional[int] = None) -> Dict:
         """
         Enhanced method to fetch opportunity documents with support for raw PDF content.
-        Now handles massive PDFs by returning raw bytes for RAG processing.
+        Handles massive PDFs by streaming them to spooled temp files ('pdf_file') for RAG
+        processing, within the client's per-document and per-opportunity byte caps.
+        
+        Attachments are downloaded concurrently on a bounded thread pool that shares the
+        client's keep-alive session; results keep the order of the API listing.
         
         Args:
             document_path: Full URL to the documents API endpoint
             max_docs: Maximum number of documents to fetch
             max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+            max_concurrent: Per-opportunity download concurrency (defaults to max_concurrent_downloads)
             
         Returns:
-            Dictionary containing document results with both text and raw PDF content
+            Dictionary containing document results with both text and spooled PDF files
         """
         if self.use_mock_data:
             return {"results": []}
@@ -211,102 +737,34 @@ class EnhancedHigherGovClient:
         try:
             # The document_path already contains the full URL with API key
             logger.info(f"Fetching documents with RAG support: max_docs={max_docs}, max_text_per_doc={max_text_per_doc}")
-            response = requests.get(document_path, timeout=60)  # Increased timeout for RAG processing
+            self._wait_for_rate_limit()
+            response = self.session.get(document_path, timeout=60)  # Increased timeout for RAG processing
             response.raise_for_status()
             
             raw_data = response.json()
             
             # Process documents with RAG support
             if 'results' in raw_data and raw_data['results']:
-                processed_docs = []
+                docs = raw_data['results'][:max_docs]
+                workers = max(1, min(max_concurrent or self.max_concurrent_downloads, len(docs)))
+                budget = ByteBudget(self.max_bytes_per_opportunity)
                 
-                for i, doc in enumerate(raw_data['results'][:max_docs]):
-                    doc_name = doc.get('file_name', f'Document_{i+1}')
-                    doc_url = doc.get('document_url') or doc.get('file_url')
-                    
-                    processed_doc = doc.copy()
-                    
-                    # If we have a document URL, fetch the raw content for RAG processing
-                    if doc_url:
-                        try:
-                            # Fetch the actual document content
-                            doc_response = requests.get(doc_url, timeout=45)
-                            doc_response.raise_for_status()
-                            
-                            raw_content = doc_response.content
-                            content_type = doc_response.headers.get('content-type', '').lower()
-                            
-                            processed_doc['size_bytes'] = len(raw_content)
-                            processed_doc['content_type'] = content_type
-                            
-                            # Handle PDF files - provide raw content for RAG processing
-                            if 'pdf' in content_type or doc_name.lower().endswith('.pdf'):
-                                processed_doc['pdf_content'] = raw_content
-                                processed_doc['is_pdf'] = True
-                                
-                                # Quick text extraction for immediate analysis (limited)
-                                if 'text_extract' not in processed_doc or not processed_doc.get('text_extract'):
-                                    try:
-                                        import PyPDF2
-                                        import io
-                                        
-                                        pdf_reader = PyPDF2.PdfReader(io.BytesIO(raw_content))
-                                        text_content = ""
-                                        
-                                        # Extract from first few pages for quick preview
-                                        for page_num, page in enumerate(pdf_reader.pages[:5]):
-                                            try:
-                                                text_content += page.extract_text() + "\n"
-                                            except:
-                                                continue
-                                        
-                                        processed_doc['text_extract'] = text_content[:2000] + f"\n\n[PDF PREVIEW - Full {len(raw_content)} byte PDF available for RAG processing]"
-                                        
-                                    except Exception as e:
-                                        logger.warning(f"Could not extract preview from PDF {doc_name}: {e}")
-                                        processed_doc['text_extract'] = f"[PDF Content - {len(raw_content)} bytes - Use RAG processor for full text]"
-                                
-                                logger.info(f"Prepared PDF {doc_name} ({len(raw_content)} bytes) for RAG processing")
-                            
-                            # Handle other file types
-                            else:
-                                try:
-                                    # Try to decode as text
-                                    text_content = raw_content.decode('utf-8', errors='ignore')
-                                    
-                                    # Apply size limits for non-PDF files
-                                    if max_text_per_doc and len(text_content) > max_text_per_doc:
-                                        first_part = text_content[:int(max_text_per_doc * 0.7)]
-                                        last_part = text_content[-int(max_text_per_doc * 0.3):]
-                                        processed_doc['text_extract'] = first_part + f"\n\n[... TRUNCATED {len(text_content) - max_text_per_doc} CHARACTERS ...]\n\n" + last_part
-                                        logger.warning(f"Truncated text document {doc_name} from {len(text_content)} to ~{max_text_per_doc} chars")
-                                    else:
-                                        processed_doc['text_extract'] = text_content
-                                        
-                                except UnicodeDecodeError:
-                                    processed_doc['text_extract'] = f"[Binary content - {len(raw_content)} bytes]"
-                                    processed_doc['raw_content'] = raw_content
-                        
-                        except requests.RequestException as e:
-                            logger.error(f"Failed to fetch document content for {doc_name}: {e}")
-                            # Keep the original document metadata even if content fetch failed
-                        except Exception as e:
-                            logger.error(f"Error processing document {doc_name}: {e}")
-                    
-                    # Handle existing text_extract with size limits (for non-PDF docs)
-                    elif 'text_extract' in processed_doc and processed_doc['text_extract']:
-                        original_length = len(processed_doc['text_extract'])
-                        if max_text_per_doc and original_length > max_text_per_doc:
-                            first_part = processed_doc['text_extract'][:int(max_text_per_doc * 0.7)]
-                            last_part = processed_doc['text_extract'][-int(max_text_per_doc * 0.3):]
-                            processed_doc['text_extract'] = first_part + f"\n\n[... TRUNCATED {original_length - max_text_per_doc} CHARACTERS ...]\n\n" + last_part
-                            logger.warning(f"Truncated existing text for {doc_name} from {original_length} to ~{max_text_per_doc} chars")
-                    
-                    processed_docs.append(processed_doc)
+                if workers == 1:
+                    processed_docs = [self._process_document(i, doc, max_text_per_doc, budget) for i, doc in enumerate(docs)]
+                else:
+                    # map() yields in submission order, so processed_docs matches the API listing
+                    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hg-docs') as executor:
+                        processed_docs = list(executor.map(
+                            lambda item: self._process_document(item[0], item[1], max_text_per_doc, budget),
+                            enumerate(docs)
+                        ))
                 
                 raw_data['results'] = processed_docs
                 raw_data['rag_ready'] = True
-                logger.info(f"Successfully processed {len(processed_docs)} documents with RAG support")
+                raw_data['downloaded_bytes'] = budget.used
+                if self.attachment_store:
+                    self.attachment_store.save()
+                logger.info(f"Successfully processed {len(processed_docs)} documents with RAG support ({workers} concurrent downloads, {budget.used:,} bytes)")
             
             return raw_data
             
@@ -319,3 +777,68 @@ class EnhancedHigherGovClient:
         except Exception as e:
             logger.error(f"Unexpected error processing documents with RAG support: {e}")
             return {"results": [], "error": str(e)}
+
+    def iter_opportunity_documents(self, document_path: str, max_docs: int = 10, max_text_per_doc: Optional[int] = 50000,
+                                   max_concurrent: Optional[int] = None,
+                                   cancel: Optional[threading.Event] = None) -> Iterator[Dict]:
+        """
+        Streaming variant of get_opportunity_documents: yields each processed document in
+        API listing order as soon as it (and every document before it) has been downloaded,
+        while the later ones are still downloading on the pool.
+        
+        Setting `cancel`, or closing the generator early, stops the remaining work: queued
+        downloads never start, running ones are abandoned at their next chunk, and the
+        spooled files of documents that were downloaded but not yet yielded are closed.
+        A listing that cannot be fetched yields nothing (the error is logged).
+        
+        Args:
+            document_path: Full URL to the documents API endpoint
+            max_docs: Maximum number of documents to fetch
+            max_text_per_doc: Maximum text size per document (None = no limit for RAG processing)
+            max_concurrent: Per-opportunity download concurrency (defaults to max_concurrent_downloads)
+            cancel: Event that abandons the remaining downloads once set
+            
+        Yields:
+            Processed documents, as in get_opportunity_documents()['results']
+        """
+        if self.use_mock_data:
+            return
+        
+        try:
+            logger.info(f"Streaming documents with RAG support: max_docs={max_docs}, max_text_per_doc={max_text_per_doc}")
+            self._wait_for_rate_limit()
+            response = self.session.get(document_path, timeout=60)
+            response.raise_for_status()
+            docs = (response.json().get('results') or [])[:max_docs]
+        except Exception as e:
+            logger.error(f"Failed to fetch document listing from {document_path}: {e}")
+            return
+        if not docs:
+            return
+        
+        cancel = cancel or threading.Event()
+        workers = max(1, min(max_concurrent or self.max_concurrent_downloads, len(docs)))
+        budget = ByteBudget(self.max_bytes_per_opportunity)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hg-docs')
+        futures = [executor.submit(self._process_document, i, doc, max_text_per_doc, budget, cancel)
+                   for i, doc in enumerate(docs)]
+        yielded = 0
+        try:
+            for future in futures:
+                processed_doc = future.result()
+                yielded += 1
+                yield processed_doc
+        finally:
+            if yielded < len(futures):
+                cancel.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            for future in futures[yielded:]:
+                if future.cancelled() or future.exception() is not None:
+                    continue
+                unused = future.result()
+                for key in ('pdf_file', 'raw_file'):
+                    if unused.get(key) is not None:
+                        unused[key].close()
+            if self.attachment_store:
+                self.attachment_store.save()
+            logger.info(f"Streamed {yielded} of {len(docs)} documents ({workers} concurrent downloads, {budget.used:,} bytes)")
@@ -0,0 +1,367 @@
+"""
+Record/replay stand-in for the HigherGov API.
+Record mode captures real saved-search pages, document listings and attachments into a
+fixture directory; the replay server then serves them locally on the same paths (with
+pagination and document_path links rewritten to point at itself), with optional latency,
+bandwidth and error-rate injection so throughput work can be measured offline.
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence
+from urllib.parse import parse_qsl, quote, urlencode, urlparse
+
+from api_clients.attachment_spool import DEFAULT_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Placeholder written into recorded JSON wherever a URL must point back at the replay server
+REPLAY_BASE = '__REPLAY_BASE__'
+INDEX_FILE = 'index.json'
+
+_SECRET_PARAMS = {'api_key'}
+# Params that change the order or extra fields of a page but not which records are on it;
+# a request whose exact variant was not recorded is served the recorded one that differs only in these
+_PRESENTATION_PARAMS = {'ordering', 'include_ai_summary', 'include_documents'}
+
+
+def fixture_key(path: str, query: str = '') -> str:
+    """
+    Route key for a request: path without surrounding slashes plus sorted query params.
+
+    The API key is dropped and booleans are lower-cased, so the key is the same whether
+    a request came from requests (True) or aiohttp ('true').
+    """
+    params = []
+    for name, value in parse_qsl(query, keep_blank_values=True):
+        if name in _SECRET_PARAMS:
+            continue
+        if value in ('True', 'False'):
+            value = value.lower()
+        params.append((name, value))
+    return f"{path.strip('/')}?{urlencode(sorted(params))}"
+
+
+def loose_fixture_key(key: str) -> str:
+    """A fixture key with the presentation-only params (ordering, include_* flags) removed."""
+    path, _, query = key.partition('?')
+    params = [(name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+              if name not in _PRESENTATION_PARAMS]
+    return f"{path}?{urlencode(params)}"
+
+
+def _params_query(params: Dict) -> str:
+    return urlencode({k: (str(v).lower() if isinstance(v, bool) else v) for k, v in params.items()})
+
+
+class HigherGovRecorder:
+    """
+    Captures a saved search into a fixture directory.
+
+    Layout:
+        <fixture_dir>/index.json      route key -> {file, content_type, templated}
+        <fixture_dir>/responses/*.json  API pages and document listings (URLs templated)
+        <fixture_dir>/files/<sha256>    attachment bytes
+    """
+
+    def __init__(self, client, fixture_dir: str = "fixtures/highergov"):
+        """
+        Args:
+            client: A configured EnhancedHigherGovClient with a real API key
+            fixture_dir: Directory to write fixtures into (existing routes are kept)
+        """
+        if client.use_mock_data:
+            raise ValueError("Recording needs a real HIGHERGOV_API_KEY - the client is in mock mode")
+        self.client = client
+        self.fixture_dir = fixture_dir
+        os.makedirs(os.path.join(fixture_dir, 'responses'), exist_ok=True)
+        os.makedirs(os.path.join(fixture_dir, 'files'), exist_ok=True)
+
+        index_path = os.path.join(fixture_dir, INDEX_FILE)
+        self.index: Dict[str, Dict] = {}
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def _template(self, text: str) -> str:
+        """Point API URLs at the replay server and scrub the API key."""
+        text = text.replace(self.client.base_url.rstrip('/'), REPLAY_BASE)
+        return text.replace(self.client.api_key, 'REDACTED')
+
+    def _save_json(self, key: str, data: Dict) -> None:
+        name = hashlib.sha1(key.encode()).hexdigest() + '.json'
+        body = self._template(json.dumps(data, indent=2))
+        with open(os.path.join(self.fixture_dir, 'responses', name), 'w', encoding='utf-8') as f:
+            f.write(body)
+        self.index[key] = {'file': f"responses/{name}", 'content_type': 'application/json', 'templated': True}
+
+    def _record_attachment(self, url: str, file_name: str) -> Optional[str]:
+        """Download one attachment into files/<sha256>; returns its replay URL."""
+        digest = hashlib.sha256()
+        tmp_path = os.path.join(self.fixture_dir, 'files', f".download.{threading.get_ident()}.tmp")
+        try:
+            with self.client.session.get(url, timeout=120, stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('content-type', 'application/octet-stream')
+                with open(tmp_path, 'wb') as out:
+                    for chunk in response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                        digest.update(chunk)
+                        out.write(chunk)
+        except Exception as e:
+            logger.warning(f"Could not record attachment {file_name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return None
+
+        sha256 = digest.hexdigest()
+        os.replace(tmp_path, os.path.join(self.fixture_dir, 'files', sha256))
+        route = f"_files/{sha256}/{quote(file_name)}"
+        self.index[fixture_key(route)] = {'file': f"files/{sha256}", 'content_type': content_type, 'templated': False}
+        return f"{REPLAY_BASE}/{route}"
+
+    def _record_documents(self, opp: Dict, max_docs: int) -> None:
+        """Record an opportunity's document listing and attachments, rewriting its document_path."""
+        document_path = opp.get('document_path')
+        if not document_path:
+            return
+        try:
+            self.client._wait_for_rate_limit()
+            response = self.client.session.get(document_path, timeout=60)
+            response.raise_for_status()
+            listing = response.json()
+        except Exception as e:
+            logger.warning(f"Could not record documents for {opp.get('source_id')}: {e}")
+            return
+
+        for index, doc in enumerate(listing.get('results', [])[:max_docs]):
+            url_field = 'document_url' if doc.get('document_url') else 'file_url'
+            if doc.get(url_field):
+                replay_url = self._record_attachment(doc[url_field], doc.get('file_name', f'Document_{index+1}'))
+                if replay_url:
+                    doc[url_field] = replay_url
+        listing['results'] = listing.get('results', [])[:max_docs]
+
+        route = f"_docs/{hashlib.sha1(fixture_key(urlparse(document_path).path, urlparse(document_path).query).encode()).hexdigest()}"
+        self._save_json(fixture_key(route), listing)
+        opp['document_path'] = f"{REPLAY_BASE}/{route}"
+
+    def record_saved_search(self, search_id: str, page_size: int = 100, max_pages: Optional[int] = None,
+                            max_docs: int = 10, **extra_params) -> Dict[str, int]:
+        """
+        Record every page of a saved search plus each opportunity's documents.
+
+        Args:
+            search_id: The HigherGov saved search ID
+            page_size: Records per page (HigherGov max is 100)
+            max_pages: Stop after this many pages (None = the whole search)
+            max_docs: Attachments recorded per opportunity
+            **extra_params: Additional query parameters, exactly as the pipeline sends them
+
+        Returns:
+            Counts of pages, opportunities and files recorded
+        """
+        params = {'search_id': search_id, 'page_size': min(int(page_size), 100), 'include_documents': True}
+        params.update(extra_params)
+        counts = {'pages': 0, 'opportunities': 0, 'files': 0}
+        files_before = sum(1 for entry in self.index.values() if not entry['templated'])
+
+        page_number = 1
+        while True:
+            page_params = dict(params, page_number=page_number)
+            data = self.client._fetch('opportunity/', dict(page_params))
+            for opp in data.get('results', []):
+                self._record_documents(opp, max_docs)
+            self._save_json(fixture_key('opportunity/', _params_query(page_params)), data)
+
+            counts['pages'] += 1
+            counts['opportunities'] += len(data.get('results', []))
+            logger.info(f"Recorded page {page_number} ({len(data.get('results', []))} opportunities)")
+
+            next_page = self.client._next_page_number(data, page_number)
+            if next_page is None or not data.get('results') or (max_pages and counts['pages'] >= max_pages):
+                break
+            page_number = next_page
+
+        counts['files'] = sum(1 for entry in self.index.values() if not entry['templated']) - files_before
+        self.save_index()
+        return counts
+
+    def record_endpoint(self, endpoint: str, params: Optional[Dict] = None) -> None:
+        """Record a single API response (e.g. opportunity/<id> or opportunity/search)."""
+        params = dict(params or {})
+        data = self.client._fetch(endpoint.lstrip('/'), dict(params))
+        self._save_json(fixture_key(endpoint, _params_query(params)), data)
+        self.save_index()
+
+    def save_index(self) -> None:
+        index_path = os.path.join(self.fixture_dir, INDEX_FILE)
+        tmp_path = f"{index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, index_path)
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: "ReplayServer"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        replay = self.server
+        if replay.latency_ms or replay.jitter_ms:
+            time.sleep(max(0.0, replay.latency_ms + replay.random_uniform(-replay.jitter_ms, replay.jitter_ms)) / 1000)
+
+        if replay.error_rate and replay.random_uniform(0, 1) < replay.error_rate:
+            status = replay.random_choice(replay.error_statuses)
+            replay.count('errors_injected')
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        parsed = urlparse(self.path)
+        key = fixture_key(parsed.path, parsed.query)
+        entry = replay.index.get(key)
+        if entry is None:
+            entry = replay.loose_index.get(loose_fixture_key(key))
+            if entry is not None:
+                replay.count('loose_matches')
+        if entry is None:
+            replay.count('not_found')
+            body = json.dumps({'error': f"No fixture recorded for {parsed.path}"}).encode()
+            self.send_response(404)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        file_path = os.path.join(replay.fixture_dir, entry['file'])
+        etag = f'"{os.path.basename(entry["file"])}"'
+        if not entry['templated'] and self.headers.get('If-None-Match') == etag:
+            replay.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        if entry['templated']:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                body = f.read().replace(REPLAY_BASE, replay.base_url).encode('utf-8')
+            size = len(body)
+        else:
+            body = None
+            size = os.path.getsize(file_path)
+
+        replay.count('served')
+        self.send_response(200)
+        self.send_header('Content-Type', entry['content_type'])
+        self.send_header('Content-Length', str(size))
+        if not entry['templated']:
+            self.send_header('ETag', etag)
+        self.end_headers()
+
+        try:
+            if body is not None:
+                self._write_throttled(body)
+            else:
+                with open(file_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b''):
+                        self._write_throttled(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _write_throttled(self, data: bytes) -> None:
+        bytes_per_second = self.server.bandwidth_kbps * 1024 / 8 if self.server.bandwidth_kbps else 0
+        step = 16 * 1024
+        for offset in range(0, len(data), step):
+            piece = data[offset:offset + step]
+            self.wfile.write(piece)
+            if bytes_per_second:
+                time.sleep(len(piece) / bytes_per_second)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local HTTP server that replays a recorded fixture directory.
+
+    Point a client at it with base_url=server.base_url (or HIGHERGOV_BASE_URL) and any
+    non-empty API key. Requests are matched on their exact query first; one that differs from
+    every recording only in ordering or the include_* flags (e.g. an incremental-sync run
+    replaying a full-sync recording) is served the closest recorded variant.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fixture_dir: str = "fixtures/highergov", host: str = '127.0.0.1', port: int = 8765,
+                 latency_ms: float = 0, jitter_ms: float = 0, bandwidth_kbps: float = 0,
+                 error_rate: float = 0, error_statuses: Sequence[int] = (429, 500, 503),
+                 seed: Optional[int] = None):
+        """
+        Args:
+            fixture_dir: Directory written by HigherGovRecorder
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency_ms: Added delay before every response
+            jitter_ms: Uniform +/- variation applied to latency_ms
+            bandwidth_kbps: Per-connection throughput cap in kilobits/s (0 = unlimited)
+            error_rate: Fraction of requests answered with an injected error status
+            error_statuses: Statuses to inject (429 responses carry Retry-After: 1)
+            seed: Seed for latency jitter and error injection, for reproducible runs
+        """
+        with open(os.path.join(fixture_dir, INDEX_FILE), 'r', encoding='utf-8') as f:
+            self.index: Dict[str, Dict] = json.load(f)
+        self.loose_index: Dict[str, Dict] = {}
+        for key in sorted(self.index):
+            self.loose_index.setdefault(loose_fixture_key(key), self.index[key])
+        self.fixture_dir = fixture_dir
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self.error_rate = error_rate
+        self.error_statuses = list(error_statuses)
+        self.stats: Dict[str, int] = {'served': 0, 'not_modified': 0, 'not_found': 0, 'errors_injected': 0,
+                                      'loose_matches': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        super().__init__((host, port), _ReplayHandler)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def random_uniform(self, low: float, high: float) -> float:
+        with self._lock:
+            return self._random.uniform(low, high)
+
+    def random_choice(self, options: Sequence[int]) -> int:
+        with self._lock:
+            return self._random.choice(options)
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def start(self) -> "ReplayServer":
+        """Serve on a background thread (for benchmarks and tests)."""
+        self._thread = threading.Thread(target=self.serve_forever, name='highergov-replay', daemon=True)
+        self._thread.start()
+        logger.info(f"HigherGov replay server listening on {self.base_url} ({len(self.index)} routes)")
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
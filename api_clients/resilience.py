@@ -0,0 +1,171 @@
+"""
+Rate limiting, retry and circuit breaking for HigherGov API calls.
+Shared by the sync and async clients so both pace, retry and fail the same way.
+"""
+
+import time
+import random
+import logging
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import FrozenSet, Optional
+
+logger = logging.getLogger(__name__)
+
+# Conservative defaults for the HigherGov API; override per client or via HIGHERGOV_REQUESTS_PER_SECOND
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+DEFAULT_BURST = 5
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HigherGovAPIError(Exception):
+    """Raised when a HigherGov API call fails after retries (and mock fallback is not enabled)."""
+
+
+class CircuitOpenError(HigherGovAPIError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    reserve() claims a token immediately and returns how long the caller must wait
+    before using it, so sync callers can time.sleep() and async callers can
+    asyncio.sleep() on the same bucket. Waiters queue in reservation order.
+    """
+
+    def __init__(self, rate: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST):
+        """
+        Args:
+            rate: Sustained requests per second
+            burst: Requests allowed back-to-back after an idle period
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Claim one token; returns the number of seconds to wait before sending the request."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for the given time (used when the server says Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """Jittered exponential backoff ("full jitter") that defers to the server's Retry-After."""
+
+    def __init__(self, max_retries: int = 4, backoff_base: float = 1.0, backoff_max: float = 60.0,
+                 retry_statuses: FrozenSet[int] = RETRYABLE_STATUSES):
+        """
+        Args:
+            max_retries: Retries after the first attempt (0 disables retrying)
+            backoff_base: Backoff ceiling for the first retry, in seconds
+            backoff_max: Upper bound for any single computed backoff
+            retry_statuses: HTTP statuses worth retrying
+        """
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before retry number attempt+1.
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            retry_after: Seconds requested by the server, if any (always honored)
+        """
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed     - requests flow; failure_threshold consecutive failures open the circuit
+    open       - requests fail fast with CircuitOpenError until reset_timeout has passed
+    half-open  - a single trial request is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError if the request must not be sent right now."""
+        with self._lock:
+            if self.state == 'closed':
+                return
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            if self.state == 'open' and remaining <= 0:
+                self.state = 'half-open'
+                self._trial_in_flight = False
+            if self.state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            raise CircuitOpenError(
+                f"HigherGov circuit open after {self._failures} consecutive failures - "
+                f"retrying in {max(0.0, remaining):.0f}s"
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half-open' or self._failures >= self.failure_threshold:
+                if self.state != 'open':
+                    logger.error(f"Opening HigherGov circuit breaker after {self._failures} consecutive failures")
+                self.state = 'open'
+                self._opened_at = time.monotonic()
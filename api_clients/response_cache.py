@@ -0,0 +1,175 @@
+"""
+On-disk HTTP response cache for HigherGov API endpoints.
+HigherGov refreshes its data every 30 minutes, so re-runs inside that window can be
+served locally. Entries live in SQLite, keyed by normalized endpoint + params with the
+API key excluded; TTLs are per endpoint and evaluated on read.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Endpoint templates -> seconds an entry is fresh. '{id}' matches one path segment.
+DEFAULT_TTLS = {
+    'opportunity/': 30 * 60,          # saved-search pages: HigherGov refresh window
+    'opportunity/search': 30 * 60,
+    'opportunity/{id}': 60 * 60,      # a single opportunity changes less often than the listing
+}
+DEFAULT_TTL = 30 * 60
+# Past its TTL an entry may still be served for this long while it is refreshed in the background
+DEFAULT_STALE_WHILE_REVALIDATE = 10 * 60
+
+# Query parameters that must never become part of a cache key
+_SECRET_PARAMS = {'api_key'}
+
+FRESH = 'fresh'
+STALE = 'stale'
+
+
+def _template_regex(template: str) -> re.Pattern:
+    return re.compile('^' + re.escape(template).replace(re.escape('{id}'), '[^/]+') + '/?$')
+
+
+class ResponseCache:
+    """
+    SQLite-backed cache of decoded JSON responses.
+
+    get() reports whether an entry is FRESH (serve it), STALE (serve it and refresh in
+    the background) or missing/expired (None - go to the network). Hit/miss counters
+    are kept per instance; see stats().
+    """
+
+    def __init__(self, path: str = "cache/highergov_responses.sqlite", ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = DEFAULT_TTL, stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file holding cached responses
+            ttls: Endpoint template -> TTL in seconds (merged over DEFAULT_TTLS; 0 disables caching)
+            default_ttl: TTL for endpoints that match no template
+            stale_while_revalidate: Seconds past the TTL an entry may still be served while refreshing
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        merged = dict(DEFAULT_TTLS)
+        merged.update(ttls or {})
+        self.ttls = [(_template_regex(template), ttl) for template, ttl in merged.items()]
+        self.default_ttl = default_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._revalidating: Set[str] = set()
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """Normalized cache key: endpoint plus sorted params, API key removed, booleans lower-cased."""
+        query = []
+        for name, value in sorted((params or {}).items()):
+            if name in _SECRET_PARAMS or value is None:
+                continue
+            if isinstance(value, bool):
+                value = str(value).lower()
+            query.append(f"{name}={value}")
+        return f"{endpoint.strip('/')}/?{'&'.join(query)}"
+
+    def ttl_for(self, endpoint: str) -> float:
+        endpoint = endpoint.lstrip('/')
+        for pattern, ttl in self.ttls:
+            if pattern.match(endpoint):
+                return ttl
+        return self.default_ttl
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            (data, FRESH or STALE) on a hit, (None, None) on a miss
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return None, None
+
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            row = self._conn.execute("SELECT body, fetched_at FROM responses WHERE key = ?", (key,)).fetchone()
+            age = time.time() - row[1] if row else None
+
+            if row and age <= ttl:
+                self.hits += 1
+                state = FRESH
+            elif row and age <= ttl + self.stale_while_revalidate:
+                self.stale_hits += 1
+                state = STALE
+            else:
+                self.misses += 1
+                return None, None
+
+        logger.info(f"Response cache {state} hit for {endpoint} (age {age:.0f}s)")
+        return json.loads(row[0]), state
+
+    def put(self, endpoint: str, params: Optional[Dict], data: Dict) -> None:
+        """Store a successful response."""
+        if self.ttl_for(endpoint) <= 0:
+            return
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, body, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, endpoint.strip('/'), json.dumps(data), time.time())
+            )
+            self._conn.commit()
+            self._revalidating.discard(key)
+
+    def begin_revalidate(self, endpoint: str, params: Optional[Dict] = None) -> bool:
+        """Claim the background refresh of a stale entry; False if one is already running."""
+        key = self.make_key(endpoint, params)
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidate(self, endpoint: str, params: Optional[Dict] = None) -> None:
+        """Release a refresh claim (put() does this too; call it when the refresh failed)."""
+        with self._lock:
+            self._revalidating.discard(self.make_key(endpoint, params))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits + self.stale_hits) / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,115 @@
+"""
+Incremental sync watermarks for HigherGov saved searches.
+Tracks the newest captured_date seen per saved search and the version_key
+last assessed per opportunity, so repeat runs only touch new or changed records.
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def opportunity_key(opp: Dict) -> str:
+    """Stable identifier for an opportunity across versions (HigherGov opp_key, else source_id)."""
+    return str(opp.get('opp_key') or opp.get('source_id') or '')
+
+
+class SyncWatermarkStore:
+    """
+    JSON-backed watermark store for incremental saved-search syncs.
+
+    Layout on disk:
+        {
+            "saved_searches": {"<search_id>": {"captured_date": "...", "last_sync": "..."}},
+            "opportunities": {"<opp_key>": "<version_key>"}
+        }
+    """
+
+    def __init__(self, path: str = "sync_state/highergov_watermarks.json"):
+        """
+        Load the store from disk (an empty store is used if the file does not exist yet).
+
+        Args:
+            path: Location of the JSON watermark file
+        """
+        self.path = path
+        self.saved_searches: Dict[str, Dict] = {}
+        self.opportunities: Dict[str, str] = {}
+        self._pending_watermarks: Dict[str, str] = {}
+        self.load()
+
+    def load(self) -> None:
+        """Read watermarks from disk, starting fresh if the file is missing or unreadable."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.saved_searches = data.get('saved_searches', {})
+            self.opportunities = data.get('opportunities', {})
+        except Exception as e:
+            logger.warning(f"Failed to load sync watermarks from {self.path}: {e} - starting a full sync")
+            self.saved_searches = {}
+            self.opportunities = {}
+
+    def save(self, advance_watermarks: bool = True) -> None:
+        """
+        Write watermarks atomically (temp file + rename) so a crash never leaves a torn file.
+
+        Args:
+            advance_watermarks: Move each saved search's captured_date watermark forward.
+                                Pass False after a run with failures so the same window is
+                                re-read next time (version_keys are still saved).
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if advance_watermarks:
+            for search_id, captured_date in self._pending_watermarks.items():
+                self.saved_searches[search_id] = {
+                    'captured_date': captured_date,
+                    'last_sync': datetime.now().isoformat()
+                }
+        self._pending_watermarks.clear()
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_searches': self.saved_searches, 'opportunities': self.opportunities}, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get_watermark(self, search_id: str) -> Optional[str]:
+        """Return the newest captured_date recorded for a saved search, if any."""
+        return self.saved_searches.get(search_id, {}).get('captured_date')
+
+    def observe_captured_date(self, search_id: str, captured_date: Optional[str]) -> None:
+        """
+        Remember the newest captured_date seen during this run.
+
+        The watermark only moves forward on save(), so an interrupted run re-reads
+        the same window next time instead of silently skipping records.
+        """
+        if not captured_date:
+            return
+        captured_date = str(captured_date)
+        current = self._pending_watermarks.get(search_id) or self.get_watermark(search_id)
+        if not current or captured_date > current:
+            self._pending_watermarks[search_id] = captured_date
+
+    def is_unchanged(self, opp: Dict) -> bool:
+        """True if this exact opportunity version has already been assessed."""
+        version_key = opp.get('version_key')
+        if not version_key:
+            return False
+        return self.opportunities.get(opportunity_key(opp)) == version_key
+
+    def mark_assessed(self, opp: Dict) -> None:
+        """Record the version_key of an opportunity once it has been assessed successfully."""
+        key = opportunity_key(opp)
+        version_key = opp.get('version_key')
+        if key and version_key:
+            self.opportunities[key] = version_key
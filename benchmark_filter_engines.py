@@ -0,0 +1,160 @@
+"""
+Differential benchmark of the three filter engines on one corpus.
+
+    python benchmark_filter_engines.py [opportunities.json] [--count 200] [--kb 32] [--repeat 3]
+
+Runs InitialChecklistFilterV2, SOSFilter and InitialChecklistFilterV2Enhanced over every
+opportunity, twice: with each engine on its own pattern core (every engine scans the text
+for itself, as before the core was shared) and with all three on one shared PatternCore
+(see filters/pattern_core.py). Both runs must give every engine the same decisions. Reported:
+time per engine and in total, regex scans per opportunity, and where the engines disagree
+with each other - pairwise counts and the most common decision combinations.
+
+Without a file, synthetic opportunities are built from a GO listing, neutral solicitation
+filler and a few paragraphs of the SOS reference docs (which quote the hard stop language),
+so the decisions are mixed. A file may hold a list of opportunities with full_analysis_text
+(e.g. from the pipeline output) or plain texts.
+"""
+
+import os
+import sys
+import glob
+import json
+import time
+import random
+import logging
+from collections import Counter
+from datetime import date
+
+from filters.initial_checklist_v2 import InitialChecklistFilterV2
+from filters.sos_official_filter import SOSFilter
+from filters.pattern_core import PatternCore
+from filters.regex_backend import DEFAULT_BACKEND
+from initial_checklist_v2_enhanced import InitialChecklistFilterV2Enhanced
+
+ENGINES = (('V2', InitialChecklistFilterV2), ('SOSFilter', SOSFilter), ('V2 Enhanced', InitialChecklistFilterV2Enhanced))
+LISTING = "RFQ for KC-46 Pegasus aircraft spare parts. Quote the part number, quantity and delivery schedule.\n"
+FILLER_WORDS = ['the', 'contractor', 'shall', 'deliver', 'quantity', 'unit', 'price', 'line', 'item', 'inspection',
+                'acceptance', 'packaging', 'marking', 'shipping', 'schedule', 'invoice', 'payment', 'clause',
+                'provision', 'offeror', 'quote', 'delivery', 'days', 'after', 'award', 'per', 'each', 'spare',
+                'assembly', 'kit', 'lot', 'warranty', 'freight', 'destination', 'origin', 'label']
+
+
+def option(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+
+def synthetic_opportunities(count: int, size_kb: int):
+    rng = random.Random(42)
+    paragraphs = [paragraph.strip()
+                  for path in sorted(glob.glob(os.path.join('SOS-New-Model-Docs', '*.md')))
+                  for paragraph in open(path, encoding='utf-8', errors='ignore').read().split('\n\n')
+                  if 40 < len(paragraph.strip()) < 600]
+    today = date.today().isoformat()
+    opportunities = {}
+    for number in range(count):
+        words, length = [], 0
+        while length < size_kb * 1024:
+            words.append(rng.choice(FILLER_WORDS) + ('.\n' if rng.random() < 0.05 else ''))
+            length += len(words[-1]) + 1
+        parts = [' '.join(words)]
+        for paragraph in rng.sample(paragraphs, rng.choice((0, 0, 1, 1, 2, 3))):
+            parts.insert(rng.randrange(len(parts) + 1), paragraph)
+        opportunities[f"synthetic-{number}"] = {'full_analysis_text': LISTING + '\n'.join(parts),
+                                                'due_date': '2099-01-01', 'posted_date': today}
+    return opportunities
+
+
+def file_opportunities(path: str):
+    with open(path, encoding='utf-8') as f:
+        items = json.load(f)
+    opportunities = {}
+    for position, item in enumerate(items):
+        opp = item if isinstance(item, dict) else {'full_analysis_text': item}
+        opp.setdefault('due_date', '2099-01-01')
+        opp.setdefault('posted_date', date.today().isoformat())
+        opportunities[f"#{position} {opp.get('source_id', '')}".strip()] = opp
+    return opportunities
+
+
+def decision_of(outcome) -> str:
+    """Decision as a string, whatever the engine returns."""
+    if isinstance(outcome, tuple):
+        return outcome[0].value
+    return outcome.decision
+
+
+def run(engines, cores, opportunities, repeat: int):
+    """Assess every opportunity with every engine; returns decisions, seconds per engine and scans."""
+    decisions = {name: {} for name, _ in engines}
+    seconds = Counter()
+    scans = 0
+    for _ in range(repeat):
+        scans = 0
+        for opp_id, opp in opportunities.items():
+            text = opp['full_analysis_text']
+            for core in cores:
+                core.release()  # nothing carried over from the previous repeat
+            for name, engine in engines:
+                start = time.perf_counter()
+                decisions[name][opp_id] = decision_of(engine.assess_opportunity(opp, text=text))
+                seconds[name] += time.perf_counter() - start
+            scans += sum(core.index_for(text).scans for core in cores)
+    return decisions, {name: seconds[name] / repeat for name, _ in engines}, scans
+
+
+def main():
+    args = sys.argv[1:]
+    # ERROR too: the enhanced engine logs its platform patterns that `re` rejects on every call
+    logging.disable(logging.ERROR)
+    repeat = option(args, '--repeat', 3)
+    paths = [arg for arg in args if os.path.isfile(arg)]
+    opportunities = (file_opportunities(paths[0]) if paths
+                     else synthetic_opportunities(option(args, '--count', 200), option(args, '--kb', 32)))
+
+    separate_cores = [PatternCore(prefilter=False) for _ in ENGINES]
+    separate = [(name, cls(pattern_core=core)) for (name, cls), core in zip(ENGINES, separate_cores)]
+    shared_core = PatternCore()
+    shared = [(name, cls(pattern_core=shared_core)) for name, cls in ENGINES]
+
+    expected, separate_seconds, separate_scans = run(separate, separate_cores, opportunities, repeat)
+    decisions, shared_seconds, shared_scans = run(shared, [shared_core], opportunities, repeat)
+    for name, _ in ENGINES:
+        if decisions[name] != expected[name]:
+            raise AssertionError(f"{name} decides differently on the shared core")
+
+    stats = shared_core.stats()
+    print(f"Regex backend: {DEFAULT_BACKEND.engine}, {len(opportunities)} opportunities, median text "
+          f"{sorted(len(o['full_analysis_text']) for o in opportunities.values())[len(opportunities) // 2]:,} chars, "
+          f"mean of {repeat} runs")
+    print(f"Shared core: {stats['patterns']} distinct patterns ({stats['reused']} compiles reused), "
+          f"{stats['prefiltered']} answered by the RE2 set prefilter when absent\n")
+
+    header = f"{'engine':<14}{'separate':>12}{'shared core':>14}{'speedup':>9}"
+    print(header)
+    print('-' * len(header))
+    for name, _ in ENGINES:
+        print(f"{name:<14}{separate_seconds[name] * 1000:>10.1f}ms{shared_seconds[name] * 1000:>12.1f}ms"
+              f"{separate_seconds[name] / shared_seconds[name]:>8.2f}x")
+    total_separate, total_shared = sum(separate_seconds.values()), sum(shared_seconds.values())
+    print('-' * len(header))
+    print(f"{'all three':<14}{total_separate * 1000:>10.1f}ms{total_shared * 1000:>12.1f}ms"
+          f"{total_separate / total_shared:>8.2f}x")
+    print(f"{'scans / opp':<14}{separate_scans / len(opportunities):>12.1f}{shared_scans / len(opportunities):>14.1f}\n")
+
+    names = [name for name, _ in ENGINES]
+    print("Disagreements between engines")
+    for position, first in enumerate(names):
+        for second in names[position + 1:]:
+            differ = [opp_id for opp_id in opportunities if decisions[first][opp_id] != decisions[second][opp_id]]
+            example = f"  e.g. {', '.join(differ[:3])}" if differ else ''
+            print(f"  {first} vs {second}: {len(differ)} of {len(opportunities)}{example}")
+
+    print(f"\n{'  /  '.join(names):<40}{'count':>7}")
+    combinations = Counter(tuple(decisions[name][opp_id] for name in names) for opp_id in opportunities)
+    for combination, count in combinations.most_common():
+        print(f"{'  /  '.join(combination):<40}{count:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark concurrent Phase 1 evaluation against the one-check-after-another path.
+
+    python benchmark_phase1_concurrency.py [opportunities.json] [--kb 256] [--workers N] [--repeat 5]
+
+Without a file, synthetic opportunities are built: a listing for a GO platform padded with
+neutral solicitation text to the requested size, with one hard stop (or none) near the end,
+so every check before it scans the whole text. A file may hold a list of opportunities with
+full_analysis_text (e.g. from the pipeline output) or plain texts. Each opportunity is
+assessed with phase1_workers=0 and with N threads (default: CPU count); both paths must
+return identical decisions and results, and the median latency per opportunity is reported.
+
+The searches only overlap when the regex backend releases the GIL while matching (RE2;
+install google-re2, or compare with SOS_REGEX_BACKEND=re) and there is more than one core.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import statistics
+
+from filters.initial_checklist_v2 import InitialChecklistFilterV2
+from filters.regex_backend import DEFAULT_BACKEND
+
+LISTING = "RFQ for KC-46 Pegasus aircraft spare parts. Quote the part number, quantity and delivery schedule.\n"
+# Words that none of the hard stop patterns match
+FILLER_WORDS = ['the', 'contractor', 'shall', 'deliver', 'quantity', 'unit', 'price', 'line', 'item', 'inspection',
+                'acceptance', 'packaging', 'marking', 'shipping', 'schedule', 'invoice', 'payment', 'clause',
+                'provision', 'offeror', 'quote', 'delivery', 'days', 'after', 'award', 'per', 'each', 'spare',
+                'assembly', 'kit', 'lot', 'warranty', 'freight', 'destination', 'origin', 'label']
+HARD_STOPS = {
+    'GO (no hard stop)': None,
+    'NO-GO at check 1 (SAR)': "Source approval required for this military specification item.",
+    'NO-GO at check 4 (security)': "Contractor personnel must hold a secret security clearance.",
+    'NO-GO at check 8 (OEM)': "Parts must be procured from an authorized distributor.",
+}
+
+
+def option(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+
+def synthetic_opportunities(size_kb: int):
+    rng = random.Random(42)
+    size = size_kb * 1024
+    opportunities = {}
+    for scenario, hard_stop in HARD_STOPS.items():
+        words, length = [], len(LISTING)
+        while length < size:
+            word = rng.choice(FILLER_WORDS)
+            words.append(word + ('.\n' if rng.random() < 0.05 else ''))
+            length += len(words[-1]) + 1
+        filler = ' '.join(words)
+        if hard_stop:
+            cut = int(len(filler) * 0.9)
+            filler = f"{filler[:cut]} {hard_stop} {filler[cut:]}"
+        opportunities[scenario] = {'full_analysis_text': LISTING + filler, 'due_date': '2099-01-01'}
+    return opportunities
+
+
+def file_opportunities(path: str):
+    with open(path, encoding='utf-8') as f:
+        items = json.load(f)
+    opportunities = {}
+    for position, item in enumerate(items):
+        opp = item if isinstance(item, dict) else {'full_analysis_text': item}
+        opp.setdefault('due_date', '2099-01-01')
+        opportunities[f"#{position} {opp.get('source_id', '')}".strip()] = opp
+    return opportunities
+
+
+def summarize(outcome):
+    decision, results = outcome
+    return decision, [(result.check_name, result.decision, result.reason, result.quote) for result in results]
+
+
+def latency(filter_logic, opp, repeat: int):
+    times, outcome = [], None
+    for _ in range(repeat):
+        text = filter_logic.extract_text_from_opportunity(opp)
+        filter_logic.scan_engine.release()  # no match index carried over between runs
+        start = time.perf_counter()
+        outcome = filter_logic.assess_opportunity(opp, text=text)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), summarize(outcome)
+
+
+def main():
+    args = sys.argv[1:]
+    logging.disable(logging.INFO)
+    workers = option(args, '--workers', os.cpu_count() or 1)
+    repeat = option(args, '--repeat', 5)
+    paths = [arg for arg in args if os.path.isfile(arg)]
+    opportunities = file_opportunities(paths[0]) if paths else synthetic_opportunities(option(args, '--kb', 256))
+
+    sequential = InitialChecklistFilterV2()
+    concurrent = InitialChecklistFilterV2(phase1_workers=workers)
+    print(f"Regex backend: {DEFAULT_BACKEND.engine}, CPUs: {os.cpu_count()}, threads: {workers}, "
+          f"median of {repeat} runs\n")
+
+    header = f"{'opportunity':<30}{'chars':>10}  {'decision':<15}{'sequential':>12}{'concurrent':>12}{'speedup':>9}"
+    print(header)
+    print('-' * len(header))
+    total_sequential = total_concurrent = 0.0
+    for name, opp in opportunities.items():
+        sequential_time, expected = latency(sequential, opp, repeat)
+        concurrent_time, outcome = latency(concurrent, opp, repeat)
+        if outcome != expected:
+            raise AssertionError(f"Concurrent evaluation disagrees with the sequential path for {name}")
+        total_sequential += sequential_time
+        total_concurrent += concurrent_time
+        print(f"{name[:29]:<30}{len(opp['full_analysis_text']):>10,}  {expected[0].value:<15}"
+              f"{sequential_time * 1000:>10.1f}ms{concurrent_time * 1000:>10.1f}ms{sequential_time / concurrent_time:>8.2f}x")
+    print('-' * len(header))
+    print(f"{'total':<55}{total_sequential * 1000:>10.1f}ms{total_concurrent * 1000:>10.1f}ms"
+          f"{total_sequential / total_concurrent:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ import os
 import io
 import logging
 import hashlib
-from typing import List, Dict, Optional, Tuple
+from typing import BinaryIO, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 import json
 import time
@@ -24,6 +24,9 @@ import chromadb
 from chromadb.config import Settings
 import tiktoken
 
+# PDFs may arrive as raw bytes, a path on disk, or a (spooled) binary file handle
+PDFSource = Union[bytes, str, BinaryIO]
+
 
 @dataclass
 class DocumentChunk:
@@ -78,21 +81,56 @@ class PDFRAGProcessor:
         # Initialize tokenizer for accurate token counting
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
         
-    def get_cache_key(self, pdf_content: bytes, filename: str) -> str:
-        """Generate unique cache key for PDF content."""
-        content_hash = hashlib.md5(pdf_content).hexdigest()
+    def _pdf_input(self, pdf_source: PDFSource) -> Union[str, BinaryIO]:
+        """Return something pdfplumber/PyPDF2 can open: the path itself or a rewound binary stream."""
+        if isinstance(pdf_source, (bytes, bytearray)):
+            return io.BytesIO(pdf_source)
+        if isinstance(pdf_source, str):
+            return pdf_source
+        pdf_source.seek(0)
+        return pdf_source
+    
+    def _pdf_size(self, pdf_source: PDFSource) -> int:
+        """Size of the PDF in bytes without reading it into memory."""
+        if isinstance(pdf_source, (bytes, bytearray)):
+            return len(pdf_source)
+        if isinstance(pdf_source, str):
+            return os.path.getsize(pdf_source)
+        position = pdf_source.tell()
+        pdf_source.seek(0, os.SEEK_END)
+        size = pdf_source.tell()
+        pdf_source.seek(position)
+        return size
+    
+    def get_cache_key(self, pdf_content: PDFSource, filename: str) -> str:
+        """Generate unique cache key for PDF content (hashed in chunks for files and paths)."""
+        if isinstance(pdf_content, (bytes, bytearray)):
+            content_hash = hashlib.md5(pdf_content).hexdigest()
+        else:
+            digest = hashlib.md5()
+            stream = open(pdf_content, 'rb') if isinstance(pdf_content, str) else self._pdf_input(pdf_content)
+            try:
+                for block in iter(lambda: stream.read(1024 * 1024), b''):
+                    digest.update(block)
+            finally:
+                if isinstance(pdf_content, str):
+                    stream.close()
+                else:
+                    stream.seek(0)
+            content_hash = digest.hexdigest()
         return f"{filename}_{content_hash}"
     
-    def extract_text_with_metadata(self, pdf_content: bytes, filename: str) -> List[Dict]:
+    def extract_text_with_metadata(self, pdf_content: PDFSource, filename: str) -> List[Dict]:
         """
         Extract text from PDF with page numbers and section detection.
         Uses both PyPDF2 and pdfplumber for maximum text extraction.
+        Accepts raw bytes, a file path, or a binary file handle.
         """
         pages_data = []
         
         try:
             # Method 1: pdfplumber (better for complex layouts)
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+            with pdfplumber.open(self._pdf_input(pdf_content)) as pdf:
                 for page_num, page in enumerate(pdf.pages, 1):
                     try:
                         text = page.extract_text() or ""
@@ -115,7 +153,7 @@ class PDFRAGProcessor:
             
             # Fallback: PyPDF2
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+                pdf_reader = PyPDF2.PdfReader(self._pdf_input(pdf_content))
                 for page_num, page in enumerate(pdf_reader.pages, 1):
                     try:
                         text = page.extract_text() or ""
@@ -230,28 +268,41 @@ class PDFRAGProcessor:
         
         return chunks
     
-    def process_pdf_to_rag(self, pdf_content: bytes, filename: str) -> List[DocumentChunk]:
+    def process_pdf_to_rag(self, pdf_content: PDFSource, filename: str,
+                           content_hash: Optional[str] = None) -> List[DocumentChunk]:
         """
         Main method to convert PDF into RAG-ready chunks.
+        Accepts raw bytes, a file path, or a binary file handle (e.g. a spooled download).
+        
+        When the caller already knows the sha256 of the content (from the attachment store),
+        chunks are cached by that hash alone: the same SOW attached under different file
+        names is extracted once, and the PDF is not re-hashed here.
         """
-        logging.info(f"Processing PDF: {filename} ({len(pdf_content)} bytes)")
+        logging.info(f"Processing PDF: {filename} ({self._pdf_size(pdf_content)} bytes)")
         
         # Check cache first
-        cache_key = self.get_cache_key(pdf_content, filename)
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
+        if content_hash:
+            cache_file = os.path.join(self.cache_dir, f"sha256_{content_hash}.json")
+        else:
+            cache_key = self.get_cache_key(pdf_content, filename)
+            cache_file = os.path.join(self.cache_dir, f"{cache_key}.json")
         
         if os.path.exists(cache_file):
             try:
-                # Check if cache is less than 24 hours old
-                if time.time() - os.path.getmtime(cache_file) < 86400:
+                # Content-addressed entries never go stale; filename-keyed ones expire after 24 hours
+                if content_hash or time.time() - os.path.getmtime(cache_file) < 86400:
                     logging.info(f"Loading cached chunks for {filename}")
                     with open(cache_file, 'r', encoding='utf-8') as f:
                         cached_data = json.load(f)
                     
                     # Reconstruct DocumentChunk objects
                     chunks = []
-                    for chunk_data in cached_data:
+                    for chunk_index, chunk_data in enumerate(cached_data):
                         chunk = DocumentChunk(**chunk_data)
+                        if content_hash:
+                            # Cached under whichever attachment name was seen first
+                            chunk.chunk_id = f"{filename}_chunk_{chunk_index:04d}"
+                            chunk.source_file = filename
                         chunks.append(chunk)
                     
                     return chunks
@@ -0,0 +1,73 @@
+"""
+Where the filter time goes, summed over the runs in a filter metrics file.
+
+    SOS_FILTER_METRICS=metrics/filter_metrics.jsonl python run_sos.py
+    python filter_metrics_report.py metrics/filter_metrics.jsonl [more.jsonl ...] [--top 15] [--alternatives 3]
+
+Runs with SOS_FILTER_METRICS set append one record each (see filters/filter_metrics.py).
+This sums every record in the given files and prints the checks by wall time, then the most
+expensive patterns with their costliest top-level alternatives (each alternative is timed on
+its own over the same texts, so their times add up to more than one search of the pattern).
+"""
+
+import os
+import sys
+import logging
+
+from filters.filter_metrics import aggregate, read_records
+
+
+def option(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+
+def megabytes(chars) -> str:
+    return f"{chars / 1e6:.1f}"
+
+
+def main():
+    args = sys.argv[1:]
+    logging.disable(logging.INFO)
+    paths = [arg for arg in args if arg.endswith('.jsonl') and os.path.isfile(arg)]
+    if not paths:
+        sys.exit(__doc__)
+    total = aggregate(record for path in paths for record in read_records(path))
+    top = option(args, '--top', 15)
+    shown_alternatives = option(args, '--alternatives', 3)
+
+    print(f"{total['runs']} runs, {total['texts']} assessed texts\n")
+    header = f"{'check':<42}{'calls':>8}{'total s':>10}{'ms/call':>10}{'MB scanned':>12}{'searches':>10}{'matches':>10}  decisions"
+    print(header)
+    print('-' * len(header))
+    for name, stats in sorted(total['checks'].items(), key=lambda item: -item[1].get('seconds', 0)):
+        calls = stats.get('calls', 0)
+        decisions = ', '.join(f"{decision} {count}" for decision, count in sorted(stats.get('decisions', {}).items()))
+        print(f"{name[:41]:<42}{calls:>8}{stats.get('seconds', 0):>10.2f}"
+              f"{stats.get('seconds', 0) / calls * 1000 if calls else 0:>10.2f}{megabytes(stats.get('scanned', 0)):>12}"
+              f"{stats.get('searches', 0):>10}{stats.get('matches', 0):>10}  {decisions}")
+
+    prefilter = total['prefilter']
+    if prefilter.get('searches'):
+        print(f"\nPrefilter: {prefilter['searches']} passes, {prefilter['seconds']:.2f}s over "
+              f"{megabytes(prefilter['scanned'])} MB")
+
+    patterns = sorted(total['patterns'].values(), key=lambda stats: -stats.get('seconds', 0))
+    print(f"\nTop {min(top, len(patterns))} of {len(patterns)} patterns by search time")
+    header = f"{'pattern':<44}{'engine':>7}{'searches':>10}{'skipped':>9}{'total s':>10}{'ms/search':>11}{'MB scanned':>12}{'matches':>9}"
+    print(header)
+    print('-' * len(header))
+    for stats in patterns[:top]:
+        label = ', '.join(stats.get('names') or ()) or stats.get('source', '')
+        searches = stats.get('searches', 0)
+        print(f"{label[:43]:<44}{stats.get('engine', ''):>7}{searches:>10}{stats.get('prefiltered', 0):>9}"
+              f"{stats.get('seconds', 0):>10.2f}{stats.get('seconds', 0) / searches * 1000 if searches else 0:>11.3f}"
+              f"{megabytes(stats.get('scanned', 0)):>12}{stats.get('matches', 0):>9}")
+        alternatives = sorted(stats.get('alternatives', {}).items(), key=lambda item: -item[1].get('seconds', 0))
+        for source, alternative in alternatives[:shown_alternatives]:
+            print(f"    {alternative.get('seconds', 0):>8.2f}s {alternative.get('matches', 0):>7} matches  {source[:90]}")
+        if len(alternatives) > shown_alternatives:
+            print(f"    ... {len(alternatives) - shown_alternatives} more alternatives")
+
+
+if __name__ == "__main__":
+    main()
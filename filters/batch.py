@@ -0,0 +1,99 @@
+"""
+Process-pool batch assessment for the filter classes.
+The pipelines assess one opportunity at a time, so all regex work runs on one core.
+assess_in_pool() spreads assess_opportunity() over worker processes: each worker holds
+its own copy of the already-compiled filter (inherited at fork, so nothing is recompiled;
+where fork is unavailable each worker rebuilds it once from filter_obj.worker_args()),
+only the extracted text and the few fields the checks read cross the process boundary,
+and results come back in input order while later opportunities are still being assessed.
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Opportunities queued per worker ahead of the one being yielded
+IN_FLIGHT_PER_WORKER = 4
+
+# Filter assessed by this worker process
+_worker_filter = None
+
+
+def _init_worker(filter_obj) -> None:
+    """Pool initializer: keep the filter for every task of this worker."""
+    global _worker_filter
+    # Under spawn the class and its constructor arguments arrive instead of the instance
+    if isinstance(filter_obj, tuple):
+        filter_class, kwargs = filter_obj
+        filter_obj = filter_class(**kwargs)
+    _worker_filter = filter_obj
+
+
+def _assess_in_worker(fields: Dict, text: str):
+    return _worker_filter.assess_opportunity(fields, text=text)
+
+
+def opportunity_id(opp: Dict) -> Optional[str]:
+    """Identifier the pipelines report an opportunity under (source_id, else id)."""
+    return opp.get('source_id') or opp.get('id')
+
+
+def assess_in_pool(filter_obj, opps: Iterable[Dict], extract_text: Callable[[Dict], str],
+                   fields: Sequence[str], workers: Optional[int] = None) -> Iterator[Tuple[Optional[str], Any]]:
+    """
+    Run filter_obj.assess_opportunity() over many opportunities on a process pool.
+
+    Args:
+        filter_obj: Filter whose assess_opportunity(opp, text=...) accepts pre-extracted text;
+            without fork it must also provide worker_args() (constructor keyword arguments)
+        opps: Opportunities (any iterable; consumed lazily, a few per worker ahead)
+        extract_text: The filter's text extraction, run here on the full opportunity
+        fields: Opportunity fields the checks read besides the text (e.g. due dates);
+            only these and the extracted text are sent to the workers
+        workers: Worker processes (default: CPU count); 1 assesses in this process
+
+    Returns:
+        Iterator of (opportunity id, assess_opportunity() result), in input order
+
+    Raises:
+        TypeError: workers > 1 without fork and filter_obj has no worker_args()
+    """
+    workers = workers or os.cpu_count() or 1
+
+    def payloads():
+        for opp in opps:
+            text = extract_text(opp)
+            yield opportunity_id(opp), {name: opp[name] for name in fields if name in opp}, text
+
+    if workers <= 1:
+        for opp_id, opp_fields, text in payloads():
+            yield opp_id, filter_obj.assess_opportunity(opp_fields, text=text)
+        return
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context, initial = multiprocessing.get_context('fork'), filter_obj
+    else:
+        # Compiled filters do not pickle (locks, thread-local scan state): each worker rebuilds
+        # the filter from its constructor arguments, which pickle as their settings
+        if not hasattr(filter_obj, 'worker_args'):
+            raise TypeError(f"{type(filter_obj).__name__} cannot be rebuilt in a spawned worker "
+                            f"(no worker_args()); assess with workers=1")
+        context, initial = multiprocessing.get_context(), (type(filter_obj), filter_obj.worker_args())
+
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=_init_worker, initargs=(initial,))
+    try:
+        pending = deque()
+        for opp_id, opp_fields, text in payloads():
+            pending.append((opp_id, pool.submit(_assess_in_worker, opp_fields, text)))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                opp_id, future = pending.popleft()
+                yield opp_id, future.result()
+        while pending:
+            opp_id, future = pending.popleft()
+            yield opp_id, future.result()
+    finally:
+        # A caller that stops early does not wait for the queued assessments
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,339 @@
+"""
+Opt-in instrumentation of the filter engines.
+With metrics enabled, every search a MatchIndex runs over an assessed text (filters/scan_engine.py)
+and every check assess_opportunity() runs record their wall time, the length of text they
+scanned and the matches they found. Each searched pattern's top-level alternatives are also
+timed one by one over the same text, so a costly rule can be traced to the alternative that
+makes it costly. Disabled (the default), the engines only check one module attribute per search.
+
+    SOS_FILTER_METRICS=metrics/filter_metrics.jsonl python run_sos.py
+
+collects from start-up and appends one JSON record for the run to the file at exit
+(SOS_FILTER_METRICS_ALTERNATIVES=0 skips the costly per-alternative timings); a pipeline
+can also enable() and export() itself. The file holds one record per run, so runs
+can be summed with aggregate() (see filter_metrics_report.py). Only the process that enabled
+the metrics is measured: assess_many() worker processes are not.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from filters.regex_backend import CompiledPattern, RegexBackend, from_re2, pattern_key, re2
+
+logger = logging.getLogger(__name__)
+
+# Metrics file to collect into from start-up (unset: metrics stay off)
+METRICS_ENV = 'SOS_FILTER_METRICS'
+# Set to 0 to leave out the per-alternative timings (and their cost)
+ALTERNATIVES_ENV = 'SOS_FILTER_METRICS_ALTERNATIVES'
+
+# Leading inline flags, e.g. the (?i) to_re2() puts in front of RE2 sources
+_INLINE_FLAGS = re.compile(r'\(\?[a-zA-Z]+\)')
+# Pattern and alternative sources are cut to this length in the metrics file
+MAX_SOURCE_CHARS = 200
+_COMPILE_ERRORS = (re.error,) + ((re2.error,) if re2 is not None else ())
+
+# Names the scan engines registered each compiled pattern under (see ScanEngine.register)
+_names: Dict[CompiledPattern, Set[str]] = {}
+
+
+def name_pattern(compiled: CompiledPattern, name: str) -> None:
+    """Remember a name a pattern was registered under, to label its metrics."""
+    _names.setdefault(compiled, set()).add(name)
+
+
+def split_alternatives(source: str) -> List[str]:
+    """The top-level alternatives of a regex source (one element if it has none)."""
+    alternatives = []
+    depth = 0
+    start = position = 0
+    in_class = False
+    while position < len(source):
+        char = source[position]
+        if char == '\\':
+            position += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # a ']' right after '[' or '[^' is a literal
+            position += 3 if source.startswith('^]', position + 1) else 2 if source.startswith(']', position + 1) else 1
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            alternatives.append(source[start:position])
+            start = position + 1
+        position += 1
+    alternatives.append(source[start:])
+    return alternatives
+
+
+def _stats() -> Dict[str, float]:
+    return {'searches': 0, 'seconds': 0.0, 'scanned': 0, 'matches': 0}
+
+
+def _add(stats: Dict, seconds: float, scanned: int, matches: int) -> None:
+    stats['searches'] += 1
+    stats['seconds'] += seconds
+    stats['scanned'] += scanned
+    stats['matches'] += matches
+
+
+class FilterMetrics:
+    """
+    Per-check, per-pattern and per-alternative counters of one run.
+
+    Checks: calls, wall time, characters of text they were given, and the searches,
+    characters scanned and matches of the patterns they searched. Patterns (by pattern_key):
+    searches, wall time, characters scanned, matches, and how often the prefilter answered
+    them without a search. Alternatives: the same, each timed on its own with finditer().
+    Time spent timing alternatives is left out of the check times. Searches made outside a
+    V2 check (other engines, prefetch threads) are counted under "(outside checks)".
+    """
+
+    def __init__(self, alternatives: bool = True):
+        """
+        Args:
+            alternatives: Also time each top-level alternative of every searched pattern
+                (each scans the whole text: several times the regex work of the run)
+        """
+        self.alternatives = alternatives
+        self.started = datetime.now()
+        self.texts = 0
+        self.checks: Dict[str, Dict] = {}
+        self.patterns: Dict[CompiledPattern, Dict] = {}
+        self.prefilter = _stats()
+        self._compiled_alternatives: Dict[CompiledPattern, List[Tuple[str, CompiledPattern]]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --- Checks ---
+
+    def checked(self, run: Callable, chars: int) -> Callable:
+        """
+        A check runner (run(check) -> CheckResult) that records every check it runs.
+
+        Args:
+            run: Runs a check on the assessed text
+            chars: Length of the assessed text
+        """
+        with self._lock:
+            self.texts += 1
+        return lambda check: self.timed(check.__name__, lambda: run(check), chars)
+
+    def timed(self, name: str, call: Callable, chars: int = 0):
+        """Run call() (returning a CheckResult) and record it as check `name` given `chars` of text."""
+        local = self._local
+        outer = getattr(local, 'check', None)
+        overhead = getattr(local, 'overhead', 0.0)
+        local.check = name
+        start = time.perf_counter()
+        try:
+            result = call()
+        finally:
+            local.check = outer
+        seconds = time.perf_counter() - start - (getattr(local, 'overhead', 0.0) - overhead)
+        with self._lock:
+            stats = self._check(name)
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['chars'] += chars
+            stats['decisions'][result.decision.value] += 1
+        return result
+
+    def _check(self, name: Optional[str]) -> Dict:
+        name = name or '(outside checks)'
+        if name not in self.checks:
+            self.checks[name] = {'calls': 0, 'seconds': 0.0, 'chars': 0, 'searches': 0, 'scanned': 0,
+                                 'matches': 0, 'decisions': Counter()}
+        return self.checks[name]
+
+    # --- Pattern searches (called by MatchIndex) ---
+
+    def search(self, regex: CompiledPattern, text: str):
+        """regex.search(text), recorded."""
+        start = time.perf_counter()
+        match = regex.search(text)
+        seconds = time.perf_counter() - start
+        self._record(regex, seconds, match.end() if match else len(text), 1 if match else 0)
+        self._profile(regex, text)
+        return match
+
+    def finditer(self, regex: CompiledPattern, text: str, profile: bool = True) -> List:
+        """list(regex.finditer(text)), recorded (profile: also time the alternatives)."""
+        start = time.perf_counter()
+        matches = list(regex.finditer(text))
+        self._record(regex, time.perf_counter() - start, len(text), len(matches))
+        if profile:
+            self._profile(regex, text)
+        return matches
+
+    def prefilter_pass(self, prefilter, text: str):
+        """prefilter.matching(text), recorded."""
+        start = time.perf_counter()
+        present = prefilter.matching(text)
+        seconds = time.perf_counter() - start
+        with self._lock:
+            _add(self.prefilter, seconds, len(text), len(present or ()))
+            _add(self._check(getattr(self._local, 'check', None)), 0.0, len(text), 0)
+        return present
+
+    def prefiltered(self, regex: CompiledPattern) -> None:
+        """The prefilter pass answered the pattern (no match) without a search."""
+        with self._lock:
+            self._pattern(regex)['prefiltered'] += 1
+
+    def _pattern(self, regex: CompiledPattern) -> Dict:
+        if regex not in self.patterns:
+            self.patterns[regex] = dict(_stats(), prefiltered=0, alternatives={})
+        return self.patterns[regex]
+
+    def _record(self, regex: CompiledPattern, seconds: float, scanned: int, matches: int) -> None:
+        with self._lock:
+            _add(self._pattern(regex), seconds, scanned, matches)
+            _add(self._check(getattr(self._local, 'check', None)), 0.0, scanned, matches)
+
+    def _profile(self, regex: CompiledPattern, text: str) -> None:
+        """Time every top-level alternative of the pattern on its own over the text."""
+        if not self.alternatives:
+            return
+        start = time.perf_counter()
+        for source, alternative in self._alternatives_of(regex):
+            alternative_start = time.perf_counter()
+            count = sum(1 for _ in alternative.finditer(text))
+            seconds = time.perf_counter() - alternative_start
+            with self._lock:
+                alternatives = self._pattern(regex)['alternatives']
+                _add(alternatives.setdefault(source, _stats()), seconds, len(text), count)
+        self._local.overhead = getattr(self._local, 'overhead', 0.0) + time.perf_counter() - start
+
+    def _alternatives_of(self, regex: CompiledPattern) -> List[Tuple[str, CompiledPattern]]:
+        """(source, compiled) of each top-level alternative, on the pattern's engine ([] if it has one)."""
+        if regex in self._compiled_alternatives:
+            return self._compiled_alternatives[regex]
+        source = regex.pattern
+        inline = _INLINE_FLAGS.match(source)
+        prefix = inline.group() if inline else ''
+        sources = split_alternatives(source[len(prefix):])
+        compiled = []
+        if len(sources) > 1:
+            try:
+                for alternative in sources:
+                    if RegexBackend.engine_of(regex) == 're2':
+                        options = re2.Options()
+                        options.log_errors = False
+                        compiled.append((alternative, re2.compile(prefix + alternative, options)))
+                    else:
+                        compiled.append((alternative, re.compile(prefix + alternative, regex.flags)))
+            except _COMPILE_ERRORS as e:
+                # e.g. a backreference to a group of another alternative
+                logger.debug(f"Alternatives of {source[:60]!r} not timed separately: {e}")
+                compiled = []
+        with self._lock:
+            self._compiled_alternatives[regex] = compiled
+        return compiled
+
+    # --- Export ---
+
+    def to_record(self) -> Dict:
+        """The run's metrics as JSON-safe data (patterns keyed by pattern_key())."""
+        with self._lock:
+            patterns = {}
+            for regex, stats in self.patterns.items():
+                patterns[pattern_key(regex)] = dict(
+                    stats,
+                    names=sorted(_names.get(regex, ())),
+                    engine=RegexBackend.engine_of(regex),
+                    source=from_re2(regex.pattern)[:MAX_SOURCE_CHARS],
+                    alternatives={from_re2(source)[:MAX_SOURCE_CHARS]: dict(alternative)
+                                  for source, alternative in stats['alternatives'].items()},
+                )
+            return {
+                'run': {'started': self.started.isoformat(timespec='seconds'),
+                        'finished': datetime.now().isoformat(timespec='seconds'),
+                        'pid': os.getpid(), 'texts': self.texts, 'alternatives': self.alternatives},
+                'checks': {name: dict(stats, decisions=dict(stats['decisions'])) for name, stats in self.checks.items()},
+                'patterns': patterns,
+                'prefilter': dict(self.prefilter),
+            }
+
+    def export(self, path: str) -> Dict:
+        """Append the run's record to a JSON Lines metrics file; returns the record."""
+        record = self.to_record()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+        logger.info(f"Filter metrics for {self.texts} assessed texts appended to {path}")
+        return record
+
+
+# Metrics being collected, or None (the engines read this on every search)
+active: Optional[FilterMetrics] = None
+
+
+def enable(alternatives: bool = True) -> FilterMetrics:
+    """Start collecting metrics (a new, empty collection)."""
+    global active
+    active = FilterMetrics(alternatives)
+    return active
+
+
+def disable() -> Optional[FilterMetrics]:
+    """Stop collecting; returns what was collected."""
+    global active
+    metrics, active = active, None
+    return metrics
+
+
+def _sum_into(total: Dict, stats: Dict) -> None:
+    for field, value in stats.items():
+        if isinstance(value, dict):
+            _sum_into(total.setdefault(field, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[field] = total.get(field, 0) + value
+        else:
+            total.setdefault(field, value)
+
+
+def aggregate(records: Iterable[Dict]) -> Dict:
+    """
+    Sum the records of several runs (counts, seconds and characters add up; pattern names,
+    engine and source are kept from the first run that has them).
+    """
+    total = {'runs': 0, 'texts': 0, 'checks': {}, 'patterns': {}, 'prefilter': {}}
+    for record in records:
+        total['runs'] += 1
+        total['texts'] += record['run']['texts']
+        _sum_into(total['checks'], record['checks'])
+        _sum_into(total['patterns'], record['patterns'])
+        _sum_into(total['prefilter'], record['prefilter'])
+    return total
+
+
+def read_records(path: str) -> Iterable[Dict]:
+    """The run records of a metrics file (unreadable lines are skipped)."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                logger.warning(f"Skipping an unreadable line in {path}")
+
+
+if os.getenv(METRICS_ENV):
+    enable(alternatives=os.getenv(ALTERNATIVES_ENV, '1') != '0')
+    atexit.register(lambda path=os.getenv(METRICS_ENV): active is not None and active.export(path))
@@ -1,9 +1,24 @@
+import os
 import re
+import json
+import inspect
 import logging
-from typing import Dict, List, Tuple, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Collection, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from datetime import datetime, date
 from enum import Enum
 
+from filters import filter_metrics
+from filters.scan_engine import Evidence, ScanEngine
+from filters.regex_backend import COMPILED_TYPES, RegexBackend
+from filters.pattern_core import PatternCore, default_pattern_core
+from filters.batch import assess_in_pool
+from filters.platform_matcher import PlatformMatcher
+from filters.result_memo import ResultMemo, fingerprint, text_key
+from filters.rule_pack import RulePack, default_rule_pack
+from filters.linear_patterns import EXTENT_MAX, followed_by
+
 logger = logging.getLogger(__name__)
 
 class Decision(Enum):
@@ -14,16 +29,68 @@ class Decision(Enum):
     PASS = "PASS" # Used for individual checks that don't terminate the process
 
 class CheckResult:
-    """Stores the result of a single checklist item."""
-    def __init__(self, check_name: str, decision: Decision, reason: str, quote: str = ""):
+    """
+    Stores the result of a single checklist item.
+
+    The quote may be given as Evidence (match offsets); it is then only sliced out of
+    the text when first read, so bulk runs that never show a check's quote skip the work.
+    """
+    def __init__(self, check_name: str, decision: Decision, reason: str, quote: Union[str, Evidence] = ""):
         self.check_name = check_name
         self.decision = decision
         self.reason = reason
-        self.quote = quote
+        self._quote = quote
+        # (start, end) of the quoted match in the assessed text, when known
+        self.quote_span = quote.span if isinstance(quote, Evidence) else None
+
+    @property
+    def quote(self) -> str:
+        if isinstance(self._quote, Evidence):
+            self._quote = self._quote.quote()
+        return self._quote
+
+    @quote.setter
+    def quote(self, value: str):
+        self._quote = value
+
+    def to_dict(self) -> Dict:
+        """check_name, decision, reason and quote (built now if still pending)."""
+        return {'check_name': self.check_name, 'decision': self.decision, 'reason': self.reason, 'quote': self.quote}
+
+    def to_record(self) -> Dict:
+        """JSON-safe form for the result memo; a pending quote is kept as its offsets."""
+        record = {'check_name': self.check_name, 'decision': self.decision.value, 'reason': self.reason}
+        if isinstance(self._quote, Evidence):
+            record['quote_span'] = [self._quote.start, self._quote.end, self._quote.context_window]
+        else:
+            record['quote'] = self._quote
+            record['quote_span'] = list(self.quote_span) if self.quote_span else None
+        return record
+
+    @classmethod
+    def from_record(cls, record: Dict, text: str) -> 'CheckResult':
+        """Rebuild a result from to_record() output; text is the (identical) assessed text."""
+        if 'quote' in record:
+            result = cls(record['check_name'], Decision(record['decision']), record['reason'], record['quote'])
+            result.quote_span = tuple(record['quote_span']) if record['quote_span'] else None
+            return result
+        start, end, context_window = record['quote_span']
+        return cls(record['check_name'], Decision(record['decision']), record['reason'],
+                   Evidence(text, start, end, context_window))
+
+    def __getstate__(self):
+        # Pickle the quote, not the whole text it would be cut from
+        state = dict(self.__dict__)
+        state['_quote'] = self.quote
+        return state
 
     def __repr__(self):
         return f"CheckResult(check='{self.check_name}', decision={self.decision.value}, reason='{self.reason}')"
 
+# Below this much title+description text, "no aviation terms" is not evidence of a
+# non-aviation buy - the details are probably only in the attachments.
+PRESCREEN_MIN_METADATA_CHARS = 200
+
 class InitialChecklistFilterV2:
     """
     Exact implementation of SOS Initial Assessment Logic v4.0 following the documented framework.
@@ -37,11 +104,57 @@ class InitialChecklistFilterV2:
     6. When in doubt, default to "NEEDS FURTHER ANALYSIS"
     """
 
-    def __init__(self, platform_guide: Optional[Dict] = None):
-        """Initialize filter with exact patterns from SOS Initial Checklist Logic v4.0"""
+    # Opportunity fields the checks read besides the extracted text (check 0.2 due dates)
+    ASSESSMENT_FIELDS = ('response_date', 'due_date', 'closing_date')
+
+    # Full-text patterns each Phase 1 check reads, in check order. Concurrent evaluation starts
+    # these searches up front; a pattern missing here is just searched when its check runs.
+    PHASE1_SCANS = (
+        ('check_1_sar_required', ('acceptable_amc_amsc_regex', 'sar_regex')),
+        ('check_2_sole_source', ('sole_source_regex',)),
+        ('check_3_tech_data_availability', ('tech_data_regex',)),
+        ('check_4_security_clearance', ('security_regex',)),
+        ('check_5_new_parts_only', ('new_parts_regex', 'refurb_regex', 'prefer_new_regex')),
+        ('check_6_prohibited_certifications', ('as9100_only_regex', 'nadcap_required_regex',
+                                               'acceptable_certs_regex', 'iso_or_as9100_regex')),
+        ('check_7_itar_export_control', ('itar_regex',)),
+        ('check_8_oem_distribution_restrictions', ('oem_regex',)),
+    )
+
+    # Phase 1 patterns whose check is a NO-GO wherever they match, whatever the rest of the text
+    # says, and which look no further than their own match - so a hit in part of an opportunity's
+    # text already settles the assessment (see filters/streaming.py). as9100_only is left out: its
+    # lookahead can be undone by text that follows it.
+    DEFINITIVE_NO_GO_SCANS = (
+        ('check_5_new_parts_only', ('new_parts_regex',)),
+        ('check_6_prohibited_certifications', ('nadcap_required_regex',)),
+        ('check_8_oem_distribution_restrictions', ('oem_regex',)),
+    )
+
+    def __init__(self, platform_guide: Optional[Dict] = None, result_memo: Optional[ResultMemo] = None,
+                 rule_pack: Optional[RulePack] = None, phase1_workers: int = 0,
+                 pattern_core: Optional[PatternCore] = None):
+        """
+        Initialize filter with exact patterns from SOS Initial Checklist Logic v4.0
+
+        Args:
+            platform_guide: Platform Identification Guide override
+            result_memo: Store of check results from earlier runs over the same text
+                (entries made under other rules are pruned)
+            rule_pack: Compiled hard stop rules (default: the shared pack, see filters/rule_pack.py)
+            phase1_workers: Threads searching the Phase 1 patterns concurrently (0: one check
+                after another). The checks still resolve in v4.0 order and stop at the first
+                NO-GO with the same results. Only patterns compiled for RE2 are searched on
+                the threads (`re` holds the GIL while matching; see filters/regex_backend.py),
+                so this needs the optional google-re2 package and is a no-op without it
+            pattern_core: Compiled patterns and per-text match index shared with the other
+                filter engines (default: the process-wide core, see filters/pattern_core.py)
+        """
+        self.pattern_core = pattern_core or default_pattern_core()
+        core = self.pattern_core
         
         # Phase 0.1: Aviation-related terms (COMPREHENSIVE for Question 1)
-        self.aviation_regex = re.compile(
+        self.aviation_regex = core.compile(
             '|'.join([
                 # Aircraft types (primary)
                 r'\b(aircraft|helicopter|rotorcraft|airplane|plane|jet|fighter|bomber|transport)\b',
@@ -65,8 +178,8 @@ class InitialChecklistFilterV2:
                 r'\b(pilot|aircrew|crew\s+chief|maintenance\s+technician|avionics\s+technician)\b',
                 r'\b(de-icing|anti-icing|ice\s+protection|weather\s+radar|terrain\s+avoidance)\b',
                 # Common aviation part types
-                r'\b(actuator|sensor|valve|pump|filter|bearing|seal|gasket|harness|cable|antenna)\b.*\b(aircraft|aviation|flight)\b',
-                r'\b(aircraft|aviation|flight)\b.*\b(actuator|sensor|valve|pump|filter|bearing|seal|gasket|harness|cable|antenna)\b'
+                followed_by(r'\b(actuator|sensor|valve|pump|filter|bearing|seal|gasket|harness|cable|antenna)\b', r'\b(aircraft|aviation|flight)\b'),
+                followed_by(r'\b(aircraft|aviation|flight)\b', r'\b(actuator|sensor|valve|pump|filter|bearing|seal|gasket|harness|cable|antenna)\b')
             ]), re.IGNORECASE
         )
 
@@ -105,191 +218,162 @@ class InitialChecklistFilterV2:
             ]
         }
 
-        # Phase 1: EXACT Hard Stop Patterns from v4.0 documentation
-        
+        # Phase 1: EXACT Hard Stop Patterns from v4.0 documentation, compiled from the rule
+        # pack (rules/hard_stops.json; each rule cites the SOS-RAG.jsonl section it implements)
+        self.rule_pack = rule_pack or default_rule_pack()
+        rules = self.rule_pack
+
         # CHECK 1: Source Approval Required (SAR) - EXACT phrases and AMC/AMSC codes from v4.0 + Bid Matrix
-        self.sar_regex = re.compile(
-            '|'.join([
-                r'source\s+approval\s+required',
-                r'approved\s+source\s+list', 
-                r'qualified\s+suppliers?\s+list',
-                r'\bQPL\b',  # Qualified Products List
-                r'\bQML\b',  # Qualified Manufacturers List
-                r'requires\s+engineering\s+source\s+approval',
-                r'Government\s+source\s+approval\s+required',
-                r'military\s+specification',
-                # AMC/AMSC codes that indicate NO-GO per bid matrix
-                r'\bAMC\s*[345]\b',      # AMC 3,4,5 = NOT until SAR approved / No unless teaming / No
-                r'\bAMSC\s*[CDPR]\b',    # AMSC C,D,P,R = No until SAR / No / No / No unless OEM deal  
-                r'\bAMSC\s*B\b',         # AMSC B = Only if OEM lists SOS
-                r'\bAMSC\s*H\b',         # AMSC H = Unlikely
-                r'\b3B\b',               # 3B = Only via OEM listing
-                r'\b3P\b'                # 3P = No
-            ]), re.IGNORECASE
-        )
-        
-        # AMC/AMSC codes that SOS CAN bid (per bid matrix)
-        self.acceptable_amc_amsc_regex = re.compile(
-            '|'.join([
-                r'\bAMC\s*[12]\b',       # AMC 1,2 = Yes
-                r'\bAMSC\s*[AGZ]\b',     # AMSC A,G,Z = Possibly/Yes/Yes
-                r'\b1[GR]\b',            # 1G,1R = Yes
-                r'\b2G\b'                # 2G = Yes
-            ]), re.IGNORECASE
-        )
-        
+        self.sar_regex = core.compile(rules.regex('sar'))
+        # AMC/AMSC codes that block a bid, and those that SOS CAN bid (per bid matrix)
+        self.sar_codes_regex = core.compile(rules.regex('sar_codes'))
+        self.acceptable_amc_amsc_regex = core.compile(rules.regex('acceptable_amc_amsc'))
+        self.faa_source_approval_regex = core.compile(rules.regex('faa_source_approval'))
+        self.qpl_qml_regex = core.compile(rules.regex('qpl_qml'))
+
         # CHECK 2: Sole Source Detection - Question 2 Methodical Approach
-        # Enhanced patterns to distinguish ACTUAL sole source vs intent language
-        self.sole_source_regex = re.compile(
-            '|'.join([
-                # HARD BLOCKERS - Actual sole source announcements
-                r'sole\s+source\s+to\s+[A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc)',
-                r'single\s+source\s+to\s+[A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc)',
-                r'awarded\s+on\s+a\s+sole\s+source\s+basis\s+to',
-                r'sole\s+source\s+award\s+to',
-                r'sole\s+source\s+procurement\s+from',
-                r'this\s+is\s+a\s+sole\s+source\s+procurement',
-                r'this\s+procurement\s+is\s+sole\s+source',
-                
-                # ANALYSIS NEEDED - Intent language (challengeable)
-                r'intent\s+to\s+sole\s+source',
-                r'intent\s+to\s+award.*sole\s+source',
-                r'intends\s+to\s+sole\s+source',
-                r'plans\s+to\s+sole\s+source',
-                r'considering\s+sole\s+source',
-                
-                # ANALYSIS NEEDED - Brand name or equal opportunities  
-                r'brand\s+name.*equal',
-                r'or\s+equal\s+to',
-                r'brand\s+name\s+or\s+approved\s+equal',
-                
-                # HARD BLOCKERS - Manufacturer-specific requirements (effective sole source)
-                r'in\s+accordance\s+with\s+[A-Za-z\s&,\.]+\s+(?:Company|Corp|Corporation|LLC|Inc).*drawing\s+number',
-                r'manufactured.*tested.*inspected.*in\s+accordance\s+with\s+[A-Za-z\s&,\.]+.*drawing\s+number',
-                r'[A-Za-z\s&,\.]+\s+(?:Company|Corp|Corporation|LLC|Inc).*drawing\s+number',
-                r'[A-Za-z\s&,\.]+\s+(?:Company|Corp|Corporation|LLC|Inc).*Company\s+Name',
-                r'facility\s+identified\s+within\s+this\s+SOW.*(?:Company|Corp|Corporation|LLC|Inc)',
-                
-                # HARD BLOCKERS - Proprietary/OEM only requirements
-                r'proprietary\s+design\s+of',
-                r'OEM\s+proprietary',
-                r'only\s+available\s+from\s+[A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc)',
-                
-                # General sole source terms for catching any sole source language
-                r'sole\s+source',
-                r'only\s+one\s+responsible\s+source',
-                r'single\s+source',
-                r'brand\s+name\s+justification'
-            ]), re.IGNORECASE
-        )
-        
+        # Company names and gaps are bounded (see filters/linear_patterns.py) so matching stays
+        # linear on long PDF text; test_regex_performance.py holds every pattern to a time budget
+        self.sole_source_regex = core.compile(rules.regex('sole_source'))
+        # How far each match would have run with unbounded names and gaps; sizes the quote the
+        # follow-up patterns classify (only ever matched at a match start, see _sole_source_quote)
+        self.sole_source_extent_regex = rules.extent('sole_source')
+        # Check 2 follow-up patterns, applied to the quote around the sole source match
+        # HARD BLOCKERS - Actual sole source awards to other companies (group 1 = company). The
+        # quote is at most EXTENT_MAX long, so these read the whole name run as they always did;
+        # a name bounded short of a later "Source One Spares" would turn its exemption into a NO-GO
+        self.hard_sole_source_patterns = rules.extent_patterns('hard_sole_source')
+        # HARD BLOCKERS - General sole source announcements without company name
+        self.absolute_sole_source_patterns = rules.patterns('absolute_sole_source')
+        # HARD BLOCKERS - Manufacturer-specific requirements (group 1 = company)
+        self.manufacturer_specific_patterns = rules.patterns('manufacturer_specific')
+        # HARD BLOCKERS - Proprietary restrictions (group 1 = company, whole name run as above)
+        self.proprietary_design_regex = rules.extent('proprietary_design')
+        # NORMAL BUSINESS - Intent/award language (NOT blockers - standard government practice)
+        self.normal_business_patterns = rules.patterns('normal_business')
+        # ACTUAL restrictive language that turns intent/award language into a real blocker
+        self.actual_restriction_patterns = rules.patterns('actual_restriction')
+        # ANALYSIS NEEDED - Brand name or equal opportunities (competitive)
+        self.brand_name_patterns = rules.patterns('brand_name')
+        # ALL OTHER sole source language - treat as normal business practice
+        self.general_sole_source_patterns = rules.patterns('general_sole_source')
+
         # CHECK 3: Technical Data Availability - Binary Decision (EXACT from v4.0)
         # BLOCKER: Not available or OEM proprietary
         # GO: Government owns or commonly available
-        self.tech_data_regex = re.compile(
-            '|'.join([
-                # BLOCKERS - Drawings/data not available (flexible patterns)
-                r'drawings?\s+(?:are\s+)?not\s+available',
-                r'technical\s+data\s+(?:is\s+)?not\s+available',
-                r'no\s+technical\s+data\s+available',
-                r'data\s+(?:is\s+)?not\s+available',
-                r'drawings?\s+will\s+not\s+be\s+provided',
-                r'no\s+drawings?\s+provided',
-                
-                # BLOCKERS - OEM proprietary ownership
-                r'OEM\s+owns\s+technical\s+data',
-                r'proprietary\s+to\s+(?:the\s+)?manufacturer',
-                r'manufacturer\s+proprietary\s+data',
-                r'proprietary\s+technical\s+data',
-                r'contractor\s+owns\s+data\s+rights',
-                
-                # BLOCKERS - Government doesn't have rights
-                r'government\s+does\s+not\s+have\s+(?:the\s+)?(?:technical\s+)?(?:data\s+rights?|drawings?)',
-                r'government\s+does\s+not\s+own\s+(?:the\s+)?(?:technical\s+)?data',
-                r'no\s+government\s+furnished\s+information',
-                r'no\s+GFI',
-                r'contractor\s+will\s+not\s+receive\s+technical\s+data',
-                
-                # POSITIVE INDICATORS - Government owns or available
-                r'government\s+owns\s+(?:the\s+)?technical\s+data',
-                r'government\s+has\s+data\s+rights',
-                r'technical\s+data\s+available\s+upon\s+award',
-                r'drawings?\s+available\s+upon\s+award',
-                r'government\s+furnished\s+information',
-                r'GFI\s+provided',
-                r'technical\s+data\s+package\s+available',
-                r'drawings?\s+will\s+be\s+provided',
-                r'commercially\s+available\s+drawings?',
-                r'standard\s+commercial\s+drawings?'
-            ]), re.IGNORECASE
-        )
-        
+        self.tech_data_regex = core.compile(rules.regex('tech_data'))
+
         # CHECK 4: Security Clearance Requirements - EXACT phrases
-        self.security_regex = re.compile(
-            '|'.join([
-                r'security\s+clearance',
-                r'\bsecret\b',
-                r'top\s+secret',
-                r'\bclassified\b',
-                r'facility\s+clearance',
-                r'personnel\s+clearance'
-            ]), re.IGNORECASE
-        )
-        
-        # CHECK 5: New Parts Only Restriction - EXACT phrases  
-        self.new_parts_regex = re.compile(
-            '|'.join([
-                r'factory\s+new\s+only',
-                r'new\s+manufacture\s+only',
-                r'no\s+refurbished',
-                r'no\s+rebuilt', 
-                r'no\s+overhauled',
-                r'no\s+used',
-                r'new\s+condition\s+only'
-            ]), re.IGNORECASE
-        )
-        
+        self.security_regex = core.compile(rules.regex('security'))
+        # Check 4 follow-ups: clearance that must / may (not must) be required
+        self.clearance_required_regex = core.compile(rules.regex('clearance_required'))
+        self.potential_clearance_regex = core.compile(rules.regex('potential_clearance'))
+
+        # CHECK 5: New Parts Only Restriction - EXACT phrases
+        self.new_parts_regex = core.compile(rules.regex('new_parts'))
+
         # CHECK 6: Prohibited Certifications - EXACT phrases
-        self.prohibited_certs_regex = re.compile(
-            '|'.join([
-                r'AS9100',  # SOS does NOT have AS9100
-                r'NADCAP'   # SOS does NOT have NADCAP
-            ]), re.IGNORECASE
-        )
-        
+        self.prohibited_certs_regex = core.compile(rules.regex('prohibited_certs'))
+
         # CHECK 7: ITAR/Export Control - EXACT phrases (REQUIRES ANALYSIS not NO-GO per docs)
-        self.itar_regex = re.compile(
-            '|'.join([
-                r'\bITAR\b',
-                r'export\s+control',
-                r'export\s+license\s+required',
-                r'\bEAR\b',
-                r'international\s+traffic\s+in\s+arms'
-            ]), re.IGNORECASE
-        )
-        
+        self.itar_regex = core.compile(rules.regex('itar'))
+
         # CHECK 8: OEM Distribution Restrictions - EXACT phrases
-        self.oem_regex = re.compile(
-            '|'.join([
-                r'OEM\s+only',
-                r'authorized\s+distributor',
-                r'OEM\s+distributor',
-                r'factory\s+authorized\s+dealer',
-                r'Source-Control\s+drawing.*OEM\s+list\s+governs',
-                r'\bAMSC\s*B\b'  # Item on Source-Control drawing – OEM list governs
-            ]), re.IGNORECASE
-        )
+        self.oem_regex = core.compile(rules.regex('oem'))
+
+        # Platform guide compiled once into a single prioritized pattern for check 0.3
+        self.platform_matcher = PlatformMatcher(self.platform_guide)
+
+        # Shared scan engine: each pattern walks the assessed text at most once and every
+        # check reads its matches from the same per-text index
+        self.scan_engine = ScanEngine(core=core)
+        for name in ('aviation', 'sar', 'acceptable_amc_amsc', 'sole_source', 'tech_data', 'security',
+                     'new_parts', 'prohibited_certs', 'itar', 'oem'):
+            self.scan_engine.register(name, getattr(self, f'{name}_regex'))
+        self.platform_matcher.regex = self.scan_engine.register('platforms', self.platform_matcher.regex)
+        
+        # Follow-up patterns that individual checks run against the full text
+        self.qualification_path_regex = self.scan_engine.register('qualification_path', rules.regex('qualification_path'))
+        self.refurb_regex = self.scan_engine.register('refurb', rules.regex('refurb'))
+        self.prefer_new_regex = self.scan_engine.register('prefer_new', rules.regex('prefer_new'))
+        self.as9100_only_regex = self.scan_engine.register('as9100_only', rules.regex('as9100_only'))
+        self.nadcap_required_regex = self.scan_engine.register('nadcap_required', rules.regex('nadcap_required'))
+        self.acceptable_certs_regex = self.scan_engine.register('acceptable_certs', rules.regex('acceptable_certs'))
+        self.iso_or_as9100_regex = self.scan_engine.register('iso_or_as9100', rules.regex('iso_or_as9100'))
+
+        # Check 3 blockers (technical data not available or OEM proprietary) and positive
+        # indicators (government owns or commonly available)
+        self.tech_data_blocking_phrases = rules.phrases('tech_data_blocking')
+        self.tech_data_positive_phrases = rules.phrases('tech_data_positive')
+
+        self.phase1_workers = phase1_workers
+        self._phase1_pool = None
+        self._phase1_pool_pid = None
+        self._phase1_lock = threading.Lock()
+        if phase1_workers > 0:
+            overlapped = [attribute for _, attributes in self.PHASE1_SCANS for attribute in attributes
+                          if RegexBackend.engine_of(getattr(self, attribute)) == 're2']
+            if not overlapped:
+                logger.warning("phase1_workers=%d has no effect: no Phase 1 pattern is compiled for RE2 "
+                               "(pip install google-re2; see filters/regex_backend.py)", phase1_workers)
+            else:
+                logger.info("Phase 1 threads search %d of %d patterns (the rest run on `re` in their checks)",
+                            len(overlapped), sum(len(attributes) for _, attributes in self.PHASE1_SCANS))
 
+        self.result_memo = result_memo
+        self.rules_fingerprint = self.rule_fingerprint()
+        if result_memo is not None:
+            result_memo.prune(self.rules_fingerprint)
+
+    def rule_fingerprint(self) -> str:
+        """
+        Digest of everything the checks decide with: compiled patterns, phrase tables, the
+        platform guide and this class's source (check logic and reason strings).
+        """
+        parts = [json.dumps(self.platform_guide, sort_keys=True), self.platform_matcher.regex.pattern]
+        for name, value in sorted(vars(self).items()):
+            if name.endswith('_phrases'):
+                parts.append(f"{name}:{value!r}")
+                continue
+            for item in (value if isinstance(value, (list, tuple)) else [value]):
+                if isinstance(item, COMPILED_TYPES):
+                    parts.append(f"{name}:{getattr(item, 'flags', 0)}:{item.pattern}")
+        try:
+            parts.append(inspect.getsource(type(self)))
+        except (OSError, TypeError):
+            logger.warning("Filter source unavailable; check logic changes will not invalidate the result memo")
+        return fingerprint(parts)
+
+    def _phase1_executor(self) -> ThreadPoolExecutor:
+        with self._phase1_lock:
+            # Threads do not survive fork, so each assess_many worker starts its own pool
+            if self._phase1_pool is None or self._phase1_pool_pid != os.getpid():
+                self._phase1_pool = ThreadPoolExecutor(max_workers=self.phase1_workers, thread_name_prefix='phase1-scan')
+                self._phase1_pool_pid = os.getpid()
+            return self._phase1_pool
+
+    def _find_match_evidence(self, regex, text: str, context_window: int = 50) -> Optional[Evidence]:
+        """Offsets of the first match, for checks that only report the quote (built when read)."""
+        return self.scan_engine.index_for(text).evidence(regex, context_window)
 
     def _find_match_with_quote(self, regex, text: str, context_window: int = 50) -> Optional[str]:
-        """Finds a regex match and returns the matched text with surrounding context."""
-        match = regex.search(text)
-        if match:
-            start = max(0, match.start() - context_window)
-            end = min(len(text), match.end() + context_window)
-            context = text[start:end].strip()
-            return context
-        return None
+        """Finds a regex match and returns the matched text with surrounding context (via the shared match index)."""
+        return self.scan_engine.index_for(text).quote(regex, context_window)
+
+    def _sole_source_quote(self, text: str, context_window: int = 50) -> Optional[str]:
+        """
+        Quote around the first sole source match, with the match taken as far as the unbounded
+        pattern would have run it (company name runs, gaps to the end of the line), capped at
+        EXTENT_MAX. Keeps the window the check 2 follow-up patterns classify independent of
+        the bounds that make the search itself linear.
+        """
+        evidence = self._find_match_evidence(self.sole_source_regex, text, context_window)
+        if evidence is None:
+            return None
+        extent = self.sole_source_extent_regex.match(text, evidence.start, min(len(text), evidence.start + EXTENT_MAX))
+        if extent and extent.end() > evidence.end:
+            evidence = Evidence(text, evidence.start, extent.end(), context_window)
+        return evidence.quote()
 
     def extract_text_from_opportunity(self, opp) -> str:
         """Extracts and concatenates all searchable text fields from an opportunity object."""
@@ -310,6 +394,26 @@ class InitialChecklistFilterV2:
             text_fields.append(doc.get('text_extract', ''))
         return ' '.join(filter(None, text_fields))
 
+    def extract_metadata_text(self, opp) -> str:
+        """
+        Text available without downloading any attachment: the listing fields plus
+        PSC/NAICS codes in the form the aviation regex recognizes.
+        """
+        text_fields = [
+            opp.get('title', ''),
+            opp.get('description_text', ''),
+            opp.get('ai_summary', ''),
+            opp.get('source_id', ''),
+            opp.get('set_aside', '')
+        ]
+        psc = opp.get('psc_code')
+        if isinstance(psc, dict) and psc.get('psc_code'):
+            text_fields.append(f"PSC {psc['psc_code']}")
+        naics = opp.get('naics_code')
+        if isinstance(naics, dict) and naics.get('naics_code'):
+            text_fields.append(f"NAICS {naics['naics_code']}")
+        return ' '.join(str(field) for field in text_fields if field)
+
     # PHASE 0 CHECKS (EXACT sequence from v4.0 documentation)
 
     def check_0_1_aviation_related(self, text: str) -> CheckResult:
@@ -319,17 +423,19 @@ class InitialChecklistFilterV2:
         - IF aviation-related terms are found → CONTINUE
         - IF NOT aviation-related terms are found → NO-GO (Not aviation-related)
         """
-        quote = self._find_match_with_quote(self.aviation_regex, text)
+        quote = self._find_match_evidence(self.aviation_regex, text)
         if quote:
             return CheckResult("0.1 Aviation Check", Decision.PASS, "Aviation-related terms found", quote)
         return CheckResult("0.1 Aviation Check", Decision.NO_GO, "Not aviation-related", "No aviation-related terms found in document")
 
-    def check_0_2_opportunity_current(self, opp) -> CheckResult:
+    def check_0_2_opportunity_current(self, opp, as_of: Optional[date] = None) -> CheckResult:
         """
         CHECK 0.2: IS THIS OPPORTUNITY CURRENT? (EXACT from v4.0)
         Decision Logic:
         - IF a future or current date is specified → CONTINUE
         - IF the date is in the past (expired) → NO-GO (Expired)
+
+        as_of is the day the due date is compared with (default: today).
         """
         # Check multiple possible date fields
         response_date = opp.get('response_date') or opp.get('due_date') or opp.get('closing_date')
@@ -352,7 +458,7 @@ class InitialChecklistFilterV2:
             else:
                 due_date = response_date if isinstance(response_date, date) else date.today()
             
-            today = date.today()
+            today = as_of or date.today()
             if due_date < today:
                 return CheckResult("0.2 Currency Check", Decision.NO_GO, f"Expired on {due_date}", f"Response Due: {response_date} (Expired)")
             
@@ -369,51 +475,40 @@ class InitialChecklistFilterV2:
         - IF primary platform is "CONDITIONAL" → REQUIRES ANALYSIS  
         - IF primary platform is "ALWAYS GO" → PASS
         """
-        # Check for P-8 first (common abbreviation without hyphen)
-        p8_pattern = r'\bP-?8\b'
-        if re.search(p8_pattern, text, re.IGNORECASE):
-            quote = self._find_match_with_quote(re.compile(p8_pattern, re.IGNORECASE), text)
-            return CheckResult("0.3 Platform Check", Decision.PASS, "P-8 Poseidon (Boeing 737 derivative) - Commercial/viable platform", quote or "P-8 aircraft identified")
-        
-        # Check for KC-46 (common abbreviation)
-        kc46_pattern = r'\bKC-?46\b'
-        if re.search(kc46_pattern, text, re.IGNORECASE):
-            quote = self._find_match_with_quote(re.compile(kc46_pattern, re.IGNORECASE), text)
-            return CheckResult("0.3 Platform Check", Decision.PASS, "KC-46 Pegasus (Boeing 767 derivative) - Commercial/viable platform", quote or "KC-46 aircraft identified")
-        
-        # Check for C-130 first (special case - less likely but not blocker due to AMSC Z possibility)
-        c130_pattern = r'\bC-130\b'
-        if re.search(c130_pattern, text, re.IGNORECASE):
-            # Check if it's specifically L-100 civilian variant
-            if re.search(r'\bL-100\b', text, re.IGNORECASE):
-                quote = self._find_match_with_quote(re.compile(r'\bL-100\b', re.IGNORECASE), text)
-                return CheckResult("0.3 Platform Check", Decision.PASS, "L-100 civilian variant found", quote or "L-100 civilian variant")
-            else:
-                quote = self._find_match_with_quote(re.compile(c130_pattern, re.IGNORECASE), text)
-                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, "C-130 Hercules - Pure Military Platform (less likely commercial parts but AMSC Z possible)", quote or "C-130 platform identified")
+        index = self.scan_engine.index_for(text)
         
-        # Check for other pure military platforms (less likely but not blockers due to AMSC Z)
-        for platform in self.platform_guide['pure_military_no_go']:
-            if platform == 'C-130 Hercules':  # Skip C-130 since we handled it above
-                continue
-            pattern = r'\b' + re.escape(platform) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                quote = self._find_match_with_quote(re.compile(pattern, re.IGNORECASE), text)
-                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, f"Pure Military Platform: {platform} (less likely commercial parts but AMSC Z possible)", quote or f"Platform identified: {platform}")
-        
-        # Check for conditional platforms (needs analysis)
-        for platform in self.platform_guide['conditional_analysis']:
-            pattern = r'\b' + re.escape(platform) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                quote = self._find_match_with_quote(re.compile(pattern, re.IGNORECASE), text)
-                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, f"Conditional platform found: {platform}", quote or f"Platform identified: {platform}")
-        
-        # Check for always-go platforms (positive indicator)
-        for platform in self.platform_guide['always_go']:
-            pattern = r'\b' + re.escape(platform) + r'\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                quote = self._find_match_with_quote(re.compile(pattern, re.IGNORECASE), text)
-                return CheckResult("0.3 Platform Check", Decision.PASS, f"Commercial/viable platform: {platform}", quote or f"Platform identified: {platform}")
+        # One scan finds every guide platform; the highest-priority one present decides
+        # (P-8, KC-46, C-130, then pure military, conditional and always-go in guide order)
+        hits = self.platform_matcher.first_occurrences(index.all(self.platform_matcher.regex))
+        best = self.platform_matcher.best(hits)
+        
+        if best is not None:
+            category = best.rule.category
+            platform = best.rule.name
+            quote = best.evidence(text)
+            
+            if category == 'p8':
+                return CheckResult("0.3 Platform Check", Decision.PASS, "P-8 Poseidon (Boeing 737 derivative) - Commercial/viable platform", quote)
+            
+            if category == 'kc46':
+                return CheckResult("0.3 Platform Check", Decision.PASS, "KC-46 Pegasus (Boeing 767 derivative) - Commercial/viable platform", quote)
+            
+            if category == 'c130':
+                # Check if it's specifically L-100 civilian variant
+                l100 = self.platform_matcher.find_category(hits, 'l100')
+                if l100 is not None:
+                    return CheckResult("0.3 Platform Check", Decision.PASS, "L-100 civilian variant found", l100.evidence(text))
+                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, "C-130 Hercules - Pure Military Platform (less likely commercial parts but AMSC Z possible)", quote)
+            
+            # Other pure military platforms are less likely but not blockers due to AMSC Z
+            if category == 'pure_military_no_go':
+                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, f"Pure Military Platform: {platform} (less likely commercial parts but AMSC Z possible)", quote)
+            
+            if category == 'conditional_analysis':
+                return CheckResult("0.3 Platform Check", Decision.NEEDS_ANALYSIS, f"Conditional platform found: {platform}", quote)
+            
+            if category == 'always_go':
+                return CheckResult("0.3 Platform Check", Decision.PASS, f"Commercial/viable platform: {platform}", quote)
         
         # No specific platform identified - continue but note
         return CheckResult("0.3 Platform Check", Decision.PASS, "No restricted platforms detected", "No specific aircraft platform identified")
@@ -431,7 +526,7 @@ class InitialChecklistFilterV2:
         - IF NOT found → PASS
         """
         # First check for acceptable AMC/AMSC codes (these are GO signals)
-        acceptable_quote = self._find_match_with_quote(self.acceptable_amc_amsc_regex, text)
+        acceptable_quote = self._find_match_evidence(self.acceptable_amc_amsc_regex, text)
         if acceptable_quote:
             return CheckResult("1 SAR Check", Decision.PASS, "Acceptable AMC/AMSC code found (SOS can bid)", acceptable_quote)
         
@@ -439,18 +534,18 @@ class InitialChecklistFilterV2:
         quote = self._find_match_with_quote(self.sar_regex, text)
         if quote:
             # Check if it's FAA-related (acceptable)
-            if re.search(r'FAA\s+source\s+approval', quote, re.IGNORECASE):
+            if self.faa_source_approval_regex.search(quote):
                 return CheckResult("1 SAR Check", Decision.PASS, "FAA source approval found (SOS can meet)", quote)
             
             # Check if it's QPL/QML with application path (needs analysis)
-            if re.search(r'\b(QPL|QML)\b', quote, re.IGNORECASE):
-                if re.search(r'apply|application|become|register', text, re.IGNORECASE):
+            if self.qpl_qml_regex.search(quote):
+                if self.scan_engine.index_for(text).has(self.qualification_path_regex):
                     return CheckResult("1 SAR Check", Decision.NEEDS_ANALYSIS, "QPL/QML with application path identified", quote)
                 else:
                     return CheckResult("1 SAR Check", Decision.NO_GO, "QPL/QML restriction without clear application path", quote)
             
             # Check for specific problematic AMC/AMSC codes
-            if re.search(r'\b(AMC\s*[345]|AMSC\s*[BCDPHR]|3[BP])\b', quote, re.IGNORECASE):
+            if self.sar_codes_regex.search(quote):
                 return CheckResult("1 SAR Check", Decision.NO_GO, "Problematic AMC/AMSC code found (SAR required or OEM restriction)", quote)
             
             # General military SAR language - NO-GO
@@ -471,22 +566,13 @@ class InitialChecklistFilterV2:
         - IF "brand name or equal" → REQUIRES ANALYSIS (opportunity exists)
         - IF NOT found → PASS
         """
-        quote = self._find_match_with_quote(self.sole_source_regex, text)
+        quote = self._sole_source_quote(text)
         if quote:
             quote_lower = quote.lower()
             
             # HARD BLOCKERS - Actual sole source awards to other companies
-            hard_sole_source_patterns = [
-                r'sole\s+source\s+to\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))',
-                r'single\s+source\s+to\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))',
-                r'awarded\s+on\s+a\s+sole\s+source\s+basis\s+to\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))',
-                r'sole\s+source\s+award\s+to\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))',
-                r'sole\s+source\s+procurement\s+from\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))',
-                r'only\s+available\s+from\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))'
-            ]
-            
-            for pattern in hard_sole_source_patterns:
-                match = re.search(pattern, quote, re.IGNORECASE)
+            for pattern in self.hard_sole_source_patterns:
+                match = pattern.search(quote)
                 if match:
                     company_name = match.group(1).strip()
                     # Allow if sole source to Source One Spares
@@ -495,65 +581,31 @@ class InitialChecklistFilterV2:
                                          f"Sole source to {company_name} (not Source One Spares)", quote)
             
             # HARD BLOCKERS - General sole source announcements without company name
-            absolute_sole_source_patterns = [
-                r'this\s+is\s+a\s+sole\s+source\s+procurement',
-                r'this\s+procurement\s+is\s+sole\s+source',
-                r'procurement\s+will\s+be\s+awarded.*sole\s+source\s+basis'
-            ]
-            
-            for pattern in absolute_sole_source_patterns:
-                if re.search(pattern, quote, re.IGNORECASE):
+            for pattern in self.absolute_sole_source_patterns:
+                if pattern.search(quote):
                     return CheckResult("2 Sole Source Check", Decision.NO_GO, 
                                      "Absolute sole source procurement announcement", quote)
             
             # HARD BLOCKERS - Manufacturer-specific requirements (effective sole source)
-            manufacturer_specific_patterns = [
-                r'in\s+accordance\s+with\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc)).*drawing\s+number',
-                r'manufactured.*tested.*inspected.*in\s+accordance\s+with\s+([A-Za-z\s&,\.]+).*drawing\s+number',
-                r'([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc)).*drawing\s+number',
-                r'facility\s+identified\s+within\s+this\s+SOW.*([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))'
-            ]
-            
-            for pattern in manufacturer_specific_patterns:
-                match = re.search(pattern, quote, re.IGNORECASE)
+            for pattern in self.manufacturer_specific_patterns:
+                match = pattern.search(quote)
                 if match:
                     company_name = match.group(1).strip()
                     return CheckResult("2 Sole Source Check", Decision.NO_GO, 
                                      f"Manufacturer-specific requirement: {company_name} (effective sole source)", quote)
             
             # HARD BLOCKERS - Proprietary restrictions
-            if re.search(r'proprietary\s+design\s+of\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))', quote, re.IGNORECASE):
-                match = re.search(r'proprietary\s+design\s+of\s+([A-Za-z\s&,\.]+(?:Company|Corp|Corporation|LLC|Inc))', quote, re.IGNORECASE)
+            match = self.proprietary_design_regex.search(quote)
+            if match:
                 company_name = match.group(1).strip()
                 return CheckResult("2 Sole Source Check", Decision.NO_GO, 
                                  f"Proprietary design restriction: {company_name}", quote)
             
             # NORMAL BUSINESS - Intent/award language (NOT blockers - standard government practice)
-            normal_business_patterns = [
-                r'intent\s+to\s+sole\s+source',
-                r'intent\s+to\s+award.*sole\s+source',
-                r'intends\s+to\s+sole\s+source',
-                r'plans\s+to\s+sole\s+source',
-                r'considering\s+sole\s+source',
-                r'awarded\s+on\s+a\s+sole\s+source\s+basis',  # Standard government practice
-                r'will\s+be\s+awarded.*sole\s+source\s+basis'
-            ]
-            
-            for pattern in normal_business_patterns:
-                if re.search(pattern, quote, re.IGNORECASE):
+            for pattern in self.normal_business_patterns:
+                if pattern.search(quote):
                     # Check if it has ACTUAL restrictive language that makes it a real blocker
-                    actual_restriction_patterns = [
-                        r'only\s+source',
-                        r'sole\s+known\s+source',
-                        r'only\s+known\s+source',
-                        r'only\s+company.*data',
-                        r'proprietary.*only\s+available',
-                        r'exclusive\s+rights',
-                        r'only\s+authorized',
-                        r'no\s+other\s+source'
-                    ]
-                    
-                    has_actual_restriction = any(re.search(rest_pattern, quote, re.IGNORECASE) for rest_pattern in actual_restriction_patterns)
+                    has_actual_restriction = any(rest_pattern.search(quote) for rest_pattern in self.actual_restriction_patterns)
                     
                     if has_actual_restriction:
                         return CheckResult("2 Sole Source Check", Decision.NO_GO, 
@@ -563,27 +615,14 @@ class InitialChecklistFilterV2:
                                          "Normal government award practice - not a restriction", quote)
             
             # ANALYSIS NEEDED - Brand name or equal opportunities (competitive)
-            brand_name_patterns = [
-                r'brand\s+name.*equal',
-                r'or\s+equal\s+to',
-                r'brand\s+name\s+or\s+approved\s+equal'
-            ]
-            
-            for pattern in brand_name_patterns:
-                if re.search(pattern, quote, re.IGNORECASE):
+            for pattern in self.brand_name_patterns:
+                if pattern.search(quote):
                     return CheckResult("2 Sole Source Check", Decision.PASS, 
                                      "Brand name or equal opportunity (competitive opportunity exists)", quote)
             
             # ALL OTHER sole source language - treat as normal business practice
-            general_sole_source_patterns = [
-                r'sole\s+source',
-                r'only\s+one\s+responsible\s+source',
-                r'single\s+source',
-                r'brand\s+name\s+justification'
-            ]
-            
-            for pattern in general_sole_source_patterns:
-                if re.search(pattern, quote, re.IGNORECASE):
+            for pattern in self.general_sole_source_patterns:
+                if pattern.search(quote):
                     return CheckResult("2 Sole Source Check", Decision.PASS, 
                                      "Standard sole source language - normal government business practice", quote)
         
@@ -607,53 +646,13 @@ class InitialChecklistFilterV2:
             quote_lower = quote.lower()
             
             # BLOCKERS - Technical data not available or OEM proprietary
-            blocking_patterns = [
-                'drawings not available',
-                'drawings are not available',
-                'technical data not available',
-                'technical data is not available',
-                'no technical data available',
-                'data not available',
-                'data is not available',
-                'drawings will not be provided',
-                'no drawings provided',
-                'oem owns technical data',
-                'proprietary to manufacturer',
-                'proprietary to the manufacturer',
-                'manufacturer proprietary data',
-                'proprietary technical data',
-                'contractor owns data rights',
-                'government does not have data rights',
-                'government does not have the technical',
-                'government does not have technical',
-                'government does not have drawings',
-                'government does not own the technical data',
-                'government does not own technical data',
-                'no government furnished information',
-                'no gfi',
-                'contractor will not receive technical data'
-            ]
-            
-            for pattern in blocking_patterns:
+            for pattern in self.tech_data_blocking_phrases:
                 if pattern in quote_lower:
                     return CheckResult("3 Tech Data Check", Decision.NO_GO, 
                                      f"Technical data not available - {pattern.title()}", quote)
             
             # POSITIVE INDICATORS - Government owns or commonly available (pass these)
-            positive_patterns = [
-                'government owns technical data',
-                'government has data rights', 
-                'technical data available upon award',
-                'drawings available upon award',
-                'government furnished information',
-                'gfi provided',
-                'technical data package available',
-                'drawings will be provided',
-                'commercially available drawings',
-                'standard commercial drawings'
-            ]
-            
-            for pattern in positive_patterns:
+            for pattern in self.tech_data_positive_phrases:
                 if pattern in quote_lower:
                     return CheckResult("3 Tech Data Check", Decision.PASS, 
                                      f"Technical data available - {pattern.title()}", quote)
@@ -678,11 +677,11 @@ class InitialChecklistFilterV2:
         quote = self._find_match_with_quote(self.security_regex, text)
         if quote:
             # Check for explicit clearance requirements
-            if re.search(r'clearance\s+required|classified\s+required', quote, re.IGNORECASE):
+            if self.clearance_required_regex.search(quote):
                 return CheckResult("4 Security Check", Decision.NO_GO, "Security clearance required", quote)
             
             # Check for potential clearance needs
-            if re.search(r'may\s+require\s+clearance|potential.*clearance', quote, re.IGNORECASE):
+            if self.potential_clearance_regex.search(quote):
                 return CheckResult("4 Security Check", Decision.NEEDS_ANALYSIS, "May require security clearance", quote)
             
             # Other security language - generally a blocker
@@ -699,19 +698,17 @@ class InitialChecklistFilterV2:
         - IF "Refurbished acceptable" OR "new or refurbished" → PASS (positive indicator)
         - IF NOT found (no restriction on condition) → PASS
         """
-        quote = self._find_match_with_quote(self.new_parts_regex, text)
+        quote = self._find_match_evidence(self.new_parts_regex, text)
         if quote:
             return CheckResult("5 New Parts Check", Decision.NO_GO, "New parts only restriction found", quote)
         
         # Check for positive indicators (refurb acceptable)
-        refurb_pattern = re.compile(r'refurbished\s+acceptable|new\s+or\s+refurbished|serviceable.*acceptable', re.IGNORECASE)
-        refurb_quote = self._find_match_with_quote(refurb_pattern, text)
+        refurb_quote = self._find_match_evidence(self.refurb_regex, text)
         if refurb_quote:
             return CheckResult("5 New Parts Check", Decision.PASS, "Refurbished parts acceptable", refurb_quote)
         
         # Check for preference language (needs analysis)
-        prefer_pattern = re.compile(r'prefer\s+new|new\s+for\s+critical', re.IGNORECASE)
-        prefer_quote = self._find_match_with_quote(prefer_pattern, text)
+        prefer_quote = self._find_match_evidence(self.prefer_new_regex, text)
         if prefer_quote:
             return CheckResult("5 New Parts Check", Decision.NEEDS_ANALYSIS, "Preference for new parts noted", prefer_quote)
         
@@ -731,26 +728,22 @@ class InitialChecklistFilterV2:
         """
         
         # Check for explicit AS9100 ONLY requirements (hard blocker)
-        as9100_only_pattern = re.compile(r'AS9100\s+(?:only|required|must|shall)(?!\s*(?:/|or)\s*(?:ISO|9001))', re.IGNORECASE)
-        as9100_only_quote = self._find_match_with_quote(as9100_only_pattern, text)
+        as9100_only_quote = self._find_match_evidence(self.as9100_only_regex, text)
         if as9100_only_quote:
             return CheckResult("6 Certifications Check", Decision.NO_GO, "AS9100 manufacturing certification required (SOS lacks this)", as9100_only_quote)
         
         # Check for explicit NADCAP requirements (hard blocker)
-        nadcap_pattern = re.compile(r'NADCAP\s+(?:required|must|shall)', re.IGNORECASE)
-        nadcap_quote = self._find_match_with_quote(nadcap_pattern, text)
+        nadcap_quote = self._find_match_evidence(self.nadcap_required_regex, text)
         if nadcap_quote:
             return CheckResult("6 Certifications Check", Decision.NO_GO, "NADCAP certification required (SOS lacks this)", nadcap_quote)
         
         # Check for acceptable certifications that SOS has (positive indicators)
-        acceptable_certs = re.compile(r'ISO\s*9001|AS9120|FAA\s+certification|FAA\s+certified', re.IGNORECASE)
-        cert_quote = self._find_match_with_quote(acceptable_certs, text)
+        cert_quote = self._find_match_evidence(self.acceptable_certs_regex, text)
         if cert_quote:
             return CheckResult("6 Certifications Check", Decision.PASS, "Acceptable certifications required (SOS has these)", cert_quote)
         
         # Check for ISO 9001/AS9100 alternatives (where either is acceptable - SOS has ISO 9001)
-        iso_or_as9100_pattern = re.compile(r'ISO\s*9001\s*[/|]\s*(?:SAE\s+)?AS9100|(?:SAE\s+)?AS9100\s*[/|]\s*ISO\s*9001', re.IGNORECASE)
-        iso_or_quote = self._find_match_with_quote(iso_or_as9100_pattern, text)
+        iso_or_quote = self._find_match_evidence(self.iso_or_as9100_regex, text)
         if iso_or_quote:
             return CheckResult("6 Certifications Check", Decision.PASS, "ISO 9001 or AS9100 required (SOS has ISO 9001:2015)", iso_or_quote)
         
@@ -764,7 +757,7 @@ class InitialChecklistFilterV2:
         - IF NOT found → PASS
         (Note: SOS can handle ITAR compliance with planning, not immediate NO-GO)
         """
-        quote = self._find_match_with_quote(self.itar_regex, text)
+        quote = self._find_match_evidence(self.itar_regex, text)
         if quote:
             return CheckResult("7 ITAR Check", Decision.NEEDS_ANALYSIS, "ITAR/export control requirements found", quote)
         
@@ -777,13 +770,54 @@ class InitialChecklistFilterV2:
         - IF "OEM only", "authorized distributor required", "OEM distributor only", "factory authorized dealer", OR AMSC B → NO-GO
         - IF NOT found → PASS
         """
-        quote = self._find_match_with_quote(self.oem_regex, text)
+        quote = self._find_match_evidence(self.oem_regex, text)
         if quote:
             return CheckResult("8 OEM Restriction Check", Decision.NO_GO, "OEM distribution restriction found", quote)
         
         return CheckResult("8 OEM Restriction Check", Decision.PASS, "No OEM distribution restrictions found", "No OEM distribution restrictions found in document")
 
-    def assess_opportunity(self, opp) -> Tuple[Decision, List[CheckResult]]:
+    def prescreen_opportunity(self, opp) -> Tuple[Decision, List[CheckResult]]:
+        """
+        Metadata-only pre-screen, run before any document is downloaded.
+        
+        Runs the Phase 0 gates in order on listing metadata alone:
+        - 0.1 Aviation: NO-GO only when the title/description are substantial and still
+          contain no aviation terms (thin listings are never rejected on this)
+        - 0.2 Currency: needs only the due date, so an expired record is rejected outright
+        - 0.3 Platform: same stop rule as the full assessment
+        
+        Returns:
+            (Decision.NO_GO, results) if the opportunity can be rejected without documents,
+            otherwise (Decision.PASS, results) - fetch documents and run assess_opportunity
+        """
+        text = self.extract_metadata_text(opp)
+        results = []
+        
+        result_0_1 = self.check_0_1_aviation_related(text)
+        results.append(result_0_1)
+        if result_0_1.decision == Decision.NO_GO:
+            listing_chars = sum(len(str(opp.get(field) or '')) for field in ('title', 'description_text'))
+            if listing_chars >= PRESCREEN_MIN_METADATA_CHARS:
+                result_0_1.reason += " (metadata pre-screen)"
+                return Decision.NO_GO, results
+            result_0_1.decision = Decision.NEEDS_ANALYSIS
+            result_0_1.reason = "Too little metadata to rule out aviation - documents required"
+        
+        result_0_2 = self.check_0_2_opportunity_current(opp)
+        results.append(result_0_2)
+        if result_0_2.decision == Decision.NO_GO:
+            return Decision.NO_GO, results
+        
+        result_0_3 = self.check_0_3_platform_viability(text)
+        results.append(result_0_3)
+        if result_0_3.decision == Decision.NO_GO:
+            result_0_3.reason += " (metadata pre-screen)"
+            return Decision.NO_GO, results
+        
+        return Decision.PASS, results
+
+    def assess_opportunity(self, opp, text: Optional[str] = None,
+                           as_of: Optional[date] = None) -> Tuple[Decision, List[CheckResult]]:
         """
         EXACT implementation of SOS Initial Assessment Logic v4.0 with proper sequence and stop logic.
         
@@ -792,29 +826,72 @@ class InitialChecklistFilterV2:
         2. Stop at first NO-GO  
         3. Hard stops OVERRIDE all positive indicators
         4. When in doubt, default to "NEEDS FURTHER ANALYSIS"
+
+        Args:
+            opp: Opportunity dict
+            text: Text already extracted from the opportunity (default: extract it here)
+            as_of: Day check 0.2 treats as today (default: today), e.g. to re-assess an
+                archived record as of when it was first assessed
         """
-        text = self.extract_text_from_opportunity(opp)
+        if text is None:
+            text = self.extract_text_from_opportunity(opp)
+        if self.result_memo is None:
+            return self._assess(opp, text, lambda check: check(text), as_of=as_of)
+
+        # Text checks are replayed from the memo when this text was assessed under the same
+        # rules; check 0.2 depends on today's date and always runs
+        key = text_key(text)
+        records = self.result_memo.get(self.rules_fingerprint, key)
+        results = {name: CheckResult.from_record(record, text) for name, record in records.items()}
+        ran = []
+
+        def run(check: Callable[[str], CheckResult]) -> CheckResult:
+            name = check.__name__
+            if name not in results:
+                results[name] = check(text)
+                ran.append(name)
+            return results[name]
+
+        outcome = self._assess(opp, text, run, resolved=set(results), as_of=as_of)
+        if ran:
+            self.result_memo.put(self.rules_fingerprint, key,
+                                 {name: result.to_record() for name, result in results.items()})
+        return outcome
+
+    def _assess(self, opp, text: str, run: Callable[[Callable[[str], CheckResult]], CheckResult],
+                resolved: Collection[str] = (), as_of: Optional[date] = None) -> Tuple[Decision, List[CheckResult]]:
+        """
+        assess_opportunity() sequence; run(check) returns check(text), possibly memoized.
+        resolved names the checks run() already has results for (nothing to search).
+        """
+        metrics = filter_metrics.active
+        if metrics is not None:
+            run = metrics.checked(run, len(text))
         all_results = []
 
         # PHASE 0: PRELIMINARY GATES (must pass all to continue)
         logging.info("Starting Phase 0 checks...")
         
         # CHECK 0.1: Aviation-related?
-        result_0_1 = self.check_0_1_aviation_related(text)
+        result_0_1 = run(self.check_0_1_aviation_related)
         all_results.append(result_0_1)
         if result_0_1.decision == Decision.NO_GO:
             logging.info("Phase 0.1 FAILED: Not aviation-related")
             return Decision.NO_GO, all_results
 
         # CHECK 0.2: Current opportunity?
-        result_0_2 = self.check_0_2_opportunity_current(opp)
+        if metrics is None:
+            result_0_2 = self.check_0_2_opportunity_current(opp, as_of)
+        else:
+            result_0_2 = metrics.timed('check_0_2_opportunity_current',
+                                       lambda: self.check_0_2_opportunity_current(opp, as_of))
         all_results.append(result_0_2)
         if result_0_2.decision == Decision.NO_GO:
             logging.info("Phase 0.2 FAILED: Opportunity expired")
             return Decision.NO_GO, all_results
 
         # CHECK 0.3: Platform viability?
-        result_0_3 = self.check_0_3_platform_viability(text)
+        result_0_3 = run(self.check_0_3_platform_viability)
         all_results.append(result_0_3)
         if result_0_3.decision == Decision.NO_GO:
             logging.info("Phase 0.3 FAILED: Pure military platform")
@@ -835,18 +912,32 @@ class InitialChecklistFilterV2:
         ]
 
         needs_analysis = False
-        
-        for check_func in phase1_checks:
-            result = check_func(text)
-            all_results.append(result)
+        index = self.scan_engine.index_for(text) if self.phase1_workers else None
+        if index is not None:
+            # Search the Phase 1 patterns ahead on the worker threads, earliest check first;
+            # the checks below still run in order and each waits only for its own patterns.
+            # Patterns on `re` hold the GIL while matching, so they are left to their checks.
+            patterns = [getattr(self, attribute) for check_name, attributes in self.PHASE1_SCANS
+                        if check_name not in resolved for attribute in attributes]
+            index.prefetch([regex for regex in patterns if RegexBackend.engine_of(regex) == 're2'],
+                           self._phase1_executor(), ahead=self.phase1_workers)
+
+        try:
+            for check_func in phase1_checks:
+                result = run(check_func)
+                all_results.append(result)
             
-            if result.decision == Decision.NO_GO:
-                logging.info(f"Phase 1 FAILED: {result.check_name} - {result.reason}")
-                return Decision.NO_GO, all_results
+                if result.decision == Decision.NO_GO:
+                    logging.info(f"Phase 1 FAILED: {result.check_name} - {result.reason}")
+                    return Decision.NO_GO, all_results
             
-            if result.decision == Decision.NEEDS_ANALYSIS:
-                needs_analysis = True
-                logging.info(f"Phase 1 ANALYSIS NEEDED: {result.check_name} - {result.reason}")
+                if result.decision == Decision.NEEDS_ANALYSIS:
+                    needs_analysis = True
+                    logging.info(f"Phase 1 ANALYSIS NEEDED: {result.check_name} - {result.reason}")
+        finally:
+            # Searches for checks after a NO-GO are not needed
+            if index is not None:
+                index.cancel_pending()
 
         # FINAL DECISION MATRIX (EXACT from v4.0)
         if needs_analysis:
@@ -855,3 +946,28 @@ class InitialChecklistFilterV2:
         else:
             logging.info("FINAL DECISION: GO - All checks passed")
             return Decision.GO, all_results
+
+    def worker_args(self) -> Dict:
+        """Constructor arguments that rebuild this filter in a spawned pool worker (see filters.batch)."""
+        return {
+            'platform_guide': self.platform_guide,
+            'result_memo': self.result_memo,
+            'rule_pack': self.rule_pack,
+            'phase1_workers': self.phase1_workers,
+            'pattern_core': self.pattern_core,
+        }
+
+    def assess_many(self, opps: Iterable[Dict], workers: Optional[int] = None) -> Iterator[Tuple[str, Decision, List[CheckResult]]]:
+        """
+        Assess many opportunities on a process pool (see filters.batch).
+
+        Args:
+            opps: Opportunities, e.g. a streamed saved search
+            workers: Worker processes (default: CPU count; 1 runs in this process)
+
+        Returns:
+            Iterator of (opportunity id, final decision, check results), in input order
+        """
+        for opp_id, (decision, results) in assess_in_pool(
+                self, opps, self.extract_text_from_opportunity, self.ASSESSMENT_FIELDS, workers):
+            yield opp_id, decision, results
@@ -0,0 +1,75 @@
+"""
+Backtracking-safe building blocks for the filter patterns.
+Patterns such as `A.*B` or `[A-Za-z ]+Inc.*drawing number` rescan the rest of the line
+from every occurrence of their first part, so a long PDF line full of near-misses takes
+quadratic (or worse) time. The helpers here express the same rules with gaps that never
+rescan the same text, and with explicit limits on how far a company name may run.
+"""
+
+# Characters a company name is made of ("Lockheed Martin Corp", "Bell Textron, Inc.")
+COMPANY_NAME_CHARS = r'[A-Za-z\s&,\.]'
+COMPANY_SUFFIX = r'(?:Company|Corp|Corporation|LLC|Inc)'
+
+# Longest company name read after an anchor such as "sole source to"
+COMPANY_NAME_MAX = 100
+# Longest run of name characters read when the name has no anchor in front of it
+NAME_RUN_MAX = 1000
+# Furthest a follow-up phrase (e.g. "drawing number") is looked for after a company name
+GAP_MAX = 1000
+
+# Company name after an anchor: up to COMPANY_NAME_MAX name characters
+COMPANY_NAME = f'{COMPANY_NAME_CHARS}{{1,{COMPANY_NAME_MAX}}}'
+
+# Unanchored name: only tried where a run of name characters starts. A match starting inside
+# a run can always be extended back to the run's start, so this finds the same leftmost
+# matches as the unanchored pattern without retrying the run from every character in it.
+NAME_RUN = f'(?<!{COMPANY_NAME_CHARS}){COMPANY_NAME_CHARS}{{1,{NAME_RUN_MAX}}}'
+
+# Bounded gap to a follow-up phrase on the same line
+GAP = f'.{{0,{GAP_MAX}}}'
+
+# The unbounded forms the fragments above replace. Only for extent patterns (see
+# RulePack.extent), which are matched at a known match start on at most EXTENT_MAX characters
+# to find where the unbounded pattern would have ended - never searched over a text
+UNBOUNDED_NAME = f'{COMPANY_NAME_CHARS}+'
+UNBOUNDED_GAP = '.*'
+EXTENT_MAX = NAME_RUN_MAX + GAP_MAX
+
+
+def followed_by(*parts: str) -> str:
+    """
+    Linear-time replacement for '.*'.join(parts).
+
+    Each gap stops at the next occurrence of the part before it; if the line continues
+    the rule from that later occurrence, the match is found from there instead. The
+    pattern therefore matches on the same lines as the '.*' version, but every character
+    is scanned once per gap rather than once per earlier occurrence of the first part.
+    Only the match boundaries can differ, when a part repeats on the line.
+
+    Args:
+        parts: Regex fragments that must appear in this order on one line
+
+    Returns:
+        Regex string
+    """
+    pattern = parts[0]
+    for previous, part in zip(parts, parts[1:]):
+        pattern += f'(?:(?!{previous}).)*{part}'
+    return pattern
+
+
+def name_before(phrase: str) -> str:
+    """
+    Company name that is followed by a phrase within GAP_MAX characters on the same line.
+
+    The lookahead confirms the phrase is in reach before any name is tried, and the name
+    stops at the phrase, so a failed attempt costs one bounded scan instead of one scan
+    per possible name length.
+
+    Args:
+        phrase: Regex of the follow-up phrase, e.g. the one for "drawing number"
+
+    Returns:
+        Regex string (uncaptured; wrap it in a group to capture the name)
+    """
+    return f'(?={GAP}{phrase})(?:(?!{phrase}){COMPANY_NAME_CHARS}){{1,{COMPANY_NAME_MAX}}}'
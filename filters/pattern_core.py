@@ -0,0 +1,280 @@
+"""
+Compiled pattern core shared by the filter engines.
+InitialChecklistFilterV2, SOSFilter and InitialChecklistFilterV2Enhanced compile overlapping
+aviation, SAR, sole-source and tech-data patterns. Through the core each distinct pattern
+(source and flags) is compiled once per process, and every engine reads its matches from one
+per-text MatchIndex, so running several engines over the same text searches a shared pattern
+once. With RE2, the index also starts with a single RE2::Set pass over the text that tells
+which of the core's patterns match anywhere at all; a pattern that does not is answered
+without a search of its own, which is most hard stop patterns on most texts. Patterns that
+stay on `re` (lookarounds) take part through a relaxed form with the lookarounds removed:
+dropping an assertion only lets a pattern match more, so a miss still proves a miss.
+"""
+
+import re
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from filters.regex_backend import (
+    DEFAULT_BACKEND, CompiledPattern, PatternLike, RegexBackend, UnsupportedPattern, compiled_key, pattern_key,
+    re2, to_re2
+)
+from filters.scan_engine import MatchIndex
+
+logger = logging.getLogger(__name__)
+
+# DFA memory for the prefilter set; past it RE2 gives up on the pass (detected, see SetPrefilter)
+PREFILTER_MAX_MEM = 64 * 1024 * 1024
+
+
+_LOOKAROUNDS = ('(?=', '(?!', '(?<=', '(?<!')
+_COUNTED_REPEAT = re.compile(r'\{(\d*),(\d+)\}')
+# Counted repeats with a larger upper bound are relaxed to unbounded ones
+LONG_REPEAT = 10
+# What is left of a pattern that was all lookaround: it would "match" nearly every text
+_ONLY_ANCHORS = re.compile(r'(?:\\[bBAZ]|[\^$])*')
+
+
+def without_lookarounds(pattern: str) -> str:
+    """
+    The pattern with every lookahead and lookbehind group removed, and long counted
+    repeats ({0,200} gaps) left unbounded.
+
+    Lookarounds only restrict where a pattern matches and an upper bound only limits it, so
+    the result matches wherever the original does (and possibly elsewhere). Unbounded, a gap
+    costs RE2's DFA one state instead of one per repetition.
+    """
+    out = []
+    position = 0
+    in_class = False
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            out.append(pattern[position:position + 2])
+            position += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            # a ']' right after '[' or '[^' is a literal
+            opening = 3 if pattern.startswith('^]', position + 1) else 2 if pattern.startswith(']', position + 1) else 1
+            out.append(pattern[position:position + opening])
+            position += opening
+            continue
+        elif any(pattern.startswith(opening, position) for opening in _LOOKAROUNDS):
+            position = _group_end(pattern, position)
+            continue
+        elif char == '{':
+            repeat = _COUNTED_REPEAT.match(pattern, position)
+            if repeat and int(repeat.group(2)) > LONG_REPEAT:
+                out.append(f"{{{repeat.group(1)},}}" if repeat.group(1) not in ('', '0') else '*')
+                position = repeat.end()
+                continue
+        out.append(char)
+        position += 1
+    return ''.join(out)
+
+
+def _group_end(pattern: str, start: int) -> int:
+    """Index just past the group opened at pattern[start]."""
+    depth = 0
+    position = start
+    in_class = False
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\':
+            position += 2
+            continue
+        if in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+            position += 3 if pattern.startswith('^]', position + 1) else 2 if pattern.startswith(']', position + 1) else 1
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    raise re.error("unbalanced parenthesis", pattern, start)
+
+
+def prefilter_source(compiled: CompiledPattern) -> Optional[str]:
+    """
+    RE2 source that matches wherever the compiled pattern does, or None if there is none.
+
+    RE2 patterns are used as they are; `re` patterns lose their lookarounds first.
+    """
+    if RegexBackend.engine_of(compiled) == 're2':
+        return compiled.pattern
+    if re2 is None:
+        return None
+    relaxed = without_lookarounds(compiled.pattern)
+    if _ONLY_ANCHORS.fullmatch(relaxed):
+        return None
+    try:
+        source = to_re2(relaxed, compiled.flags)
+        options = re2.Options()
+        options.log_errors = False
+        re2.compile(source, options)
+    except (UnsupportedPattern, re.error, re2.error):
+        return None
+    return source
+
+
+class SetPrefilter:
+    """
+    One RE2::Set over a fixed group of compiled patterns (see prefilter_source()).
+
+    matching() runs the set over a text once and returns the patterns that may match: every
+    pattern that matches is in it, and for RE2 patterns the reverse holds too. An
+    always-matching canary pattern is part of the set: RE2 reports no matches at all when
+    its DFA runs out of memory, so a result without the canary means "unknown", not "none".
+    """
+
+    def __init__(self, patterns: Iterable[CompiledPattern]):
+        options = re2.Options()
+        options.log_errors = False
+        options.max_mem = PREFILTER_MAX_MEM
+        self._set = re2.Set.SearchSet(options)
+        self._canary = self._set.Add('(?:)')
+        self._patterns: Dict[int, CompiledPattern] = {}
+        for pattern in patterns:
+            source = prefilter_source(pattern)
+            if source is not None:
+                self._patterns[self._set.Add(source)] = pattern
+        self._set.Compile()
+        self.covered = frozenset(self._patterns.values())
+
+    def covers(self, regex: CompiledPattern) -> bool:
+        return regex in self.covered
+
+    def matching(self, text: str) -> Optional[Set[CompiledPattern]]:
+        """Patterns that may match the text, or None if the pass failed."""
+        indices = self._set.Match(text) or ()
+        if self._canary not in indices:
+            logger.warning(f"Prefilter pass failed on a {len(text):,} character text - searching every pattern")
+            return None
+        return {self._patterns[index] for index in indices if index != self._canary}
+
+
+class PatternCore:
+    """
+    Process-wide registry of compiled patterns plus the MatchIndex of the text being assessed.
+
+    compile() returns one canonical compiled object per (source, flags), and also accepts an
+    already compiled pattern, returning the registered object with the same source. The index
+    is memoized on the identity of the last text seen by the calling thread, like
+    ScanEngine.index_for(), but shared by every engine built on the core.
+    """
+
+    def __init__(self, backend: Optional[RegexBackend] = None, prefilter: bool = True):
+        """
+        Args:
+            backend: Regex backend patterns are compiled with (default: the shared backend)
+            prefilter: Answer non-matching patterns from one RE2::Set pass per text (needs google-re2)
+        """
+        self.backend = backend or DEFAULT_BACKEND
+        self.prefilter = prefilter and re2 is not None
+        self._by_source: Dict[Tuple[str, int], CompiledPattern] = {}
+        self._by_compiled: Dict[Tuple[str, str, int], CompiledPattern] = {}
+        self._failed: Dict[Tuple[str, int], re.error] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._prefilter: Optional[SetPrefilter] = None
+        self._prefilter_stale = False
+        self.compiled = 0
+        self.reused = 0
+
+    def __reduce__(self):
+        # Pickled as its settings: the receiving process compiles and indexes for itself, and
+        # the shared default core stands for that process's own default core
+        if self is _default_core:
+            return default_pattern_core, ()
+        return PatternCore, (self.backend, self.prefilter)
+
+    def compile(self, pattern: PatternLike, flags: int = 0) -> CompiledPattern:
+        """
+        The shared compiled form of a pattern.
+
+        Args:
+            pattern: Regex source, or a pattern compiled elsewhere (flags are then ignored)
+            flags: re flags for a source pattern
+
+        Raises:
+            re.error: if the pattern does not compile (remembered, so it is not parsed again)
+        """
+        with self._lock:
+            if isinstance(pattern, str):
+                compiled = self._by_source.get((pattern, flags))
+                if compiled is not None:
+                    self.reused += 1
+                    return compiled
+                if (pattern, flags) in self._failed:
+                    raise self._failed[(pattern, flags)]
+                try:
+                    compiled = self.backend.compile(pattern, flags)
+                except re.error as e:
+                    self._failed[(pattern, flags)] = e
+                    raise
+            else:
+                compiled = pattern
+            key = compiled_key(compiled)
+            canonical = self._by_compiled.get(key)
+            if canonical is None:
+                canonical = self._by_compiled[key] = compiled
+                self.compiled += 1
+                self._prefilter_stale = True
+            else:
+                self.reused += 1
+            if isinstance(pattern, str):
+                self._by_source[(pattern, flags)] = canonical
+            return canonical
+
+    def _current_prefilter(self) -> Optional[SetPrefilter]:
+        if not self.prefilter:
+            return None
+        with self._lock:
+            if self._prefilter_stale:
+                try:
+                    self._prefilter = SetPrefilter(self._by_compiled.values())
+                except re2.error as e:
+                    logger.warning(f"Could not build the pattern prefilter ({e}) - searching every pattern")
+                    self._prefilter = None
+                self._prefilter_stale = False
+            return self._prefilter
+
+    def index_for(self, text: str) -> MatchIndex:
+        """MatchIndex for this text, shared by all engines while the same text object is assessed."""
+        index = getattr(self._local, 'index', None)
+        if index is None or index.text is not text:
+            index = MatchIndex(text, prefilter=self._current_prefilter())
+            self._local.index = index
+        return index
+
+    def release(self) -> None:
+        """Drop the calling thread's index (and its reference to the text)."""
+        self._local.index = None
+
+    def stats(self) -> Dict[str, int]:
+        """Distinct compiled patterns, compile() calls answered from the registry, and prefilter coverage."""
+        prefilter = self._current_prefilter()
+        return {'patterns': self.compiled, 'reused': self.reused,
+                'prefiltered': len(prefilter.covered) if prefilter else 0}
+
+
+_default_core = None
+_default_lock = threading.Lock()
+
+
+def default_pattern_core() -> PatternCore:
+    """The core the filter engines share unless given their own."""
+    global _default_core
+    with _default_lock:
+        if _default_core is None:
+            _default_core = PatternCore()
+        return _default_core
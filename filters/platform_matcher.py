@@ -0,0 +1,133 @@
+"""
+Precompiled platform matcher for check 0.3 (platform viability).
+The whole platform guide is compiled once into a single prioritized pattern; one scan
+of the text finds the first occurrence of every platform, and the highest-priority
+platform present decides the check, exactly as the old ordered loop of searches did.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from filters.scan_engine import Evidence
+
+# Guide categories in the order check 0.3 consults them
+CATEGORY_ORDER = ('pure_military_no_go', 'conditional_analysis', 'always_go')
+
+# Designators such as KC-46, UH-60, C-130, E-4B inside a platform name
+_DESIGNATOR = re.compile(r'^([A-Za-z]{1,3})-(\d+[A-Za-z]?)$')
+
+
+def designator_pattern(token: str) -> str:
+    """
+    Regex for a designator token that also accepts common spellings.
+
+    KC-46 matches KC-46, KC46 and KC 46. Single-letter prefixes (C-20, E-3) accept
+    the hyphen or nothing but not a bare space, which would match prose such as
+    "Attachment C 20".
+    """
+    match = _DESIGNATOR.match(token)
+    if not match:
+        return re.escape(token)
+    prefix, number = match.groups()
+    separator = r'[-\s]?' if len(prefix) > 1 else r'-?'
+    return re.escape(prefix) + separator + re.escape(number)
+
+
+def platform_pattern(name: str) -> str:
+    """Word-bounded regex for a platform name; words may be separated by any whitespace (PDF line breaks)."""
+    return r'\b' + r'\s+'.join(designator_pattern(token) for token in name.split()) + r'\b'
+
+
+@dataclass
+class PlatformRule:
+    """One entry of the compiled guide."""
+    key: str          # regex group name
+    name: str         # platform name as written in the guide
+    category: str     # 'p8' / 'kc46' / 'c130' specials, a guide category, or 'l100'
+    priority: int     # lower wins
+
+
+@dataclass
+class PlatformHit:
+    """First occurrence of a platform in the text."""
+    rule: PlatformRule
+    start: int
+    end: int
+
+    def evidence(self, text: str, context_window: int = 50) -> Evidence:
+        return Evidence(text, self.start, self.end, context_window)
+
+    def quote(self, text: str, context_window: int = 50) -> str:
+        return self.evidence(text, context_window).quote()
+
+
+class PlatformMatcher:
+    """
+    Single-pattern matcher over the platform guide.
+
+    Every platform is an alternative inside one zero-width lookahead, ordered by
+    priority. Scanning a text with finditer visits each position once; at each position
+    the highest-priority platform starting there is recorded. Overlapping names
+    therefore cannot hide a higher-priority platform.
+    """
+
+    def __init__(self, platform_guide: Dict[str, List[str]]):
+        rules: List[Tuple[str, str, str]] = [
+            # Specials checked ahead of the guide (common abbreviations and the C-130 rule)
+            ('P-8', 'p8', r'\bP-?8\b'),
+            ('KC-46', 'kc46', r'\bKC[-\s]?46\b'),
+            ('C-130', 'c130', r'\bC-?130\b'),
+        ]
+        for category in CATEGORY_ORDER:
+            for name in platform_guide.get(category, []):
+                if category == 'pure_military_no_go' and name == 'C-130 Hercules':
+                    continue  # covered by the C-130 special
+                rules.append((name, category, platform_pattern(name)))
+        # Not a platform decision on its own - consulted when C-130 wins
+        rules.append(('L-100', 'l100', r'\bL-?100\b'))
+
+        self.rules: List[PlatformRule] = []
+        # Alternatives bucketed by first letter: names starting with different letters can
+        # never match at the same position, so priority only matters inside a bucket
+        buckets: Dict[str, List[str]] = {}
+        for priority, (name, category, pattern) in enumerate(rules):
+            rule = PlatformRule(key=f"p{priority}", name=name, category=category, priority=priority)
+            self.rules.append(rule)
+            body = pattern[len(r'\b'):]  # the shared leading \b is hoisted out of the alternation
+            buckets.setdefault(name[0].lower(), []).append(f"(?P<{rule.key}>{body})")
+        self._by_key = {rule.key: rule for rule in self.rules}
+
+        branches = [
+            f"(?=[{re.escape(letter)}{re.escape(letter.upper())}])(?:{'|'.join(alternatives)})"
+            for letter, alternatives in buckets.items()
+        ]
+        # \b outside the lookahead rejects most positions before any alternative is tried
+        self.regex = re.compile(r'\b(?=' + '|'.join(branches) + ')', re.IGNORECASE)
+
+    def first_occurrences(self, matches) -> Dict[str, PlatformHit]:
+        """Reduce the scan's matches to the first occurrence of each platform, keyed by rule key."""
+        hits: Dict[str, PlatformHit] = {}
+        for match in matches:
+            key = match.lastgroup
+            rule = self._by_key[key]
+            if rule.key not in hits:
+                hits[rule.key] = PlatformHit(rule, match.start(key), match.end(key))
+        return hits
+
+    def scan(self, text: str) -> Dict[str, PlatformHit]:
+        """First occurrence of every platform found in the text."""
+        return self.first_occurrences(self.regex.finditer(text))
+
+    @staticmethod
+    def best(hits: Dict[str, PlatformHit]) -> Optional[PlatformHit]:
+        """The highest-priority platform present (L-100 never decides on its own)."""
+        candidates = [hit for hit in hits.values() if hit.rule.category != 'l100']
+        return min(candidates, key=lambda hit: hit.rule.priority) if candidates else None
+
+    @staticmethod
+    def find_category(hits: Dict[str, PlatformHit], category: str) -> Optional[PlatformHit]:
+        for hit in hits.values():
+            if hit.rule.category == category:
+                return hit
+        return None
@@ -0,0 +1,202 @@
+"""
+Regex backend for the filter engines.
+The filter classes compile their patterns through compile_pattern(). When google-re2 is
+installed (pip install google-re2), each pattern is compiled for RE2, whose matching time
+is linear in the text length whatever the pattern or the input. Patterns RE2 cannot express
+(lookarounds, backreferences, repeats over 1000) fall back to the stdlib `re` one at a
+time, and the reason is recorded. Without google-re2, or with SOS_REGEX_BACKEND=re,
+everything compiles with `re` exactly as before. RE2 does not make every scan faster: the
+google-re2 binding adds a few microseconds of Python per match, so text dense with matches
+is slower to scan than with `re`; what it removes is the backtracking worst case.
+
+Patterns keep Python's meaning on RE2: \\s, \\d and \\w are rewritten to the Unicode classes
+`re` uses (RE2's own are ASCII-only, which would miss the non-breaking spaces common in PDF
+text) and flags become inline modifiers. Two differences remain: RE2's \\b only counts ASCII
+letters, digits and underscore as word characters, and case-insensitive RE2 does not match
+the Turkish dotted/dotless i against i/I.
+"""
+
+import os
+import re
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from filters.result_memo import fingerprint
+
+try:
+    import re2
+except ImportError:  # optional accelerator
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+RE2_AVAILABLE = re2 is not None
+# 'auto' (RE2 when installed), 're' or 're2'
+BACKEND_ENV = 'SOS_REGEX_BACKEND'
+
+# Compiled pattern types any backend can return
+COMPILED_TYPES = (re.Pattern,) + ((type(re2.compile('')),) if RE2_AVAILABLE else ())
+CompiledPattern = Union[COMPILED_TYPES]
+PatternLike = Union[str, CompiledPattern]
+
+# RE2 class bodies matching Python's Unicode \s (str.isspace), \d (category Nd) and \w (str.isalnum + '_')
+_UNICODE_CLASS_BODIES = {
+    's': r'\t-\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}',
+    'd': r'\p{Nd}',
+    'w': r'\p{L}\p{N}_',
+}
+_SUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL | re.UNICODE
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'))
+
+
+class UnsupportedPattern(ValueError):
+    """The pattern has no RE2 equivalent with the same meaning."""
+
+
+def to_re2(pattern: str, flags: int = 0) -> str:
+    """
+    Rewrite a Python regex so RE2 matches it the same way.
+
+    Args:
+        pattern: Python regex source
+        flags: re flags the pattern is compiled with
+
+    Returns:
+        RE2 regex source
+
+    Raises:
+        UnsupportedPattern: if a flag or construct cannot be carried over (RE2 itself
+            rejects the rest, e.g. lookarounds and backreferences)
+    """
+    if flags & ~_SUPPORTED_FLAGS:
+        raise UnsupportedPattern(f"unsupported flags {re.RegexFlag(flags & ~_SUPPORTED_FLAGS)!r}")
+
+    out = []
+    in_class = False
+    position = 0
+    while position < len(pattern):
+        char = pattern[position]
+        if char == '\\' and position + 1 < len(pattern):
+            escape = pattern[position + 1]
+            position += 2
+            body = _UNICODE_CLASS_BODIES.get(escape.lower())
+            if body is None:
+                out.append('\\' + escape)
+            elif escape.islower():
+                out.append(body if in_class else f'[{body}]')
+            elif in_class:
+                raise UnsupportedPattern(f"\\{escape} inside a character class")
+            else:
+                out.append(f'[^{body}]')
+            continue
+
+        if char == '[' and not in_class:
+            in_class = True
+            out.append(char)
+            position += 1
+            if pattern.startswith('^', position):
+                out.append('^')
+                position += 1
+            if pattern.startswith(']', position):  # a leading ']' is a literal in Python
+                out.append('\\]')
+                position += 1
+            continue
+        if char == ']' and in_class:
+            in_class = False
+        elif char == '$' and not in_class and not flags & re.MULTILINE:
+            # Python's $ also matches before a trailing newline; RE2's only at the very end
+            raise UnsupportedPattern("'$' without MULTILINE")
+        out.append(char)
+        position += 1
+
+    modifiers = ''.join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+    return (f'(?{modifiers})' if modifiers else '') + ''.join(out)
+
+
+def from_re2(source: str) -> str:
+    """A to_re2() source made readable again: the Unicode classes it wrote become \\s, \\d and \\w."""
+    for escape, body in _UNICODE_CLASS_BODIES.items():
+        source = source.replace(f'[^{body}]', '\\' + escape.upper()).replace(f'[{body}]', '\\' + escape)
+        source = source.replace(body, '\\' + escape)
+    return source
+
+
+class RegexBackend:
+    """
+    Compiles patterns for RE2 where possible and for `re` otherwise.
+
+    fallbacks maps every (pattern, flags) that had to stay on `re` to the reason, so it
+    is easy to see which rules still carry backtracking risk.
+    """
+
+    def __init__(self, engine: Optional[str] = None):
+        """
+        Choose the engine.
+
+        Args:
+            engine: 'auto' (RE2 when google-re2 is installed), 're' or 're2'
+                (default: the SOS_REGEX_BACKEND environment variable, else 'auto')
+        """
+        engine = (engine or os.getenv(BACKEND_ENV) or 'auto').lower()
+        if engine not in ('auto', 're', 're2'):
+            raise ValueError(f"Unknown regex backend '{engine}' (expected auto, re or re2)")
+        if engine == 're2' and not RE2_AVAILABLE:
+            raise ImportError("google-re2 is not installed")
+        self.engine = 're2' if engine == 're2' or (engine == 'auto' and RE2_AVAILABLE) else 're'
+        self.fallbacks: Dict[Tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return RegexBackend, (self.engine,)
+
+    def compile(self, pattern: PatternLike, flags: int = 0) -> CompiledPattern:
+        """
+        Compile a pattern (already compiled patterns are returned unchanged).
+
+        Every pattern is validated by `re` first, so invalid patterns raise re.error on
+        either backend.
+        """
+        if not isinstance(pattern, str):
+            return pattern
+        compiled = re.compile(pattern, flags)
+        if self.engine == 're':
+            return compiled
+
+        try:
+            options = re2.Options()
+            options.log_errors = False
+            return re2.compile(to_re2(pattern, flags), options)
+        except (UnsupportedPattern, re2.error) as e:
+            reason = e.args[0].decode(errors='replace') if e.args and isinstance(e.args[0], bytes) else str(e)
+            with self._lock:
+                self.fallbacks[(pattern, flags)] = reason
+            logger.debug(f"Pattern kept on re ({reason}): {pattern[:80]}")
+            return compiled
+
+    @staticmethod
+    def engine_of(compiled: CompiledPattern) -> str:
+        """'re' or 're2' - which engine a compiled pattern runs on."""
+        return 're' if isinstance(compiled, re.Pattern) else 're2'
+
+
+def compiled_key(compiled: CompiledPattern) -> Tuple[str, str, int]:
+    """(engine, source, flags): compiled patterns with the same key match identically."""
+    engine = RegexBackend.engine_of(compiled)
+    # RE2 sources carry their flags as inline modifiers (see to_re2)
+    return engine, compiled.pattern, compiled.flags if engine == 're' else 0
+
+
+def pattern_key(compiled: CompiledPattern) -> str:
+    """compiled_key() as a short digest, stable across processes (for stored match indexes)."""
+    engine, source, flags = compiled_key(compiled)
+    return fingerprint([engine, str(flags), source])[:24]
+
+
+# Backend shared by the filters
+DEFAULT_BACKEND = RegexBackend()
+
+
+def compile_pattern(pattern: PatternLike, flags: int = 0) -> CompiledPattern:
+    """Compile a filter pattern with the shared backend."""
+    return DEFAULT_BACKEND.compile(pattern, flags)
@@ -0,0 +1,136 @@
+"""
+Persistent memo of check results for re-runs over unchanged opportunity text.
+Re-running a saved search mostly re-assesses the same full_analysis_text. Entries live in
+SQLite, keyed by the SHA-256 of the text and the filter's rule fingerprint (a digest of its
+compiled patterns, phrase tables, platform guide and check code), so a hit can be replayed
+without scanning, and any rule change makes the old entries unreachable (and prunable).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text: str) -> str:
+    """
+    Memo key of an assessed text.
+
+    The text is hashed exactly as assessed: quotes are cut from it and patterns such as
+    '.{0,10}' count its whitespace, so even whitespace-only differences can change results.
+    """
+    return hashlib.sha256(text.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+
+def fingerprint(parts: Iterable[str]) -> str:
+    """Digest of a rule set, given as strings in a stable order."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8', errors='surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class ResultMemo:
+    """
+    SQLite-backed store of serialized check results per (rule fingerprint, text key).
+
+    Each entry maps check names to the records of the checks that have run on that text;
+    an assessment that stops early stores only the checks it ran, and a later assessment
+    needing more adds to the entry. Hit/miss counters are kept per instance; see stats().
+    """
+
+    def __init__(self, path: str = "cache/check_results.sqlite"):
+        """
+        Open (or create) the memo database.
+
+        Args:
+            path: SQLite file holding memoized results
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._connection()
+
+    def __reduce__(self):
+        # Reopened by path in the receiving process (a connection cannot be pickled)
+        return ResultMemo, (self.path,)
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across fork (assess_many workers open their own)
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS check_results ("
+                "fingerprint TEXT NOT NULL, text_key TEXT NOT NULL, results TEXT NOT NULL, stored_at REAL NOT NULL, "
+                "PRIMARY KEY (fingerprint, text_key))"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, rules: str, key: str) -> Dict[str, Dict]:
+        """Stored check records for a text under a rule fingerprint ({} on a miss)."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT results FROM check_results WHERE fingerprint = ? AND text_key = ?", (rules, key)
+            ).fetchone()
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return json.loads(row[0]) if row else {}
+
+    def put(self, rules: str, key: str, records: Dict[str, Dict]) -> None:
+        """Store (replace) the check records for a text."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO check_results (fingerprint, text_key, results, stored_at) VALUES (?, ?, ?, ?)",
+                (rules, key, json.dumps(records), time.time())
+            )
+            conn.commit()
+
+    def prune(self, keep: str) -> int:
+        """Delete entries stored under any other rule fingerprint; returns how many."""
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM check_results WHERE fingerprint != ?", (keep,)).rowcount
+            conn.commit()
+        if deleted:
+            logger.info(f"Dropped {deleted} memoized assessments made under older rules")
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM check_results")
+            conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
@@ -0,0 +1,406 @@
+"""
+Declarative hard-stop rule packs.
+The Phase 1 patterns of the checklist live in a JSON rule pack (rules/hard_stops.json) instead
+of inline regex lists: each rule names the SOS-RAG.jsonl section it implements, and the
+AMC/AMSC codes come from one bid matrix table. A pack is validated and compiled once when it
+is loaded; filters built from it only look compiled patterns up by name.
+
+RulePackReloader keeps a filter built from the pack and, when the pack file changes, builds a
+complete new filter beside it and swaps a single reference. Assessments already running keep
+the filter they started with, a pack that fails to load or compile leaves the current one in
+place, and caches held outside the filter (response cache, RAG cache, result memo) stay
+warm across the swap.
+
+Pack format:
+    {
+      "name": "...", "version": "...",
+      "flags": ["IGNORECASE"],                       # default flags of every rule
+      "bid_matrix": {"AMC 3": {"can_bid": "...", "signal": "sar"}, ...},
+      "rules": {
+        "<name>": {"check": "<check it serves>", "section": "<SOS-RAG section>",
+                   "match": "any" | "each", "flags": [...],      # flags optional
+                   "patterns": ["regex", {"followed_by": ["regex", ...]}, ...]}
+      },
+      "phrases": {"<name>": {"section": "...", "phrases": ["...", ...]}}
+    }
+
+"any" rules compile their patterns into one alternation, "each" rules into a list (for the
+follow-up patterns a check tries in order). Patterns may use the placeholders {{COMPANY_NAME}},
+{{COMPANY_NAME_CHARS}}, {{COMPANY_SUFFIX}}, {{NAME_RUN}}, {{GAP}} and {{NAME_BEFORE:<regex>}}
+from filters/linear_patterns.py, and {{CODES:<signal>}} for the bid matrix codes with that signal.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from filters.regex_backend import CompiledPattern, compile_pattern
+from filters.linear_patterns import (
+    COMPANY_NAME, COMPANY_NAME_CHARS, COMPANY_SUFFIX, GAP, NAME_RUN, UNBOUNDED_GAP, UNBOUNDED_NAME,
+    followed_by, name_before
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULE_PACK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'rules', 'hard_stops.json')
+# Overrides the pack file the filters load by default
+RULE_PACK_ENV = 'SOS_RULE_PACK'
+# Seconds between pack file checks of a started RulePackReloader
+RELOAD_POLL_SECONDS = 5.0
+
+FRAGMENTS = {
+    'COMPANY_NAME': COMPANY_NAME,
+    'COMPANY_NAME_CHARS': COMPANY_NAME_CHARS,
+    'COMPANY_SUFFIX': COMPANY_SUFFIX,
+    'NAME_RUN': NAME_RUN,
+    'GAP': GAP,
+}
+UNBOUNDED_FRAGMENTS = dict(FRAGMENTS, COMPANY_NAME=UNBOUNDED_NAME, NAME_RUN=UNBOUNDED_NAME, GAP=UNBOUNDED_GAP)
+_PLACEHOLDER = re.compile(r'\{\{([A-Z_]+)(?::(.*?))?\}\}')
+_MATCH_KINDS = ('any', 'each')
+
+
+class RulePackError(ValueError):
+    """The rule pack is malformed or one of its patterns does not compile."""
+
+
+def rule_pack_path() -> str:
+    """Pack file the filters load by default (SOS_RULE_PACK, else rules/hard_stops.json)."""
+    return os.getenv(RULE_PACK_ENV) or DEFAULT_RULE_PACK
+
+
+def code_pattern(codes: List[str]) -> str:
+    """
+    Regex matching any of the given AMC/AMSC codes ("AMC 3", "AMSC B", "3B"), with the
+    codes that differ only in their last character grouped as in \\bAMC\\s*[345]\\b.
+    """
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for code in codes:
+        stem = code[:-1]
+        separator = r'\s*' if stem.endswith(' ') else ''
+        groups.setdefault((stem.strip(), separator), []).append(re.escape(code[-1]))
+    alternatives = []
+    for (stem, separator), endings in groups.items():
+        ending = endings[0] if len(endings) == 1 else f"[{''.join(endings)}]"
+        alternatives.append(rf'\b{re.escape(stem)}{separator}{ending}\b')
+    return '|'.join(alternatives)
+
+
+class RulePack:
+    """
+    A loaded, compiled rule pack. Immutable once built; look rules up with regex(),
+    patterns() and phrases().
+    """
+
+    def __init__(self, data: Dict, path: str = '<dict>', previous: Optional['RulePack'] = None):
+        """
+        Validate and compile a parsed pack.
+
+        Args:
+            data: Parsed pack JSON
+            path: Where the pack was read from (for messages)
+            previous: Pack this one replaces; patterns whose source and flags are unchanged
+                reuse its compiled objects
+
+        Raises:
+            RulePackError: if the pack is malformed or a pattern does not compile
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('rules'), dict):
+            raise RulePackError(f"{path}: a rule pack is an object with a 'rules' object")
+
+        self.path = path
+        self._data = data
+        self.name = data.get('name', os.path.basename(path))
+        self.version = str(data.get('version', ''))
+        self.digest = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+        self.bid_matrix: Dict[str, Dict] = data.get('bid_matrix', {})
+        self.sections: Dict[str, str] = {}
+        self._flags = self._parse_flags(data.get('flags', []), 'flags')
+        self._compiled: Dict[Tuple[str, int], CompiledPattern] = {}
+        self._reuse = previous._compiled if previous is not None else {}
+
+        self._rules: Dict[str, Union[CompiledPattern, List[CompiledPattern]]] = {}
+        self._sources: Dict[str, Dict] = {}
+        self._extents: Dict[str, Union[CompiledPattern, List[CompiledPattern]]] = {}
+        for name, rule in data['rules'].items():
+            self._rules[name] = self._compile_rule(name, rule)
+            unbounded = [self._pattern_source(pattern, name, unbounded=True) for pattern in rule['patterns']]
+            flags = self._sources[name]['flags']
+            if isinstance(self._rules[name], list):
+                self._extents[name] = [self._compile(source, flags, name) for source in unbounded]
+            else:
+                self._extents[name] = self._compile('|'.join(unbounded), flags, name)
+
+        self._phrases: Dict[str, List[str]] = {}
+        for name, table in data.get('phrases', {}).items():
+            phrases = table.get('phrases') if isinstance(table, dict) else None
+            if not isinstance(phrases, list) or not all(isinstance(phrase, str) for phrase in phrases):
+                raise RulePackError(f"{path}: phrase table '{name}' needs a 'phrases' list of strings")
+            self._phrases[name] = list(phrases)
+            self.sections[name] = table.get('section', '')
+        self._reuse = {}
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, previous: Optional['RulePack'] = None) -> 'RulePack':
+        """
+        Read and compile a pack file.
+
+        Args:
+            path: Pack file (default: rule_pack_path())
+            previous: Pack being replaced, whose compiled patterns may be reused
+
+        Raises:
+            RulePackError: if the file cannot be read or the pack is invalid
+        """
+        path = path or rule_pack_path()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise RulePackError(f"Could not read rule pack {path}: {e}") from e
+        return cls(data, path, previous)
+
+    def _parse_flags(self, names, where: str) -> int:
+        flags = 0
+        for flag_name in names:
+            flag = getattr(re, str(flag_name), None)
+            if not isinstance(flag, re.RegexFlag):
+                raise RulePackError(f"{self.path}: unknown regex flag '{flag_name}' in {where}")
+            flags |= flag
+        return flags
+
+    def _expand(self, source: str, rule_name: str, unbounded: bool = False) -> str:
+        fragments = UNBOUNDED_FRAGMENTS if unbounded else FRAGMENTS
+
+        def replace(match):
+            placeholder, argument = match.group(1), match.group(2)
+            if placeholder == 'NAME_BEFORE' and argument:
+                phrase = self._expand(argument, rule_name, unbounded)
+                return f'(?={UNBOUNDED_GAP}{phrase}){UNBOUNDED_NAME}' if unbounded else name_before(phrase)
+            if placeholder == 'CODES' and argument:
+                codes = [code for code, entry in self.bid_matrix.items() if entry.get('signal') == argument]
+                if not codes:
+                    raise RulePackError(f"{self.path}: rule '{rule_name}': no bid matrix codes with signal '{argument}'")
+                return code_pattern(codes)
+            if placeholder in fragments and argument is None:
+                return fragments[placeholder]
+            raise RulePackError(f"{self.path}: rule '{rule_name}': unknown placeholder {match.group(0)}")
+        return _PLACEHOLDER.sub(replace, source)
+
+    def _pattern_source(self, pattern, rule_name: str, unbounded: bool = False) -> str:
+        if isinstance(pattern, str):
+            return self._expand(pattern, rule_name, unbounded)
+        if isinstance(pattern, dict) and isinstance(pattern.get('followed_by'), list) and len(pattern['followed_by']) >= 2:
+            parts = [self._expand(part, rule_name, unbounded) for part in pattern['followed_by']]
+            if unbounded:
+                # Ends where '.*'.join(parts) would (the last occurrence of the final part on the
+                # line) without the nested backtracking of the greedy chain
+                return f'{followed_by(*parts)}(?:{UNBOUNDED_GAP}{parts[-1]})?'
+            return followed_by(*parts)
+        raise RulePackError(f"{self.path}: rule '{rule_name}': a pattern is a regex string or "
+                            f"{{\"followed_by\": [at least two regexes]}}, got {pattern!r}")
+
+    def _compile(self, source: str, flags: int, rule_name: str) -> CompiledPattern:
+        key = (source, flags)
+        compiled = self._compiled.get(key) or self._reuse.get(key)
+        if compiled is None:
+            try:
+                compiled = compile_pattern(source, flags)
+            except re.error as e:
+                raise RulePackError(f"{self.path}: rule '{rule_name}' does not compile: {e}") from e
+        self._compiled[key] = compiled
+        return compiled
+
+    def _compile_rule(self, name: str, rule) -> Union[CompiledPattern, List[CompiledPattern]]:
+        if not isinstance(rule, dict) or not isinstance(rule.get('patterns'), list) or not rule['patterns']:
+            raise RulePackError(f"{self.path}: rule '{name}' needs a non-empty 'patterns' list")
+        match = rule.get('match', 'any')
+        if match not in _MATCH_KINDS:
+            raise RulePackError(f"{self.path}: rule '{name}': match must be one of {_MATCH_KINDS}, got '{match}'")
+        flags = self._parse_flags(rule['flags'], f"rule '{name}'") if 'flags' in rule else self._flags
+        self.sections[name] = rule.get('section', '')
+
+        sources = [self._pattern_source(pattern, name) for pattern in rule['patterns']]
+        self._sources[name] = {'flags': int(flags), 'patterns': sources}
+        if match == 'any':
+            return self._compile('|'.join(sources), flags, name)
+        return [self._compile(source, flags, name) for source in sources]
+
+    def regex(self, name: str) -> CompiledPattern:
+        """The compiled alternation of an 'any' rule."""
+        rule = self._rules.get(name)
+        if rule is None or isinstance(rule, list):
+            raise RulePackError(f"{self.path}: no 'any' rule named '{name}'")
+        return rule
+
+    def extent(self, name: str) -> CompiledPattern:
+        """
+        The alternation of an 'any' rule with its company names and gaps unbounded (as the
+        rule read before linear_patterns bounded them). A name followed by a gap backtracks
+        like the original, so this is only for match() at the start of a regex() match, on at
+        most EXTENT_MAX characters: its end is where the unbounded rule's match would have ended.
+        """
+        extent = self._extents.get(name)
+        if extent is None or isinstance(extent, list):
+            raise RulePackError(f"{self.path}: no 'any' rule named '{name}'")
+        return extent
+
+    def extent_patterns(self, name: str) -> List[CompiledPattern]:
+        """
+        The patterns of an 'each' rule with company names and gaps unbounded, in pack order.
+        Same caveat as extent(): only for text already cut to at most EXTENT_MAX characters,
+        such as a check's quote.
+        """
+        extent = self._extents.get(name)
+        if not isinstance(extent, list):
+            raise RulePackError(f"{self.path}: no 'each' rule named '{name}'")
+        return list(extent)
+
+    def patterns(self, name: str) -> List[CompiledPattern]:
+        """The compiled patterns of an 'each' rule, in pack order."""
+        rule = self._rules.get(name)
+        if not isinstance(rule, list):
+            raise RulePackError(f"{self.path}: no 'each' rule named '{name}'")
+        return list(rule)
+
+    def phrases(self, name: str) -> List[str]:
+        """A phrase table of the pack."""
+        if name not in self._phrases:
+            raise RulePackError(f"{self.path}: no phrase table named '{name}'")
+        return list(self._phrases[name])
+
+    def sources(self) -> Dict[str, Dict]:
+        """
+        Expanded regex sources of every rule (one per pack pattern, placeholders filled in)
+        and the phrase tables, as JSON-safe data: {"rules": {name: {"flags", "patterns"}},
+        "phrases": {name: [...]}}. Two packs decide alike where these are equal.
+        """
+        return {'rules': {name: {'flags': entry['flags'], 'patterns': list(entry['patterns'])}
+                          for name, entry in self._sources.items()},
+                'phrases': {name: list(phrases) for name, phrases in self._phrases.items()}}
+
+    def __reduce__(self):
+        # Pickled as its parsed JSON (compiled patterns do not cross processes); the shared
+        # default pack stands for the receiving process's own default pack
+        if self is _default_pack:
+            return default_rule_pack, ()
+        return RulePack, (self._data, self.path)
+
+    def __repr__(self):
+        return f"RulePack(name='{self.name}', version='{self.version}', rules={len(self._rules)}, path='{self.path}')"
+
+
+_default_pack: Optional[RulePack] = None
+_default_lock = threading.Lock()
+
+
+def default_rule_pack() -> RulePack:
+    """The pack at rule_pack_path(), loaded on first use and shared by the filters."""
+    global _default_pack
+    with _default_lock:
+        if _default_pack is None:
+            _default_pack = RulePack.load()
+        return _default_pack
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RulePackReloader:
+    """
+    Holds an object (typically a filter) built from a rule pack file and rebuilds it when
+    the file changes.
+
+    current() always returns a fully built object: a reload builds the new one first and
+    then replaces a single reference, so a caller holding the previous object keeps using
+    it consistently. A pack that fails to load, compile or build is logged and the current
+    object stays.
+    """
+
+    def __init__(self, build: Callable[[RulePack], Any], path: Optional[str] = None):
+        """
+        Load the pack and build the first object.
+
+        Args:
+            build: Builds the object from a compiled pack, e.g.
+                lambda pack: InitialChecklistFilterV2(rule_pack=pack, result_memo=memo)
+            path: Pack file (default: rule_pack_path())
+
+        Raises:
+            RulePackError: if the initial pack is invalid (there is nothing to fall back to)
+        """
+        self.path = path or rule_pack_path()
+        self.reloads = 0
+        self.failures = 0
+        self._build = build
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stamp = _file_stamp(self.path)
+        pack = RulePack.load(self.path)
+        self._state: Tuple[RulePack, Any] = (pack, build(pack))
+
+    @property
+    def pack(self) -> RulePack:
+        return self._state[0]
+
+    def current(self) -> Any:
+        """The object built from the latest valid pack."""
+        return self._state[1]
+
+    def reload_if_changed(self) -> bool:
+        """
+        Rebuild if the pack file changed since the last check.
+
+        Returns:
+            True if a new object was swapped in
+        """
+        stamp = _file_stamp(self.path)
+        if stamp == self._stamp:
+            return False
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            pack, _ = self._state
+            try:
+                new_pack = RulePack.load(self.path, previous=pack)
+                if new_pack.digest == pack.digest:
+                    return False
+                built = self._build(new_pack)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Rule pack reload failed, keeping {pack.name} {pack.version}: {e}")
+                return False
+            self._state = (new_pack, built)
+            self.reloads += 1
+        logger.info(f"Reloaded rule pack {new_pack.name} {new_pack.version} from {self.path}")
+        return True
+
+    def start(self, interval: float = RELOAD_POLL_SECONDS) -> None:
+        """Check the pack file every `interval` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def poll():
+            while not self._stop.wait(interval):
+                self.reload_if_changed()
+
+        self._thread = threading.Thread(target=poll, name='rule-pack-reloader', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,278 @@
+"""
+Rule what-if simulator over the archive of assessed opportunities.
+MatchArchive keeps, for every opportunity the pipeline assesses, the text it was assessed on
+and the per-pattern match index of that text (the first match of every full-text pattern,
+and all matches where a check listed them). RuleSimulator re-derives the decisions of the
+archived records under the current rule pack and under a modified one: patterns whose source
+is unchanged are answered from the stored index (each recorded match is re-taken at its
+offset instead of searched for), so only new or edited patterns search the stored text. No
+document is downloaded or extracted again.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from filters.initial_checklist_v2 import CheckResult, Decision, InitialChecklistFilterV2
+from filters.pattern_core import PatternCore, pattern_key
+from filters.result_memo import text_key
+from filters.rule_pack import RulePack, default_rule_pack
+from filters.streaming import EARLY_EXIT_NOTE
+
+logger = logging.getLogger(__name__)
+
+
+def deciding_result(results: List[CheckResult]) -> Optional[CheckResult]:
+    """The check result that made the decision: the NO-GO, else the last needing analysis (None for GO)."""
+    for result in reversed(results):
+        if result.decision in (Decision.NO_GO, Decision.NEEDS_ANALYSIS):
+            return result
+    return None
+
+
+def deciding_check(results: List[CheckResult]) -> str:
+    result = deciding_result(results)
+    return result.check_name if result else ''
+
+
+class MatchArchive:
+    """
+    SQLite store of assessed opportunities: the assessment fields, decision and day of each
+    record, and per distinct text the text itself (compressed) and its match index.
+
+    A record whose decision came from a streamed early exit (filters/streaming.py) is marked
+    partial: its text stops where the hard stop was found.
+    """
+
+    def __init__(self, path: str = "cache/match_archive.sqlite"):
+        """
+        Open (or create) the archive database.
+
+        Args:
+            path: SQLite file holding archived assessments
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across fork
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS assessments ("
+                "opp_id TEXT PRIMARY KEY, text_key TEXT NOT NULL, fields TEXT NOT NULL, assessed_on TEXT NOT NULL, "
+                "decision TEXT NOT NULL, decided_by TEXT NOT NULL, partial INTEGER NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts ("
+                "text_key TEXT PRIMARY KEY, text BLOB NOT NULL, matches TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def record(self, opp_id: str, opp: Dict, text: str, decision: Decision, results: List[CheckResult],
+               filter_logic: InitialChecklistFilterV2, assessed_on: Optional[date] = None) -> None:
+        """
+        Archive an assessment (replacing any earlier one of the same opportunity).
+
+        The filter's match index of the text is completed first - the first match of every
+        full-text pattern, including those of checks after a NO-GO - so that a simulation
+        under changed rules rarely has to search the text.
+
+        Args:
+            opp_id: Opportunity ID
+            opp: Opportunity (only its ASSESSMENT_FIELDS are kept)
+            text: Text the opportunity was assessed on
+            decision: Final decision
+            results: Check results of the assessment
+            filter_logic: Filter that assessed it
+            assessed_on: Day of the assessment (default: today)
+        """
+        index = filter_logic.scan_engine.index_for(text)
+        for regex in filter_logic.scan_engine.patterns.values():
+            index.first(regex)
+        matches = {pattern_key(regex): [first, every] for regex, (first, every) in index.snapshot().items()}
+        fields = {field: opp.get(field) for field in filter_logic.ASSESSMENT_FIELDS if opp.get(field) is not None}
+        partial = any(result.reason.endswith(EARLY_EXIT_NOTE) for result in results)
+        key = text_key(text)
+
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT matches FROM texts WHERE text_key = ?", (key,)).fetchone()
+            if row:
+                # Same text archived before (possibly under other rules): keep what both know
+                matches = {**json.loads(row[0]), **matches}
+                conn.execute("UPDATE texts SET matches = ? WHERE text_key = ?", (json.dumps(matches), key))
+            else:
+                conn.execute("INSERT INTO texts (text_key, text, matches) VALUES (?, ?, ?)",
+                             (key, zlib.compress(text.encode('utf-8', errors='surrogatepass')), json.dumps(matches)))
+            conn.execute(
+                "INSERT OR REPLACE INTO assessments (opp_id, text_key, fields, assessed_on, decision, decided_by, "
+                "partial, stored_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (opp_id, key, json.dumps(fields, default=str), (assessed_on or date.today()).isoformat(),
+                 decision.value, deciding_check(results), int(partial), time.time())
+            )
+            conn.commit()
+
+    def records(self, limit: Optional[int] = None, opp_ids: Optional[Iterable[str]] = None) -> Iterator[Dict]:
+        """
+        Archived assessments in ID order, each with its text and match index.
+
+        Args:
+            limit: Only the first this many records
+            opp_ids: Only the records of these opportunities
+
+        Yields dicts with opp_id, fields, assessed_on (date), decision, decided_by, partial,
+        text and matches ({pattern key: [first span, all spans]}).
+        """
+        query = ("SELECT a.opp_id, a.fields, a.assessed_on, a.decision, a.decided_by, a.partial, t.text, t.matches "
+                 "FROM assessments a JOIN texts t ON a.text_key = t.text_key")
+        if opp_ids is None:
+            batches = [(query + " ORDER BY a.opp_id" + (" LIMIT ?" if limit else ""), (limit,) if limit else ())]
+        else:
+            selected = sorted(set(opp_ids))[:limit or None]
+            batches = [(query + f" WHERE a.opp_id IN ({','.join('?' * len(batch))}) ORDER BY a.opp_id", batch)
+                       for batch in (selected[start:start + 500] for start in range(0, len(selected), 500))]
+        for sql, params in batches:
+            with self._lock:
+                rows = self._connection().execute(sql, params).fetchall()
+            for opp_id, fields, assessed_on, decision, decided_by, partial, text, matches in rows:
+                yield {
+                    'opp_id': opp_id,
+                    'fields': json.loads(fields),
+                    'assessed_on': date.fromisoformat(assessed_on),
+                    'decision': decision,
+                    'decided_by': decided_by,
+                    'partial': bool(partial),
+                    'text': zlib.decompress(text).decode('utf-8', errors='surrogatepass'),
+                    'matches': json.loads(matches),
+                }
+
+    def opportunity_ids(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._connection().execute("SELECT opp_id FROM assessments")}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
+
+
+class SimulatedRecord:
+    """One archived opportunity's decision under the baseline and the candidate rules."""
+
+    __slots__ = ('opp_id', 'recorded', 'baseline', 'candidate', 'baseline_check', 'candidate_check',
+                 'candidate_reason', 'partial')
+
+    def __init__(self, opp_id: str, recorded: str, baseline: Tuple[Decision, List[CheckResult]],
+                 candidate: Tuple[Decision, List[CheckResult]], partial: bool):
+        self.opp_id = opp_id
+        self.recorded = recorded
+        self.baseline = baseline[0].value
+        self.candidate = candidate[0].value
+        self.baseline_check = deciding_check(baseline[1])
+        self.candidate_check = deciding_check(candidate[1])
+        deciding = deciding_result(candidate[1])
+        self.candidate_reason = deciding.reason if deciding else ''
+        self.partial = partial
+
+    @property
+    def changed(self) -> bool:
+        return self.baseline != self.candidate or self.baseline_check != self.candidate_check
+
+
+class SimulationReport:
+    """Per-record outcomes of a simulation plus how much of it was answered from the archive."""
+
+    def __init__(self, records: List[SimulatedRecord], restored: int, searched: int, seconds: float):
+        self.records = records
+        self.restored = restored
+        self.searched = searched
+        self.seconds = seconds
+
+    def diff_table(self) -> Counter:
+        """(baseline decision, candidate decision) -> number of records."""
+        return Counter((record.baseline, record.candidate) for record in self.records)
+
+    def changed(self) -> List[SimulatedRecord]:
+        """Records whose decision or deciding check differs under the candidate rules."""
+        return [record for record in self.records if record.changed]
+
+    def drifted(self) -> List[SimulatedRecord]:
+        """Records the baseline rules no longer decide as the pipeline recorded (rules or checks changed since)."""
+        return [record for record in self.records if record.baseline != record.recorded]
+
+
+class RuleSimulator:
+    """
+    Re-derives archived decisions under a baseline and a candidate rule pack.
+
+    Both filters are built on one private PatternCore, so a pattern the two packs share is
+    one compiled object and is restored or searched once per record.
+    """
+
+    def __init__(self, archive: MatchArchive, baseline: Optional[RulePack] = None):
+        """
+        Args:
+            archive: Archived assessments to replay
+            baseline: Rules the candidate is compared with (default: the shared pack)
+        """
+        self.archive = archive
+        self.baseline_pack = baseline or default_rule_pack()
+
+    def simulate(self, candidate: RulePack, limit: Optional[int] = None) -> SimulationReport:
+        """
+        Assess every archived record under both rule packs, as of the day it was assessed.
+
+        Args:
+            candidate: Modified rule pack
+            limit: Only the first this many records (by ID)
+        """
+        core = PatternCore()
+        baseline = InitialChecklistFilterV2(rule_pack=self.baseline_pack, pattern_core=core)
+        candidate_filter = InitialChecklistFilterV2(rule_pack=candidate, pattern_core=core)
+        by_key = {pattern_key(regex): regex
+                  for filter_logic in (baseline, candidate_filter)
+                  for regex in filter_logic.scan_engine.patterns.values()}
+
+        start = time.perf_counter()
+        records, restored, searched = [], 0, 0
+        for record in self.archive.records(limit):
+            text = record['text']
+            index = core.index_for(text)
+            for key, (first, every) in record['matches'].items():
+                regex = by_key.get(key)
+                if regex is not None:
+                    index.restore(regex, first, every)
+                    restored += 1
+            opp, as_of = record['fields'], record['assessed_on']
+            records.append(SimulatedRecord(
+                record['opp_id'], record['decision'],
+                baseline.assess_opportunity(opp, text=text, as_of=as_of),
+                candidate_filter.assess_opportunity(opp, text=text, as_of=as_of),
+                record['partial']
+            ))
+            searched += index.scans
+            core.release()
+        return SimulationReport(records, restored, searched, time.perf_counter() - start)
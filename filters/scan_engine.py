@@ -0,0 +1,253 @@
+"""
+Shared scan engine for the checklist filters.
+Every compiled pattern walks an opportunity's text at most once; all checks (and their
+follow-up searches on the full text) read matches from the same per-text MatchIndex
+instead of re-running re.search over 100k+ character RAG texts.
+"""
+
+import re
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from functools import partial
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from filters import filter_metrics
+from filters.regex_backend import PatternLike, compile_pattern
+
+
+class Evidence:
+    """
+    Offsets of the match a check's quote is taken from.
+
+    The quote string (the match with context_window characters either side, stripped)
+    is only sliced out when quote() is called, so results whose quotes are never shown
+    cost no string work. Holds a reference to the assessed text until then.
+    """
+
+    __slots__ = ('text', 'start', 'end', 'context_window')
+
+    def __init__(self, text: str, start: int, end: int, context_window: int = 50):
+        self.text = text
+        self.start = start
+        self.end = end
+        self.context_window = context_window
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self.start, self.end
+
+    def quote(self) -> str:
+        start = max(0, self.start - self.context_window)
+        end = min(len(self.text), self.end + self.context_window)
+        return self.text[start:end].strip()
+
+
+class MatchIndex:
+    """
+    Memoized matches of compiled patterns against one text.
+
+    first() costs one regex.search the first time a pattern is asked for and nothing
+    afterwards; all() costs one finditer pass and also answers later first() calls.
+    prefetch() runs first() searches ahead on an executor; first() then waits for them.
+    snapshot() and restore() carry what is known about a text over to another process or run.
+    With a prefilter (see filters/pattern_core.py), patterns it covers that match nowhere
+    in the text are answered from its single pass, without a search of their own.
+    While filter metrics are enabled (filters/filter_metrics.py), every search is timed and counted.
+    """
+
+    def __init__(self, text: str, prefilter=None):
+        self.text = text
+        self._prefilter = prefilter
+        self._present = None
+        self._first: Dict[Pattern, Optional[re.Match]] = {}
+        self._all: Dict[Pattern, List[re.Match]] = {}
+        self._pending: Dict[Pattern, Future] = {}
+        self._queued = deque()
+        self._executor: Optional[Executor] = None
+        self._ahead = 0
+        self.scans = 0
+
+    def first(self, regex: Pattern) -> Optional[re.Match]:
+        """Leftmost match of the pattern (identical to regex.search(text))."""
+        if regex in self._first:
+            return self._first[regex]
+        future = self._pending.pop(regex, None)
+        if future is not None:
+            self._top_up()
+        if regex in self._all:
+            match = self._all[regex][0] if self._all[regex] else None
+        elif future is not None and not future.cancelled():
+            match = future.result()
+            self.scans += 1
+        elif self._absent(regex):
+            match = None
+            if filter_metrics.active is not None:
+                filter_metrics.active.prefiltered(regex)
+        else:
+            metrics = filter_metrics.active
+            match = regex.search(self.text) if metrics is None else metrics.search(regex, self.text)
+            self.scans += 1
+        self._first[regex] = match
+        return match
+
+    def prefetch(self, regexes: Iterable[Pattern], executor: Executor, ahead: int) -> None:
+        """
+        Search these patterns on the executor in the given order, with up to `ahead`
+        searches in flight; each first() that takes a prefetched result starts the next.
+        Patterns already searched are skipped. The searches only overlap if the engine
+        releases the GIL while matching, as RE2 does and `re` does not.
+        """
+        self._executor, self._ahead = executor, ahead
+        self._queued.extend(regexes)
+        self._top_up()
+
+    def _top_up(self) -> None:
+        while self._queued and len(self._pending) < self._ahead:
+            regex = self._queued.popleft()
+            if regex not in self._first and regex not in self._all and regex not in self._pending \
+                    and not self._absent(regex):
+                metrics = filter_metrics.active
+                search = regex.search if metrics is None else partial(metrics.search, regex)
+                self._pending[regex] = self._executor.submit(search, self.text)
+
+    def _absent(self, regex: Pattern) -> bool:
+        """True when the prefilter pass (run on first use) shows the pattern matches nowhere."""
+        if self._prefilter is None or not self._prefilter.covers(regex):
+            return False
+        if self._present is None:
+            metrics = filter_metrics.active
+            self._present = self._prefilter.matching(self.text) if metrics is None \
+                else metrics.prefilter_pass(self._prefilter, self.text)
+            self.scans += 1
+            if self._present is None:
+                self._prefilter = None
+                return False
+        return regex not in self._present
+
+    def cancel_pending(self) -> None:
+        """Drop prefetches nothing asked for (a search already running finishes unused)."""
+        self._queued.clear()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def all(self, regex: Pattern) -> List[re.Match]:
+        """Every non-overlapping match of the pattern, in order."""
+        if regex not in self._all:
+            if self._first.get(regex, False) is None:
+                self._all[regex] = []
+            elif self._absent(regex):
+                self._all[regex] = []
+                if filter_metrics.active is not None:
+                    filter_metrics.active.prefiltered(regex)
+            else:
+                metrics = filter_metrics.active
+                # Alternatives were timed already if first() searched the pattern
+                self._all[regex] = list(regex.finditer(self.text)) if metrics is None \
+                    else metrics.finditer(regex, self.text, profile=regex not in self._first)
+                self.scans += 1
+        return self._all[regex]
+
+    def snapshot(self) -> Dict[Pattern, Tuple[Optional[Tuple[int, int]], Optional[List[Tuple[int, int]]]]]:
+        """
+        What is known so far, per pattern: (first match span or None, every match span, or
+        None if all() was never asked for). Pending prefetches are left out.
+        """
+        known = {}
+        for regex in set(self._first) | set(self._all):
+            every = self.offsets(regex) if regex in self._all else None
+            match = self._first[regex] if regex in self._first else (self._all[regex][0] if self._all[regex] else None)
+            known[regex] = (match.span() if match else None, every)
+        return known
+
+    def restore(self, regex: Pattern, first: Optional[Tuple[int, int]],
+                every: Optional[List[Tuple[int, int]]] = None) -> None:
+        """
+        Answer a pattern from a snapshot() of the same text instead of searching it.
+
+        Each recorded match is taken again with an anchored regex.match() at its start
+        (cheap, and it yields real match objects with their groups).
+        """
+        if every is not None:
+            self._all[regex] = [self._rematch(regex, start, end) for start, end in every]
+            if every and tuple(every[0]) == tuple(first or ()):
+                self._first[regex] = self._all[regex][0]
+                return
+        self._first[regex] = self._rematch(regex, *first) if first else None
+
+    def _rematch(self, regex: Pattern, start: int, end: int) -> re.Match:
+        match = regex.match(self.text, start)
+        if match is None or match.end() != end:
+            raise ValueError(f"Recorded match {start}-{end} of {regex.pattern[:40]!r} does not fit this text")
+        return match
+
+    def offsets(self, regex: Pattern) -> List[Tuple[int, int]]:
+        """(start, end) of every match."""
+        return [match.span() for match in self.all(regex)]
+
+    def groups(self, regex: Pattern) -> List[Dict[str, Optional[str]]]:
+        """Named groups of every match."""
+        return [match.groupdict() for match in self.all(regex)]
+
+    def has(self, regex: Pattern) -> bool:
+        return self.first(regex) is not None
+
+    def evidence(self, regex: Pattern, context_window: int = 50) -> Optional[Evidence]:
+        """Evidence for the first match (None if no match); the quote is built on demand."""
+        match = self.first(regex)
+        if not match:
+            return None
+        return Evidence(self.text, match.start(), match.end(), context_window)
+
+    def quote(self, regex: Pattern, context_window: int = 50) -> Optional[str]:
+        """The first match with context_window characters either side, stripped (None if no match)."""
+        evidence = self.evidence(regex, context_window)
+        return evidence.quote() if evidence else None
+
+
+class ScanEngine:
+    """
+    Registry of compiled patterns plus the MatchIndex of the text being assessed.
+
+    The index is memoized on the identity of the last text seen by the calling thread,
+    so the checks of one assess_opportunity() call share it without any plumbing. Built
+    on a PatternCore (filters/pattern_core.py), patterns are compiled and the index is
+    kept by the core instead, so other engines on the same core share both.
+    """
+
+    def __init__(self, flags: int = re.IGNORECASE, core=None):
+        self.flags = flags
+        self.core = core
+        self.patterns: Dict[str, Pattern] = {}
+        self._local = threading.local()
+
+    def register(self, name: str, pattern: PatternLike) -> Pattern:
+        """Compile (if needed, with the shared regex backend) and register a pattern under a name; returns the compiled pattern."""
+        compiled = self.core.compile(pattern, self.flags) if self.core else compile_pattern(pattern, self.flags)
+        self.patterns[name] = compiled
+        filter_metrics.name_pattern(compiled, name)
+        return compiled
+
+    def index_for(self, text: str) -> MatchIndex:
+        """MatchIndex for this text, reused while the same text object is being assessed."""
+        if self.core:
+            return self.core.index_for(text)
+        index = getattr(self._local, 'index', None)
+        if index is None or index.text is not text:
+            index = MatchIndex(text)
+            self._local.index = index
+        return index
+
+    def release(self) -> None:
+        """Drop the calling thread's index (and its reference to the text)."""
+        if self.core:
+            self.core.release()
+        self._local.index = None
+
+    def scan(self, text: str) -> MatchIndex:
+        """Eagerly index every registered pattern (all offsets and named groups) for a text."""
+        index = self.index_for(text)
+        for regex in self.patterns.values():
+            index.all(regex)
+        return index
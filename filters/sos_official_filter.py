@@ -5,10 +5,14 @@ Based on SOS Initial Assessment Logic v4.0 and official documentation
 
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 from dataclasses import dataclass
 
+from filters.linear_patterns import followed_by
+from filters.pattern_core import PatternCore, default_pattern_core
+from filters.batch import assess_in_pool
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -27,8 +31,17 @@ class SOSFilter:
     - Platform Identification Guide
     - AMC/AMSC Bid Matrix
     """
+
+    # Opportunity fields the checks read besides the extracted text (currency, contextual SAR)
+    ASSESSMENT_FIELDS = ('posted_date', 'agency', 'opp_type', 'psc_code')
     
-    def __init__(self):
+    def __init__(self, pattern_core: Optional[PatternCore] = None):
+        """
+        Args:
+            pattern_core: Compiled patterns and per-text match index shared with the other
+                filter engines (default: the process-wide core, see filters/pattern_core.py)
+        """
+        self.pattern_core = pattern_core or default_pattern_core()
         self._init_aviation_patterns()
         self._init_platform_guide()
         self._init_sar_patterns()
@@ -38,7 +51,7 @@ class SOSFilter:
         """Enhanced aviation patterns with exclusions for non-aviation equipment"""
         
         # Core aviation patterns
-        self.aviation_regex = re.compile(
+        self.aviation_regex = self.pattern_core.compile(
             '|'.join([
                 # Aircraft types
                 r'\b(aircraft|helicopter|rotorcraft|airplane|aviation|aerospace)\b',
@@ -69,7 +82,7 @@ class SOSFilter:
         )
         
         # Non-aviation exclusion patterns (things that might match but aren't aviation)
-        self.non_aviation_exclusions = re.compile(
+        self.non_aviation_exclusions = self.pattern_core.compile(
             '|'.join([
                 # Commercial/Industrial equipment
                 r'\b(commercial\s+off\s+the\s+shelf|COTS)\b',
@@ -150,14 +163,14 @@ class SOSFilter:
         
         # Create regex patterns for platform detection
         all_platforms = self.platform_guide['pure_military'] + self.platform_guide['civilian_equivalent']
-        self.platform_regex = re.compile(
+        self.platform_regex = self.pattern_core.compile(
             r'\b(' + '|'.join(re.escape(p) for p in all_platforms) + r')\b',
             re.IGNORECASE
         )
     
     def _init_sar_patterns(self):
         """Enhanced SAR patterns from SAR-Language-Patterns.md and real-world examples"""
-        self.sar_regex = re.compile(
+        self.sar_regex = self.pattern_core.compile(
             '|'.join([
                 # Core SAR phrases
                 r'source\s+approval\s+required',
@@ -198,19 +211,19 @@ class SOSFilter:
                 r'critical\s+application',
                 
                 # Special notice patterns that often indicate SAR
-                r'special\s+notice.*capability',
-                r'special\s+notice.*manufacturing',
-                r'sources\s+sought.*capability',
+                followed_by(r'special\s+notice', r'capability'),
+                followed_by(r'special\s+notice', r'manufacturing'),
+                followed_by(r'sources\s+sought', r'capability'),
                 # AMC/AMSC codes indicating SAR
                 r'\bAMC\s*[345]\b',
                 r'\bAMSC\s*[CDPR]\b',
                 # SAR package requirements
                 r'Source\s+Approval\s+Request\s+package',
                 r'\bSAR\s+package\b',
-                r'NAVSUP.*Source\s+Approval.*Brochure',
-                r'submit.*Source\s+Approval\s+Request',
+                followed_by(r'NAVSUP', r'Source\s+Approval', r'Brochure'),
+                followed_by(r'submit', r'Source\s+Approval\s+Request'),
                 # DLA SAR indicators
-                r'DLA.*source\s+approval',
+                followed_by(r'DLA', r'source\s+approval'),
                 r'design\s+control\s+activity\s+approval'
             ]), re.IGNORECASE
         )
@@ -218,7 +231,7 @@ class SOSFilter:
     def _init_assessment_patterns(self):
         """All other assessment patterns"""
         # Sole source indicators
-        self.sole_source_regex = re.compile(
+        self.sole_source_regex = self.pattern_core.compile(
             '|'.join([
                 r'sole\s+source',
                 r'only\s+source',
@@ -232,7 +245,7 @@ class SOSFilter:
         )
         
         # Technical data requirements
-        self.tech_data_regex = re.compile(
+        self.tech_data_regex = self.pattern_core.compile(
             '|'.join([
                 r'technical\s+data\s+package',
                 r'engineering\s+drawings?',
@@ -247,7 +260,7 @@ class SOSFilter:
         )
         
         # Security clearance requirements
-        self.clearance_regex = re.compile(
+        self.clearance_regex = self.pattern_core.compile(
             '|'.join([
                 r'security\s+clearance',
                 r'secret\s+clearance',
@@ -261,7 +274,7 @@ class SOSFilter:
         )
         
         # New parts only indicators
-        self.new_parts_regex = re.compile(
+        self.new_parts_regex = self.pattern_core.compile(
             '|'.join([
                 r'new\s+parts?\s+only',
                 r'no\s+used\s+parts?',
@@ -275,7 +288,7 @@ class SOSFilter:
         )
         
         # Prohibited certifications
-        self.prohibited_cert_regex = re.compile(
+        self.prohibited_cert_regex = self.pattern_core.compile(
             '|'.join([
                 r'ISO\s*9001',
                 r'AS\s*9100',
@@ -288,7 +301,7 @@ class SOSFilter:
         )
         
         # OEM restrictions
-        self.oem_regex = re.compile(
+        self.oem_regex = self.pattern_core.compile(
             '|'.join([
                 r'OEM\s+authorization',
                 r'manufacturer\s+authorization',
@@ -304,6 +317,10 @@ class SOSFilter:
         # Currency check - posted within last 12 months
         self.current_date = datetime.now()
     
+    def _search(self, regex, text: str):
+        """First match of a pattern, read from the per-text index shared by the engines."""
+        return self.pattern_core.index_for(text).first(regex)
+
     def extract_text(self, opp: Dict) -> str:
         """Extract all text content from opportunity"""
         # Check if we have enhanced text with documents first
@@ -329,12 +346,12 @@ class SOSFilter:
         """Phase 0.1: Enhanced aviation check with exclusions"""
         
         # First check for aviation matches
-        aviation_match = self.aviation_regex.search(text)
+        aviation_match = self._search(self.aviation_regex, text)
         if not aviation_match:
             return False, "FAIL - Not aviation-related"
         
         # If we found aviation keywords, check for exclusions
-        exclusion_match = self.non_aviation_exclusions.search(text)
+        exclusion_match = self._search(self.non_aviation_exclusions, text)
         if exclusion_match:
             context_start = max(0, exclusion_match.start() - 50)
             context_end = min(len(text), exclusion_match.end() + 50)
@@ -375,7 +392,7 @@ class SOSFilter:
     
     def check_platform_viability(self, text: str) -> Tuple[bool, str]:
         """Phase 0.3: Platform viability check"""
-        platform_match = self.platform_regex.search(text)
+        platform_match = self._search(self.platform_regex, text)
         if not platform_match:
             return True, "PASS - General aviation, no specific platform restrictions"
         
@@ -391,7 +408,7 @@ class SOSFilter:
         """Phase 1.1: Enhanced SAR check with contextual analysis"""
         
         # First check explicit SAR patterns
-        match = self.sar_regex.search(text)
+        match = self._search(self.sar_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -421,7 +438,7 @@ class SOSFilter:
     
     def check_sole_source(self, text: str) -> Tuple[bool, str]:
         """Phase 1.2: Sole source check"""
-        match = self.sole_source_regex.search(text)
+        match = self._search(self.sole_source_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -431,7 +448,7 @@ class SOSFilter:
     
     def check_technical_data(self, text: str) -> Tuple[bool, str]:
         """Phase 1.3: Technical data check"""
-        match = self.tech_data_regex.search(text)
+        match = self._search(self.tech_data_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -441,7 +458,7 @@ class SOSFilter:
     
     def check_security_clearance(self, text: str) -> Tuple[bool, str]:
         """Phase 1.4: Security clearance check"""
-        match = self.clearance_regex.search(text)
+        match = self._search(self.clearance_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -451,7 +468,7 @@ class SOSFilter:
     
     def check_new_parts_only(self, text: str) -> Tuple[bool, str]:
         """Phase 1.5: New parts only check"""
-        match = self.new_parts_regex.search(text)
+        match = self._search(self.new_parts_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -461,7 +478,7 @@ class SOSFilter:
     
     def check_prohibited_certifications(self, text: str) -> Tuple[bool, str]:
         """Phase 1.6: Prohibited certifications check"""
-        match = self.prohibited_cert_regex.search(text)
+        match = self._search(self.prohibited_cert_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -471,7 +488,7 @@ class SOSFilter:
     
     def check_oem_restrictions(self, text: str) -> Tuple[bool, str]:
         """Phase 1.8: OEM restrictions check"""
-        match = self.oem_regex.search(text)
+        match = self._search(self.oem_regex, text)
         if match:
             context_start = max(0, match.start() - 30)
             context_end = min(len(text), match.end() + 30)
@@ -479,7 +496,7 @@ class SOSFilter:
             return False, f"FAIL - OEM restrictions: '{match.group()}' in '{quote}'"
         return True, "PASS - No OEM restrictions"
     
-    def assess_opportunity(self, opp: Dict) -> AssessmentResult:
+    def assess_opportunity(self, opp: Dict, text: Optional[str] = None) -> AssessmentResult:
         """
         Complete SOS Initial Assessment Logic v4.0
         
@@ -497,8 +514,11 @@ class SOSFilter:
         6. Prohibited certifications check
         7. ITAR/export control check (disabled per user requirements)
         8. OEM restrictions check
+
+        text: Text already extracted from the opportunity (default: extract it here)
         """
-        text = self.extract_text(opp)
+        if text is None:
+            text = self.extract_text(opp)
         
         phase_0 = {}
         phase_1 = {}
@@ -580,3 +600,20 @@ class SOSFilter:
         
         reasoning = ['All assessment criteria met - viable opportunity']
         return AssessmentResult('GO', phase_0, phase_1, reasoning)
+
+    def worker_args(self) -> Dict:
+        """Constructor arguments that rebuild this filter in a spawned pool worker (see filters.batch)."""
+        return {'pattern_core': self.pattern_core}
+
+    def assess_many(self, opps: Iterable[Dict], workers: Optional[int] = None) -> Iterator[Tuple[str, AssessmentResult]]:
+        """
+        Assess many opportunities on a process pool (see filters.batch).
+
+        Args:
+            opps: Opportunities to assess
+            workers: Worker processes (default: CPU count; 1 runs in this process)
+
+        Returns:
+            Iterator of (opportunity id, AssessmentResult), in input order
+        """
+        return assess_in_pool(self, opps, self.extract_text, self.ASSESSMENT_FIELDS, workers)
@@ -0,0 +1,117 @@
+"""
+Incremental assessment of an opportunity whose text arrives section by section.
+The pipeline's analysis text is the description followed by one section per document, in
+listing order, and each section is final once its document is processed. Feeding the
+sections as they are produced lets a definitive hard stop end the opportunity early, so the
+remaining downloads and PDF extraction can be cancelled; everything else is decided on the
+complete text, exactly as the batch path does.
+"""
+
+import logging
+import threading
+from typing import List, Optional, Tuple
+
+from filters.initial_checklist_v2 import CheckResult, Decision
+from filters.linear_patterns import GAP_MAX
+
+logger = logging.getLogger(__name__)
+
+# Sections after the first start with a line break, so the character after the text received
+# so far is known even before the next section arrives
+SECTION_BREAK = '\n'
+# Appended to the reason of an early NO-GO: the text it was decided on is incomplete
+EARLY_EXIT_NOTE = " (streamed - remaining documents skipped)"
+# Text before a new section searched with it: matches may start up to GAP_MAX back, and as
+# much again is kept as context for lookbehinds and word boundaries at that start
+TAIL_CONTEXT = 2 * GAP_MAX
+
+
+class StreamingAssessment:
+    """
+    Assessment of one opportunity fed with its analysis text in order.
+
+    feed() appends a finished section and looks for a match of the filter's
+    DEFINITIVE_NO_GO_SCANS patterns in the text received so far. A match there is a match
+    in the complete text (sections are only ever appended, and these patterns read nothing
+    past their own match), so the batch assessment is certain to be a NO-GO as well: the
+    stream stops, `cancel` is set and result() reports assess_opportunity() on the text
+    received so far - the Phase 0 gates and the Phase 1 checks in order up to the first
+    NO-GO, the same result list the batch path builds. Without one, result() is
+    assess_opportunity() on the complete text, identical to the batch path.
+
+    Only whole sections are used because that is what the batch text guarantees: a PDF
+    contributes its top-ranked chunks, which are only known once all of its pages are in.
+    """
+
+    def __init__(self, filter_logic, opp):
+        self.filter_logic = filter_logic
+        self.opp = opp
+        self.cancel = threading.Event()
+        self.sections: List[str] = []
+        self.early_result: Optional[Tuple[Decision, List[CheckResult]]] = None
+        # End of the text received so far; feed() searches it with the new section only, so a
+        # large document costs one pass over each section instead of one per section fed
+        self._tail = ''
+        # Joined text, built on first read after each feed
+        self._text: Optional[str] = ''
+
+    @property
+    def text(self) -> str:
+        """Analysis text received so far."""
+        if self._text is None:
+            self._text = ''.join(self.sections)
+        return self._text
+
+    @property
+    def early_exit(self) -> bool:
+        return self.early_result is not None
+
+    def feed(self, section: str) -> bool:
+        """
+        Append the next section of the analysis text.
+
+        Args:
+            section: Final text of the next section; after the first, it must start with a line break
+
+        Returns:
+            True once a definitive NO-GO has been found and no more text is needed
+        """
+        if self.early_exit:
+            return True
+        if not section:
+            return False
+        if self.sections and not section.startswith(SECTION_BREAK):
+            raise ValueError("Sections after the first must start with a line break")
+
+        # Matches that end in earlier sections were looked for already; start far enough back
+        # to catch most that straddle the boundary (any missed are still found by result())
+        pos = max(0, len(self._tail) - GAP_MAX)
+        probe = self._tail + section + SECTION_BREAK
+        self.sections.append(section)
+        self._tail = probe[-TAIL_CONTEXT - 1:-1]
+        self._text = None
+
+        for check_name, attributes in self.filter_logic.DEFINITIVE_NO_GO_SCANS:
+            for attribute in attributes:
+                match = getattr(self.filter_logic, attribute).search(probe, pos)
+                if match is None or match.end() >= len(probe):
+                    continue
+                text = self.text
+                if getattr(self.filter_logic, check_name)(text).decision != Decision.NO_GO:
+                    continue
+                # The batch path would stop at an earlier NO-GO (an expired or non-aviation
+                # opportunity, an earlier hard stop), so report the full sequence on this text;
+                # with this check a NO-GO, it cannot end in anything else
+                decision, results = self.filter_logic.assess_opportunity(self.opp, text=text)
+                results[-1].reason += EARLY_EXIT_NOTE
+                self.early_result = (decision, results)
+                self.cancel.set()
+                logger.info(f"Definitive NO-GO after {len(self.sections)} section(s): {results[-1].check_name}")
+                return True
+        return False
+
+    def result(self) -> Tuple[Decision, List[CheckResult]]:
+        """(decision, results): the early NO-GO, otherwise the full assessment of the text."""
+        if self.early_result is not None:
+            return self.early_result
+        return self.filter_logic.assess_opportunity(self.opp, text=self.text)
@@ -0,0 +1,407 @@
+"""
+Inverted term index of assessed opportunity texts, for re-assessing only what a rule change can affect.
+Every archived text is split into normalized tokens (case-folded runs of [a-z0-9]) and word
+bigrams, and each term maps to the opportunities whose text contains it. For a regex, the
+index derives a necessary condition from its literals: an OR over its alternatives of an AND
+of terms, each term an exact token, a token prefix, suffix or infix (where the regex does
+not bound the word on that side) or a bigram of two exact tokens. A text the condition rules
+out cannot contain a match, so after a rule pack edit only the opportunities matching the
+condition of an added, removed or reordered pattern (or phrase) can be decided differently.
+
+Follow-up patterns and phrase tables are applied to a check's quote rather than the full
+text; a quote can cut a token short at either end, so their terms only count as infixes.
+"""
+
+import os
+import re
+import sqlite3
+import logging
+import threading
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# The regex parser is private to `re` (re._parser from Python 3.11, sre_parse before) and may
+# change without notice; without it no pattern gets a condition and every archived
+# opportunity is re-assessed after a rule change
+try:
+    from re import _constants as sre
+    from re import _parser as sre_parse
+except ImportError:
+    try:
+        import sre_constants as sre
+        import sre_parse
+    except ImportError:
+        sre = sre_parse = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+TOKEN_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789')
+# Shortest prefix/suffix/infix worth a lookup (shorter ones rule out next to nothing)
+MIN_PARTIAL_TERM = 3
+# Cap on the alternatives a regex is expanded into before a group is treated as unknown text
+MAX_ALTERNATIVES = 256
+# Character classes of at most this many token characters are expanded into alternatives
+MAX_CLASS_CHARS = 10
+
+# A term: (kind, text) with kind one of 'exact', 'prefix', 'suffix', 'infix', 'bigram'
+Term = Tuple[str, str]
+# A necessary condition: any of the AND-clauses holds; None when nothing is ruled out
+Query = Optional[List[FrozenSet[Term]]]
+
+# Items of the simplified regex: a token character, a run of at least one non-token character,
+# a zero-width word boundary, anything else (may add token characters or nothing), alternatives
+_DELIM = ('delim',)
+_BOUNDARY = ('boundary',)
+_UNKNOWN = ('unknown',)
+try:
+    _BOUNDARY_ATS = {sre.AT_BOUNDARY, sre.AT_BEGINNING, sre.AT_BEGINNING_STRING, sre.AT_BEGINNING_LINE,
+                     sre.AT_END, sre.AT_END_STRING, sre.AT_END_LINE}
+    _DELIM_CATEGORIES = {sre.CATEGORY_SPACE, sre.CATEGORY_NOT_WORD, sre.CATEGORY_LINEBREAK}
+    # Atomic groups and possessive repeats only exist from Python 3.11
+    _ATOMIC_GROUP = getattr(sre, 'ATOMIC_GROUP', None)
+    _REPEATS = {sre.MAX_REPEAT, sre.MIN_REPEAT, getattr(sre, 'POSSESSIVE_REPEAT', sre.MAX_REPEAT)}
+except AttributeError:  # no parser, or one without these opcodes
+    sre = sre_parse = None
+
+
+def tokens(text: str) -> List[str]:
+    """Normalized tokens of a text, in order."""
+    return _TOKEN.findall(text.casefold())
+
+
+def text_terms(text: str) -> Set[str]:
+    """Distinct tokens and word bigrams ('sole source') of a text."""
+    words = tokens(text)
+    terms = set(words)
+    terms.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return terms
+
+
+@lru_cache(maxsize=None)
+def _folds_to_token(lo: int, hi: int) -> bool:
+    """True if a character in lo..hi case-folds to a token character (assumed for very wide ranges)."""
+    if hi - lo > 0x3000:
+        return True
+    return any(TOKEN_CHARS.intersection(chr(code).casefold()) for code in range(lo, hi + 1))
+
+
+def _class_item(members) -> Tuple:
+    """
+    _DELIM if the character class can only match non-token characters, alternatives of its
+    characters if it only matches a few token characters ([BP], [345]), else _UNKNOWN.
+    """
+    chars, delimiters = set(), False
+    for op, av in members:
+        if op == sre.NEGATE or op == sre.CATEGORY and av not in _DELIM_CATEGORIES:
+            return _UNKNOWN
+        if op == sre.CATEGORY:
+            delimiters = True
+        elif op == sre.LITERAL:
+            chars.update(chr(av).casefold())
+        elif op == sre.RANGE and not _folds_to_token(*av):
+            delimiters = True
+        elif op == sre.RANGE and av[1] - av[0] < MAX_CLASS_CHARS:
+            chars.update(''.join(chr(code).casefold() for code in range(av[0], av[1] + 1)))
+        else:
+            return _UNKNOWN
+    token_chars = chars & TOKEN_CHARS
+    if not token_chars:
+        return _DELIM
+    if delimiters or token_chars != chars or len(token_chars) > MAX_CLASS_CHARS:
+        return _UNKNOWN
+    return ('branch', [[('char', char)] for char in sorted(token_chars)])
+
+
+def _items(parsed) -> List[Tuple]:
+    items = []
+    for op, av in parsed:
+        if op == sre.LITERAL:
+            items.extend(('char', char) if char in TOKEN_CHARS else _DELIM for char in chr(av).casefold())
+        elif op == sre.IN:
+            items.append(_class_item(av))
+        elif op == sre.BRANCH:
+            items.append(('branch', [_items(alternative) for alternative in av[1]]))
+        elif op == sre.SUBPATTERN:
+            items.extend(_items(av[3]))
+        elif op == _ATOMIC_GROUP:
+            items.extend(_items(av))
+        elif op in _REPEATS:
+            low, high, sub = av
+            sub_items = _items(sub)
+            if low == 0:
+                items.append(_UNKNOWN)
+            elif _DELIM in sub_items and all(item in (_DELIM, _BOUNDARY) for item in sub_items):
+                items.append(_DELIM)
+            else:
+                # The first repetition is certain; further ones continue the text unknowably
+                items.extend(sub_items)
+                if high > 1:
+                    items.append(_UNKNOWN)
+        elif op == sre.AT:
+            items.append(_BOUNDARY if av in _BOUNDARY_ATS else _UNKNOWN)
+        elif op in (sre.ASSERT, sre.ASSERT_NOT):
+            continue  # zero width: only restricts where the rest matches
+        else:
+            items.append(_UNKNOWN)
+    return items
+
+
+def _expand(items: List[Tuple]) -> List[List[Tuple]]:
+    """Linear item sequences, one per combination of alternatives (up to MAX_ALTERNATIVES)."""
+    sequences = [[]]
+    for item in items:
+        if item[0] != 'branch':
+            for sequence in sequences:
+                sequence.append(item)
+            continue
+        alternatives = [expanded for alternative in item[1] for expanded in _expand(alternative)]
+        if len(sequences) * len(alternatives) > MAX_ALTERNATIVES:
+            for sequence in sequences:
+                sequence.append(_UNKNOWN)
+        else:
+            sequences = [sequence + alternative for sequence in sequences for alternative in alternatives]
+    return sequences
+
+
+def _clause(sequence: List[Tuple], partial_only: bool) -> FrozenSet[Term]:
+    """Terms every match of a linear sequence puts into the text."""
+    words = []  # (word, bounded on the left, bounded on the right, follows the previous word across a delimiter)
+    word, left, linked, gap = '', False, False, 'broken'
+
+    def finish(right: bool):
+        nonlocal word, gap
+        if word:
+            words.append((word, left, right, linked))
+            word, gap = '', 'none'
+
+    for item in sequence:
+        if item[0] == 'char':
+            if not word:
+                linked = gap == 'delim' and bool(words)
+            word += item[1]
+        elif item is _DELIM:
+            finish(True)
+            left = True
+            gap = 'delim' if gap in ('none', 'delim') else gap
+        elif item is _BOUNDARY:
+            finish(True)
+            left = True
+        else:
+            finish(False)
+            left, gap = False, 'broken'
+    finish(False)
+
+    terms = set()
+    for position, (text, bounded_left, bounded_right, follows) in enumerate(words):
+        if partial_only:
+            kind = 'infix'
+        else:
+            kind = {(True, True): 'exact', (True, False): 'prefix',
+                    (False, True): 'suffix', (False, False): 'infix'}[(bounded_left, bounded_right)]
+        if len(text) >= (2 if kind == 'exact' else MIN_PARTIAL_TERM):
+            terms.add((kind, text))
+        if not partial_only and follows and kind == 'exact':
+            previous, previous_left, previous_right, _ = words[position - 1]
+            if previous_left and previous_right:
+                terms.add(('bigram', f"{previous} {text}"))
+    return frozenset(terms)
+
+
+def pattern_query(source: str, flags: int = 0, scoped: bool = False) -> Query:
+    """
+    Necessary condition for a regex to match a text.
+
+    Args:
+        source: Regex source (Python `re` syntax)
+        flags: Its re flags
+        scoped: The pattern is searched in a check's quote, not the full text (terms
+            then only count as infixes)
+
+    Returns:
+        AND-clauses of which a matching text satisfies at least one, or None if the
+        pattern has an alternative without any term (or the regex parser is unavailable)
+    """
+    if sre_parse is None:
+        return None
+    try:
+        items = _items(sre_parse.parse(source, flags))
+    except (re.error, RecursionError):
+        return None
+    except (AttributeError, TypeError, ValueError):
+        # A parse tree shaped differently from the one this was written against
+        logger.warning(f"Regex parse tree not understood; re-assessing without a term condition: {source[:80]}")
+        return None
+    clauses = [_clause(sequence, scoped) for sequence in _expand(items)]
+    if not all(clauses):
+        return None
+    return sorted(set(clauses), key=sorted)
+
+
+def phrase_query(phrase: str) -> Query:
+    """Necessary condition for a phrase table entry (matched in a quote as a plain substring)."""
+    return pattern_query(re.escape(phrase), re.IGNORECASE, scoped=True)
+
+
+def changed_entries(before: List[str], after: List[str]) -> List[str]:
+    """
+    Entries whose presence can decide differently between two ordered lists: added and
+    removed ones, plus every shared one if their relative order changed. A repeated entry
+    counts where it first appears (a later copy never decides anything).
+    """
+    before, after = list(dict.fromkeys(before)), list(dict.fromkeys(after))
+    shared_before = [entry for entry in before if entry in after]
+    shared_after = [entry for entry in after if entry in before]
+    changed = [entry for entry in before if entry not in after] + [entry for entry in after if entry not in before]
+    if shared_before != shared_after:
+        changed += shared_after
+    return changed
+
+
+def rule_changes(before: Dict, after: Dict, full_text_rules: Iterable[str]) -> List[Query]:
+    """
+    Conditions for the texts a rule pack edit can affect.
+
+    Args:
+        before: RulePack.sources() of the rules the records were assessed with
+        after: RulePack.sources() of the new rules
+        full_text_rules: Rules the filter searches in the full text (all others only
+            see quotes)
+
+    Returns:
+        One query per changed pattern or phrase (empty if nothing changed)
+    """
+    full_text = set(full_text_rules)
+    queries = []
+    for name in set(before['rules']) | set(after['rules']):
+        old, new = before['rules'].get(name), after['rules'].get(name)
+        if old == new:
+            continue
+        if old is None or new is None or old['flags'] != new['flags']:
+            changes = [(source, rule['flags']) for rule in (old, new) if rule for source in rule['patterns']]
+        else:
+            changes = [(source, new['flags']) for source in changed_entries(old['patterns'], new['patterns'])]
+        queries.extend(pattern_query(source, flags, scoped=name not in full_text) for source, flags in changes)
+    for name in set(before['phrases']) | set(after['phrases']):
+        old, new = before['phrases'].get(name, []), after['phrases'].get(name, [])
+        queries.extend(phrase_query(phrase) for phrase in changed_entries(old, new))
+    return queries
+
+
+class TermIndex:
+    """
+    SQLite inverted index: term -> opportunities whose text contains it.
+
+    Postings are only ever added: an opportunity re-indexed with a new text keeps the terms
+    of the old one, which can only add candidates, never lose one. A small metadata table
+    remembers the rule sources the indexed records were last assessed with.
+    """
+
+    def __init__(self, path: str = "cache/term_index.sqlite"):
+        """
+        Open (or create) the index database.
+
+        Args:
+            path: SQLite file holding the index
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        # A connection must not be used across fork
+        if self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(
+                "CREATE TABLE IF NOT EXISTS documents (doc INTEGER PRIMARY KEY, opp_id TEXT UNIQUE NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS postings (term TEXT NOT NULL, doc INTEGER NOT NULL, "
+                "PRIMARY KEY (term, doc)) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS vocabulary (term TEXT PRIMARY KEY) WITHOUT ROWID;"
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL);"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def add(self, opp_id: str, text: str) -> None:
+        """Index the terms of an opportunity's assessed text."""
+        terms = text_terms(text)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR IGNORE INTO documents (opp_id) VALUES (?)", (opp_id,))
+            doc = conn.execute("SELECT doc FROM documents WHERE opp_id = ?", (opp_id,)).fetchone()[0]
+            conn.executemany("INSERT OR IGNORE INTO postings (term, doc) VALUES (?, ?)", ((term, doc) for term in terms))
+            conn.executemany("INSERT OR IGNORE INTO vocabulary (term) VALUES (?)",
+                             ((term,) for term in terms if ' ' not in term))
+            conn.commit()
+
+    def opportunity_ids(self) -> Set[str]:
+        with self._lock:
+            return {row[0] for row in self._connection().execute("SELECT opp_id FROM documents")}
+
+    def _docs(self, conn: sqlite3.Connection, term: Term) -> Set[int]:
+        kind, text = term
+        if kind in ('exact', 'bigram'):
+            rows = conn.execute("SELECT doc FROM postings WHERE term = ?", (text,))
+        elif kind == 'prefix':
+            # Tokens are [a-z0-9]; '{' sorts after all of them
+            rows = conn.execute("SELECT doc FROM postings WHERE term >= ? AND term < ?", (text, text + '{'))
+        else:
+            glob = f"*{text}" if kind == 'suffix' else f"*{text}*"
+            rows = conn.execute("SELECT p.doc FROM vocabulary v JOIN postings p ON p.term = v.term "
+                                "WHERE v.term GLOB ?", (glob,))
+        return {row[0] for row in rows}
+
+    def candidates(self, query: Query) -> Set[str]:
+        """Indexed opportunities whose text satisfies a query (all of them for None)."""
+        with self._lock:
+            conn = self._connection()
+            if query is None:
+                return {row[0] for row in conn.execute("SELECT opp_id FROM documents")}
+            opp_ids = dict(conn.execute("SELECT doc, opp_id FROM documents"))
+            docs: Set[int] = set()
+            for clause in query:
+                matching = None
+                # Exact terms and bigrams first: their postings are one index lookup
+                for term in sorted(clause, key=lambda term: term[0] not in ('exact', 'bigram')):
+                    found = self._docs(conn, term)
+                    matching = found if matching is None else matching & found
+                    if not matching:
+                        break
+                docs |= matching or set()
+            return {opp_ids[doc] for doc in docs}
+
+    def affected(self, queries: List[Query]) -> Set[str]:
+        """Indexed opportunities that satisfy any of the queries."""
+        affected: Set[str] = set()
+        for query in queries:
+            affected |= self.candidates(query)
+        return affected
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, key: str, value: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, value))
+            conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._pid = None
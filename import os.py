@@ -3,13 +3,25 @@ import json
 import logging
 import hashlib
 import time
-from typing import Dict, List, Optional
+import itertools
+from contextlib import closing
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Import our custom modules
 # Make sure these files are in the correct subdirectories (api_clients/ and filters/)
 from api_clients.highergov_client_enhanced import EnhancedHigherGovClient
+from api_clients.sync_state import SyncWatermarkStore
+from api_clients.attachment_store import AttachmentStore
+from api_clients.resilience import HigherGovAPIError
+from api_clients.response_cache import ResponseCache
 from filters.initial_checklist_v2 import InitialChecklistFilterV2, Decision
+from filters.result_memo import ResultMemo
+from filters.rule_pack import RulePack, RulePackReloader
+from filters.rule_simulator import MatchArchive, deciding_check
+from filters.pattern_core import pattern_key
+from filters.term_index import TermIndex, rule_changes
+from filters.streaming import StreamingAssessment
 from document_processors.pdf_rag_processor import PDFRAGProcessor
 
 # --- Configuration ---
@@ -23,6 +35,16 @@ load_dotenv()
 SAVED_SEARCH_ID = 'tFDSNa5qi9S92K-bXbReY'
 OUTPUT_DIR = 'output'
 CACHE_DIR = 'document_cache'  # Cache for large documents
+MAX_OPPORTUNITIES = None  # None = assess the whole saved search (with INCREMENTAL_SYNC: the newest N changes)
+INCREMENTAL_SYNC = True  # Only fetch/assess opportunities that are new or changed since the last run
+SYNC_STATE_FILE = os.path.join('sync_state', 'highergov_watermarks.json')
+ATTACHMENT_STORE_DIR = 'attachment_store'  # Content-addressed attachment blobs shared across opportunities
+RESPONSE_CACHE_FILE = os.path.join('cache', 'highergov_responses.sqlite')  # API responses, reused within their TTL
+CHECK_MEMO_FILE = os.path.join('cache', 'check_results.sqlite')  # Check results per text, dropped when the rules change
+MATCH_ARCHIVE_FILE = os.path.join('cache', 'match_archive.sqlite')  # Texts and match indexes of assessed opportunities, for simulate_rules.py
+TERM_INDEX_FILE = os.path.join('cache', 'term_index.sqlite')  # Term -> archived opportunities, to re-assess only what a rule change can affect
+RULE_PACK_POLL_SECONDS = 5.0  # Edits to rules/hard_stops.json are picked up by a running pipeline this often
+STREAMING_ASSESSMENT = True  # Assess each document as it arrives; a definitive hard stop cancels the remaining downloads
 
 
 def get_document_cache_key(opportunity_id: str, document_path: str) -> str:
@@ -148,6 +170,52 @@ def extract_critical_text_segments(full_text: str, opp_title: str, max_length: i
     return selected_text
 
 
+def document_analysis_text(doc: Dict, opp_title: str, rag_processor: PDFRAGProcessor) -> Tuple[str, int]:
+    """
+    Analysis text one processed document contributes to its opportunity's text.
+    Uses RAG for PDFs (releasing the spooled download) and intelligent extraction for large
+    text documents. Every non-empty contribution starts with a blank line.
+    
+    Returns:
+        (text, number of PDF chunks created)
+    """
+    doc_name = doc.get('file_name', 'Unknown Document')
+    
+    # Strategy: Use RAG for PDFs, intelligent extraction for large text documents
+    if doc.get('pdf_file'):
+        # We have the spooled PDF download - use full RAG processing, then release it
+        pdf_file = doc.pop('pdf_file')
+        logging.info(f"RAG processing PDF: {doc_name} ({doc.get('size_bytes', 0)} bytes)")
+        
+        try:
+            chunks = rag_processor.process_pdf_to_rag(pdf_file, doc_name, content_hash=doc.get('content_sha256'))
+        finally:
+            pdf_file.close()
+        if chunks:
+            top_chunks = rag_processor.get_top_relevant_chunks(
+                chunks, 
+                max_chunks=25,
+                min_relevance=0.3
+            )
+            chunk_text = rag_processor.chunks_to_analysis_text(top_chunks, include_metadata=True)
+            logging.info(f"Processed {len(chunks)} chunks from {doc_name}, using top {len(top_chunks)} for analysis")
+            return f"\n\n{chunk_text}\n", len(chunks)
+        logging.warning(f"No chunks extracted from {doc_name}")
+        
+    elif doc.get('text_extract'):
+        # We have pre-extracted text - apply intelligent processing for large documents
+        extracted_text = doc['text_extract']
+        
+        if len(extracted_text) > 50000:  # For large documents, apply intelligent extraction
+            logging.info(f"Applying intelligent processing to large document: {doc_name} ({len(extracted_text)} chars)")
+            processed_text = extract_critical_text_segments(extracted_text, opp_title, max_length=100000)
+            return f"\n\n--- Document: {doc_name} (Intelligently Processed) ---\n" + processed_text, 0
+        # Small documents - use as-is
+        return f"\n\n--- Document: {doc_name} ---\n" + extracted_text, 0
+    
+    return '', 0
+
+
 def process_opportunity_documents_with_rag(api_client, opp: Dict, rag_processor: PDFRAGProcessor) -> str:
     """
     Process opportunity documents using advanced PDF RAG processing.
@@ -180,41 +248,9 @@ def process_opportunity_documents_with_rag(api_client, opp: Dict, rag_processor:
         total_chunks_processed = 0
         
         for doc in documents['results']:
-            doc_name = doc.get('file_name', 'Unknown Document')
-            
-            # Strategy: Use RAG for PDFs, intelligent extraction for large text documents
-            if doc.get('pdf_content'):
-                # We have raw PDF - use full RAG processing
-                pdf_content = doc['pdf_content']
-                logging.info(f"RAG processing PDF: {doc_name} ({len(pdf_content)} bytes)")
-                
-                chunks = rag_processor.process_pdf_to_rag(pdf_content, doc_name)
-                if chunks:
-                    top_chunks = rag_processor.get_top_relevant_chunks(
-                        chunks, 
-                        max_chunks=25,
-                        min_relevance=0.3
-                    )
-                    chunk_text = rag_processor.chunks_to_analysis_text(top_chunks, include_metadata=True)
-                    all_analysis_text += f"\n\n{chunk_text}\n"
-                    total_chunks_processed += len(chunks)
-                    logging.info(f"Processed {len(chunks)} chunks from {doc_name}, using top {len(top_chunks)} for analysis")
-                else:
-                    logging.warning(f"No chunks extracted from {doc_name}")
-                    
-            elif doc.get('text_extract'):
-                # We have pre-extracted text - apply intelligent processing for large documents
-                extracted_text = doc['text_extract']
-                
-                if len(extracted_text) > 50000:  # For large documents, apply intelligent extraction
-                    logging.info(f"Applying intelligent processing to large document: {doc_name} ({len(extracted_text)} chars)")
-                    processed_text = extract_critical_text_segments(extracted_text, opp_title, max_length=100000)
-                    all_analysis_text += f"\n\n--- Document: {doc_name} (Intelligently Processed) ---\n"
-                    all_analysis_text += processed_text
-                else:
-                    # Small documents - use as-is
-                    all_analysis_text += f"\n\n--- Document: {doc_name} ---\n"
-                    all_analysis_text += extracted_text
+            doc_text, doc_chunks = document_analysis_text(doc, opp_title, rag_processor)
+            all_analysis_text += doc_text
+            total_chunks_processed += doc_chunks
         
         processing_time = time.time() - start_time
         
@@ -232,6 +268,59 @@ def process_opportunity_documents_with_rag(api_client, opp: Dict, rag_processor:
         return opp.get('description_text', '')
 
 
+def assess_opportunity_streaming(api_client, opp: Dict, rag_processor: PDFRAGProcessor,
+                                 filter_logic: InitialChecklistFilterV2) -> Tuple[str, Decision, List]:
+    """
+    Streaming counterpart of process_opportunity_documents_with_rag + assess_opportunity.
+    
+    The description and then each document's analysis text are fed to a StreamingAssessment
+    as soon as they are ready, while later attachments are still downloading. A definitive
+    hard stop cancels the remaining downloads and PDF extraction and is returned as the
+    NO-GO; otherwise the complete text is assessed, with the same result as the batch path.
+    
+    Returns:
+        (analysis text, decision, detailed results)
+    """
+    opp_id = opp.get('source_id', 'unknown')
+    opp_title = opp.get('title', '')
+    document_path = opp.get('document_path')
+    
+    stream = StreamingAssessment(filter_logic, opp)
+    stream.feed(opp.get('description_text', ''))
+    if document_path and not stream.early_exit:
+        logging.info(f"Streaming documents with RAG for {opp_id}...")
+        start_time = time.time()
+        documents_used = total_chunks_processed = 0
+        try:
+            documents = api_client.iter_opportunity_documents(
+                document_path,
+                max_docs=10,
+                max_text_per_doc=None,
+                cancel=stream.cancel
+            )
+            try:
+                for doc in documents:
+                    doc_text, doc_chunks = document_analysis_text(doc, opp_title, rag_processor)
+                    documents_used += 1
+                    total_chunks_processed += doc_chunks
+                    if stream.feed(doc_text):
+                        break
+            finally:
+                documents.close()
+        except Exception as e:
+            logging.error(f"RAG processing failed for {opp_id}: {e}")
+            # Fallback to original description, as the batch path does
+            stream = StreamingAssessment(filter_logic, opp)
+            stream.feed(opp.get('description_text', ''))
+        
+        logging.info(f"Streaming RAG Summary for {opp_id}: {documents_used} documents, "
+                     f"{total_chunks_processed} chunks, {len(stream.text):,} characters in {time.time() - start_time:.2f}s"
+                     f"{' - stopped early, remaining documents cancelled' if stream.early_exit else ''}")
+    
+    final_decision, detailed_results = stream.result()
+    return stream.text, final_decision, detailed_results
+
+
 def process_opportunity_documents_robust(api_client, opp: Dict) -> str:
     """
     Legacy robust processing function - kept for compatibility.
@@ -239,6 +328,15 @@ def process_opportunity_documents_robust(api_client, opp: Dict) -> str:
     return process_opportunity_documents_with_rag(api_client, opp, PDFRAGProcessor())
 
 
+def stream_until_api_failure(opportunities: Iterable[Dict], failures: List[str]) -> Iterator[Dict]:
+    """Yield opportunities, stopping cleanly (and recording why) if the HigherGov API gives up mid-stream."""
+    try:
+        yield from opportunities
+    except HigherGovAPIError as e:
+        logging.error(f"Stopped fetching opportunities: {e}")
+        failures.append(str(e))
+
+
 def generate_human_readable_report(opp, opp_id, opp_title, final_decision, detailed_results):
     """Generate a human-readable assessment report matching the SOS v4 format with pipeline title"""
     from datetime import datetime
@@ -681,6 +779,105 @@ End of Assessment - {opp_id}
     return report
 
 
+def save_assessment(opp: Dict, final_decision: Decision, detailed_results: List, processing_time: float,
+                    enhanced_text: str, rag_processed: bool) -> None:
+    """Write the human-readable report and the JSON record of an assessment to OUTPUT_DIR."""
+    opp_id = opp.get('source_id', 'UnknownID')
+    opp_title = opp.get('title', 'Unknown Title')
+    report = generate_human_readable_report(opp, opp_id, opp_title, final_decision, detailed_results)
+    
+    file_path = os.path.join(OUTPUT_DIR, f"{opp_id}.txt")
+    with open(file_path, 'w', encoding='utf-8') as f:
+        f.write(report)
+    logging.info(f"Assessment report saved to {file_path}")
+    
+    # Also save JSON for summary generation (optional backup)
+    json_data = {
+        'opportunity_id': opp_id,
+        'opportunity_title': opp_title,
+        'final_decision': final_decision.value,
+        'assessment_details': [res.to_dict() for res in detailed_results],
+        'processing_time': processing_time,
+        'text_length': len(enhanced_text),
+        'rag_processed': rag_processed,
+        'original_opportunity': opp
+    }
+    json_path = os.path.join(OUTPUT_DIR, f"{opp_id}.json")
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(json_data, f, indent=4, default=str)
+
+
+def reassess_after_rule_change(filter_logic: InitialChecklistFilterV2, rule_pack: RulePack,
+                               match_archive: MatchArchive, term_index: TermIndex) -> int:
+    """
+    Re-assess the archived opportunities whose decision a rule pack edit can change.
+    
+    The term index remembers the rule sources last applied to the archive. When they differ
+    from the pack's, only the opportunities whose text has the terms of an added, removed or
+    reordered pattern are re-assessed - from the archived text and match index, as of the day
+    each was first assessed - and their reports rewritten if the decision or deciding check
+    changed. Archived opportunities missing from the index (archived before it existed) are
+    indexed first.
+    
+    Returns:
+        Number of opportunities re-assessed
+    """
+    archived = match_archive.opportunity_ids()
+    for record in match_archive.records(opp_ids=archived - term_index.opportunity_ids()):
+        term_index.add(record['opp_id'], record['text'])
+    
+    sources = rule_pack.sources()
+    applied = term_index.get_metadata('rule_sources')
+    if applied is None or json.loads(applied) == sources:
+        term_index.set_metadata('rule_sources', json.dumps(sources, sort_keys=True))
+        return 0
+    
+    # Rules the filter searches in the full text; every other rule only sees check quotes
+    full_text_rules = [name for name in sources['rules'] if name in filter_logic.scan_engine.patterns]
+    affected = term_index.affected(rule_changes(json.loads(applied), sources, full_text_rules)) & archived
+    logging.info(f"Rule pack {rule_pack.name} {rule_pack.version} changed: re-assessing {len(affected)} "
+                 f"of {len(archived)} archived opportunities")
+    
+    by_key = {pattern_key(regex): regex for regex in filter_logic.scan_engine.patterns.values()}
+    changed = 0
+    for record in match_archive.records(opp_ids=affected):
+        opp_id, text = record['opp_id'], record['text']
+        start_time = time.time()
+        index = filter_logic.scan_engine.index_for(text)
+        for key, (first, every) in record['matches'].items():
+            if key in by_key:
+                index.restore(by_key[key], first, every)
+        final_decision, detailed_results = filter_logic.assess_opportunity(
+            record['fields'], text=text, as_of=record['assessed_on']
+        )
+        processing_time = time.time() - start_time
+        match_archive.record(opp_id, record['fields'], text, final_decision, detailed_results, filter_logic,
+                             assessed_on=record['assessed_on'])
+        filter_logic.scan_engine.release()
+        if final_decision.value == record['decision'] and deciding_check(detailed_results) == record['decided_by']:
+            continue
+        
+        changed += 1
+        if record['partial'] and final_decision != Decision.NO_GO:
+            # The archived text stops at the hard stop that ended its download; the rest was never read
+            logging.warning(f"{opp_id} is no longer a NO-GO under the new rules, but was only partly downloaded "
+                            f"- report kept, re-assess it from its documents")
+            continue
+        logging.info(f"Rule change moved {opp_id} from {record['decision']} to {final_decision.value}")
+        opp = dict(record['fields'], source_id=opp_id, full_analysis_text=text)
+        try:
+            with open(os.path.join(OUTPUT_DIR, f"{opp_id}.json"), encoding='utf-8') as f:
+                opp = json.load(f)['original_opportunity']
+        except (OSError, ValueError, KeyError):
+            pass  # report rebuilt from the archived fields
+        save_assessment(opp, final_decision, detailed_results, processing_time, text, True)
+    
+    # Only now: an interrupted re-assessment is redone on the next run
+    term_index.set_metadata('rule_sources', json.dumps(sources, sort_keys=True))
+    logging.info(f"Re-assessment after the rule change: {changed} of {len(affected)} outcomes changed")
+    return len(affected)
+
+
 def main():
     """
     Main function to run the SOS opportunity assessment pipeline with RAG processing.
@@ -693,8 +890,21 @@ def main():
 
     try:
         # --- Step 1: Initialize Clients ---
-        api_client = EnhancedHigherGovClient()
-        filter_logic = InitialChecklistFilterV2()
+        api_client = EnhancedHigherGovClient(
+            attachment_store=AttachmentStore(ATTACHMENT_STORE_DIR),
+            response_cache=ResponseCache(RESPONSE_CACHE_FILE)
+        )
+        # Hard stop rules are reloaded when the rule pack changes; each opportunity is
+        # assessed by the filter current when it started
+        result_memo = ResultMemo(CHECK_MEMO_FILE)
+        filter_reloader = RulePackReloader(
+            lambda rule_pack: InitialChecklistFilterV2(result_memo=result_memo, rule_pack=rule_pack)
+        )
+        filter_reloader.start(RULE_PACK_POLL_SECONDS)
+        match_archive = MatchArchive(MATCH_ARCHIVE_FILE)
+        term_index = TermIndex(TERM_INDEX_FILE)
+        # Rules edited since the last run: re-assess the archived opportunities they can affect
+        reassess_after_rule_change(filter_reloader.current(), filter_reloader.pack, match_archive, term_index)
         
         # Initialize the PDF RAG processor
         rag_processor = PDFRAGProcessor(cache_dir="pdf_rag_cache")
@@ -705,95 +915,120 @@ def main():
 
         # --- Step 2: Fetch Opportunities ---
         logging.info(f"Fetching opportunities from saved search ID: {SAVED_SEARCH_ID}")
-        # Use the correct HigherGov API endpoint structure with document inclusion
+        # Stream the whole saved search page by page with document inclusion
+        # (the next page is prefetched while the current one is being RAG-processed)
         search_params = {
-            'api_key': api_client.api_key,
-            'search_id': SAVED_SEARCH_ID,
-            'page_size': 5,  # Get up to 5 opportunities to see what's available
             'source_type': 'sam',  # Federal opportunities
             'include_documents': True,  # IMPORTANT: Include document attachments
             'include_ai_summary': True  # Also include AI summaries if available
         }
-        # Use the correct endpoint path
-        response_data = api_client._get('opportunity/', params=search_params)
-        
-        opportunities = response_data.get('results', [])
-        if not opportunities:
-            logging.warning("No opportunities found for the given saved search. Exiting.")
-            return
-
-        logging.info(f"Found {len(opportunities)} opportunities to process.")
+        watermark_store = SyncWatermarkStore(SYNC_STATE_FILE) if INCREMENTAL_SYNC else None
+        if watermark_store:
+            # Newest-first, stopping at the captured_date watermark from the last run
+            opportunity_source = api_client.iter_changed_saved_search_opportunities(
+                SAVED_SEARCH_ID, watermark_store, page_size=100, **search_params
+            )
+            opportunities = opportunity_source
+            if MAX_OPPORTUNITIES:
+                # A capped run leaves older changes unseen, so it must not advance the watermark
+                logging.warning(f"MAX_OPPORTUNITIES={MAX_OPPORTUNITIES} with incremental sync: only the newest "
+                                f"{MAX_OPPORTUNITIES} changes are assessed and the captured_date watermark "
+                                f"is not advanced if the limit is reached")
+                opportunities = itertools.islice(opportunities, MAX_OPPORTUNITIES)
+        else:
+            opportunity_source = opportunities = api_client.iter_saved_search_opportunities(
+                SAVED_SEARCH_ID,
+                page_size=100,
+                max_opportunities=MAX_OPPORTUNITIES,
+                **search_params
+            )
         
         # Track processing statistics
+        total_count = 0
         processed_count = 0
+        skipped_count = 0
+        prescreened_count = 0
         error_count = 0
+        api_failures = []
 
         # --- Step 3: Process Each Opportunity with PDF RAG Processing ---
-        for i, opp in enumerate(opportunities, 1):
-            opp_id = opp.get('source_id', 'UnknownID')
-            opp_title = opp.get('title', 'Unknown Title')
+        # Closing the source when the loop ends (MAX_OPPORTUNITIES reached, or an error) shuts
+        # down its page prefetch at once instead of leaving it suspended until garbage collection
+        with closing(opportunity_source):
+            for i, opp in enumerate(stream_until_api_failure(opportunities, api_failures), 1):
+                opp_id = opp.get('source_id', 'UnknownID')
+                opp_title = opp.get('title', 'Unknown Title')
+                total_count += 1
             
-            print("\n" + "="*80)
-            logging.info(f"Processing Opportunity {i}/{len(opportunities)}: {opp_title[:50]}... ({opp_id})")
+                # Skip versions we have already assessed (no API, PDF or filter work needed)
+                if watermark_store and watermark_store.is_unchanged(opp):
+                    logging.info(f"Skipping unchanged opportunity {opp_id} (version {opp.get('version_key')})")
+                    skipped_count += 1
+                    continue
             
-            try:
-                # --- Step 3.5: Advanced PDF RAG Processing ---
-                start_time = time.time()
-                enhanced_text = process_opportunity_documents_with_rag(api_client, opp, rag_processor)
-                processing_time = time.time() - start_time
-                
-                # Update the opportunity object with enhanced text
-                opp['full_analysis_text'] = enhanced_text
-                
-                logging.info(f"RAG processing completed in {processing_time:.2f}s for {opp_id}")
-                
-                # --- Step 4: Assess with V2 Filter ---
-                final_decision, detailed_results = filter_logic.assess_opportunity(opp)
-                
-                # --- Step 5: Report Results ---
-                print(f"\nFINAL DECISION: [{final_decision.value}]")
-                print("-"*20)
-                print("Detailed Assessment Breakdown:")
-                for result in detailed_results:
-                    # Only print checks that were not a simple PASS
-                    if result.decision != Decision.PASS:
-                        print(f"  - Check: {result.check_name}")
-                        print(f"    - Decision: {result.decision.value}")
-                        print(f"    - Reason: {result.reason}")
-                        if result.quote:
-                            print(f"    - Quote: '{result.quote[:150]}...'") # Truncate long quotes
-
-                # --- Step 6: Save Human-Readable Report ---
-                report = generate_human_readable_report(opp, opp_id, opp_title, final_decision, detailed_results)
+                print("\n" + "="*80)
+                logging.info(f"Processing Opportunity {i}: {opp_title[:50]}... ({opp_id})")
+            
+                try:
+                    filter_logic = filter_reloader.current()
+                    # --- Step 3.4: Metadata pre-screen (expired / clearly non-aviation never cost a download) ---
+                    start_time = time.time()
+                    final_decision, detailed_results = filter_logic.prescreen_opportunity(opp)
+                    rag_processed = final_decision != Decision.NO_GO
                 
-                file_path = os.path.join(OUTPUT_DIR, f"{opp_id}.txt")
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(report)
-                logging.info(f"Assessment report saved to {file_path}")
+                    if rag_processed and STREAMING_ASSESSMENT:
+                        # --- Steps 3.5 + 4: RAG processing and V2 assessment, document by document ---
+                        enhanced_text, final_decision, detailed_results = assess_opportunity_streaming(
+                            api_client, opp, rag_processor, filter_logic
+                        )
+                        opp['full_analysis_text'] = enhanced_text
+                    elif rag_processed:
+                        # --- Step 3.5: Advanced PDF RAG Processing ---
+                        enhanced_text = process_opportunity_documents_with_rag(api_client, opp, rag_processor)
+                    
+                        # Update the opportunity object with enhanced text
+                        opp['full_analysis_text'] = enhanced_text
+                    
+                        logging.info(f"RAG processing completed in {time.time() - start_time:.2f}s for {opp_id}")
+                    
+                        # --- Step 4: Assess with V2 Filter ---
+                        final_decision, detailed_results = filter_logic.assess_opportunity(opp)
+                    else:
+                        enhanced_text = filter_logic.extract_metadata_text(opp)
+                        prescreened_count += 1
+                        logging.info(f"Pre-screen NO-GO for {opp_id} ({detailed_results[-1].reason}) - documents not downloaded")
+                    processing_time = time.time() - start_time
+                    if rag_processed:
+                        # Keep the text and its match index so rule changes can be simulated without re-fetching
+                        match_archive.record(opp_id, opp, enhanced_text, final_decision, detailed_results, filter_logic)
+                        term_index.add(opp_id, enhanced_text)
                 
-                # Also save JSON for summary generation (optional backup)
-                json_data = {
-                    'opportunity_id': opp_id,
-                    'opportunity_title': opp_title,
-                    'final_decision': final_decision.value,
-                    'assessment_details': [res.__dict__ for res in detailed_results],
-                    'processing_time': processing_time,
-                    'text_length': len(enhanced_text),
-                    'rag_processed': True,
-                    'original_opportunity': opp
-                }
-                json_path = os.path.join(OUTPUT_DIR, f"{opp_id}.json")
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, indent=4, default=str)
+                    # --- Step 5: Report Results ---
+                    print(f"\nFINAL DECISION: [{final_decision.value}]")
+                    print("-"*20)
+                    print("Detailed Assessment Breakdown:")
+                    for result in detailed_results:
+                        # Only print checks that were not a simple PASS
+                        if result.decision != Decision.PASS:
+                            print(f"  - Check: {result.check_name}")
+                            print(f"    - Decision: {result.decision.value}")
+                            print(f"    - Reason: {result.reason}")
+                            if result.quote:
+                                print(f"    - Quote: '{result.quote[:150]}...'") # Truncate long quotes
+
+                    # --- Step 6: Save Human-Readable Report ---
+                    save_assessment(opp, final_decision, detailed_results, processing_time, enhanced_text, rag_processed)
                 
-                processed_count += 1
+                    processed_count += 1
+                    if watermark_store:
+                        watermark_store.mark_assessed(opp)
                 
-            except Exception as e:
-                logging.error(f"Failed to process opportunity {opp_id}: {e}")
-                error_count += 1
+                except Exception as e:
+                    logging.error(f"Failed to process opportunity {opp_id}: {e}")
+                    error_count += 1
                 
-                # Create error report
-                error_report = f"""ERROR PROCESSING {opp_id}
+                    # Create error report
+                    error_report = f"""ERROR PROCESSING {opp_id}
 Title: {opp_title}
 Error: {str(e)}
 Time: {time.strftime('%Y-%m-%d %H:%M:%S')}
@@ -801,18 +1036,39 @@ Time: {time.strftime('%Y-%m-%d %H:%M:%S')}
 This opportunity could not be processed due to technical issues.
 Please review manually or retry later.
 """
-                error_path = os.path.join(OUTPUT_DIR, f"{opp_id}_ERROR.txt")
-                with open(error_path, 'w', encoding='utf-8') as f:
-                    f.write(error_report)
+                    error_path = os.path.join(OUTPUT_DIR, f"{opp_id}_ERROR.txt")
+                    with open(error_path, 'w', encoding='utf-8') as f:
+                        f.write(error_report)
+        
+        error_count += len(api_failures)
+        # ... and the ones assessed before a reload during this run
+        reassessed_count = reassess_after_rule_change(filter_reloader.current(), filter_reloader.pack,
+                                                      match_archive, term_index)
+        
+        if watermark_store:
+            # Only move the captured_date watermark forward if every record made it through
+            # (and none were left behind by MAX_OPPORTUNITIES)
+            capped = bool(MAX_OPPORTUNITIES) and total_count >= MAX_OPPORTUNITIES
+            watermark_store.save(advance_watermarks=(error_count == 0 and not capped))
+        
+        if not total_count:
+            logging.warning("No new or changed opportunities found for the given saved search. Exiting.")
+            return
         
         # Final processing summary
         logging.info(f"""
         === PDF RAG PROCESSING SUMMARY ===
-        Total Opportunities: {len(opportunities)}
+        Total Opportunities: {total_count}
         Successfully Processed: {processed_count}
+        Skipped (unchanged version): {skipped_count}
+        Rejected by metadata pre-screen (no download): {prescreened_count}
+        Re-assessed after rule changes: {reassessed_count}
         Errors: {error_count}
-        Success Rate: {processed_count/len(opportunities)*100:.1f}%
+        Success Rate: {(processed_count + skipped_count)/total_count*100:.1f}%
         RAG Cache Directory: pdf_rag_cache/
+        API Response Cache: {api_client.response_cache.stats()}
+        Check Result Memo: {result_memo.stats()}
+        Rule Pack: {filter_reloader.pack.name} {filter_reloader.pack.version} ({filter_reloader.reloads} reloads)
         """)
 
     except Exception as e:
@@ -1,9 +1,12 @@
 import re
 import logging
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
 from datetime import datetime, date
 from enum import Enum
 
+from filters.pattern_core import PatternCore, default_pattern_core
+from filters.batch import assess_in_pool
+
 logger = logging.getLogger(__name__)
 
 class Decision(Enum):
@@ -30,7 +33,10 @@ class InitialChecklistFilterV2Enhanced:
     based on comprehensive documentation analysis and real SAR language patterns.
     """
 
-    def __init__(self, platform_guide: Optional[Dict] = None):
+    # Opportunity fields the checks read besides the extracted text (the currency check's due date)
+    ASSESSMENT_FIELDS = ('due_date',)
+
+    def __init__(self, platform_guide: Optional[Dict] = None, pattern_core: Optional[PatternCore] = None):
         """
         Initializes the filter with compiled regular expressions for efficiency.
 
@@ -38,11 +44,16 @@ class InitialChecklistFilterV2Enhanced:
             platform_guide (Optional[Dict]): A dictionary defining platform viability.
                                               Keys: 'pure_military', 'conditional', 'always_go'.
                                               Values: List of platform names/patterns.
+            pattern_core (Optional[PatternCore]): Compiled patterns and per-text match index shared
+                                                  with the other filter engines (default: the
+                                                  process-wide core, see filters/pattern_core.py).
         """
+        self.pattern_core = pattern_core or default_pattern_core()
+
         # --- V2: Enhanced Regular Expressions ---
 
         # Phase 0.1: Aviation Patterns - Expanded based on comprehensive checklist
-        self.aviation_regex = re.compile(
+        self.aviation_regex = self.pattern_core.compile(
             '|'.join([
                 r'\b(aircraft|helicopter|rotorcraft|airplane|aerospace|avionics)\b',
                 r'\b(Boeing|Airbus|Bell|Sikorsky|Lockheed|Northrop|McDonnell)\b',
@@ -81,33 +92,33 @@ class InitialChecklistFilterV2Enhanced:
         }
 
         # Phase 1: Enhanced Hard Stop Patterns based on SAR Language Patterns analysis
-        self.sar_regex = re.compile(r'source approval required|approved source list|qualified suppliers list|\bQPL\b|\bQML\b|requires engineering source approval|Government source approval required|military specification|requires engineering source approval by the design control activity|Source Approval Request|SAR package|SAMSAR|must submit.{0,20}Source Approval|approved source only|\bAMC\s*[345]\b|\bAMSC\s*[CDPR]\b', re.IGNORECASE)
+        self.sar_regex = self.pattern_core.compile(r'source approval required|approved source list|qualified suppliers list|\bQPL\b|\bQML\b|requires engineering source approval|Government source approval required|military specification|requires engineering source approval by the design control activity|Source Approval Request|SAR package|SAMSAR|must submit.{0,20}Source Approval|approved source only|\bAMC\s*[345]\b|\bAMSC\s*[CDPR]\b', re.IGNORECASE)
         
-        self.sole_source_regex = re.compile(r'sole source to (?!(Source One Spares))|only one responsible source|single source to (?!(Source One Spares))', re.IGNORECASE)
+        self.sole_source_regex = self.pattern_core.compile(r'sole source to (?!(Source One Spares))|only one responsible source|single source to (?!(Source One Spares))', re.IGNORECASE)
         
-        self.intent_to_sole_source_regex = re.compile(r'intent to sole source|brand name justification', re.IGNORECASE)
+        self.intent_to_sole_source_regex = self.pattern_core.compile(r'intent to sole source|brand name justification', re.IGNORECASE)
         
-        self.tech_data_regex = re.compile(r'drawings not available|technical data not available|OEM owns technical data|proprietary technical data|no GFI|government does not have|contractor will not receive|data rights|proprietary data', re.IGNORECASE)
+        self.tech_data_regex = self.pattern_core.compile(r'drawings not available|technical data not available|OEM owns technical data|proprietary technical data|no GFI|government does not have|contractor will not receive|data rights|proprietary data', re.IGNORECASE)
         
-        self.security_regex = re.compile(r'security clearance|secret|top secret|classified|facility clearance|personnel clearance|security requirements', re.IGNORECASE)
+        self.security_regex = self.pattern_core.compile(r'security clearance|secret|top secret|classified|facility clearance|personnel clearance|security requirements', re.IGNORECASE)
         
-        self.new_parts_regex = re.compile(r'factory new only|new manufacture only|no refurbished|no rebuilt|no overhauled|no used|new condition only', re.IGNORECASE)
+        self.new_parts_regex = self.pattern_core.compile(r'factory new only|new manufacture only|no refurbished|no rebuilt|no overhauled|no used|new condition only', re.IGNORECASE)
         
-        self.prohibited_certs_regex = re.compile(r'AS9100.{0,10}required|NADCAP.{0,10}required', re.IGNORECASE)
+        self.prohibited_certs_regex = self.pattern_core.compile(r'AS9100.{0,10}required|NADCAP.{0,10}required', re.IGNORECASE)
         
-        self.oem_regex = re.compile(r'OEM only|authorized distributor|OEM distributor|factory authorized dealer|OEM direct traceability only|authorized distributor required|factory authorized|OEM approved only|\bAMSC\s*B\b', re.IGNORECASE)
+        self.oem_regex = self.pattern_core.compile(r'OEM only|authorized distributor|OEM distributor|factory authorized dealer|OEM direct traceability only|authorized distributor required|factory authorized|OEM approved only|\bAMSC\s*B\b', re.IGNORECASE)
         
-        self.itar_regex = re.compile(r'ITAR|export control|international traffic in arms|ITAR registration required|export license required|EAR', re.IGNORECASE)
+        self.itar_regex = self.pattern_core.compile(r'ITAR|export control|international traffic in arms|ITAR registration required|export license required|EAR', re.IGNORECASE)
 
         # Additional patterns for enhanced detection
-        self.commercial_indicators_regex = re.compile(r'FAR Part 12|commercial item|commercial off.{0,10}shelf|COTS|14 CFR|FAA certified', re.IGNORECASE)
+        self.commercial_indicators_regex = self.pattern_core.compile(r'FAR Part 12|commercial item|commercial off.{0,10}shelf|COTS|14 CFR|FAA certified', re.IGNORECASE)
         
-        self.sled_regex = re.compile(r'\b(state|county|city|municipal|school district|university|state agency)\b', re.IGNORECASE)
+        self.sled_regex = self.pattern_core.compile(r'\b(state|county|city|municipal|school district|university|state agency)\b', re.IGNORECASE)
 
 
     def _find_match_with_quote(self, regex: re.Pattern, text: str, context_window: int = 50) -> Optional[str]:
         """Finds a regex match and returns the matched text with surrounding context."""
-        match = regex.search(text)
+        match = self.pattern_core.index_for(text).first(regex)
         if match:
             start = max(0, match.start() - context_window)
             end = min(len(text), match.end() + context_window)
@@ -165,7 +176,7 @@ class InitialChecklistFilterV2Enhanced:
                 full_pattern = self.PLATFORM_CONTEXT_PATTERN + r'\b' + platform + r'\b'
                 try:
                     # Find all potential matches
-                    for match in re.finditer(full_pattern, text, re.IGNORECASE):
+                    for match in self.pattern_core.compile(full_pattern, re.IGNORECASE).finditer(text):
                         confidence_score = 0
                         # Analyze a window of text around the match
                         start = max(0, match.start() - 40)
@@ -295,14 +306,19 @@ class InitialChecklistFilterV2Enhanced:
             return "purchase items"
         return "aviation support"
 
-    def assess_opportunity(self, opp: Dict) -> Tuple[Decision, List[CheckResult]]:
+    def assess_opportunity(self, opp: Dict, text: Optional[str] = None) -> Tuple[Decision, List[CheckResult]]:
         """
         Runs the enhanced full Phase 0 and Phase 1 assessment on an opportunity.
 
+        Args:
+            opp: Opportunity dict
+            text: Text already extracted from the opportunity (default: extract it here)
+
         Returns:
             A tuple containing the final decision and a list of all check results.
         """
-        text = self.extract_text_from_opportunity(opp)
+        if text is None:
+            text = self.extract_text_from_opportunity(opp)
         all_results = []
 
         # --- Run Phase 0 ---
@@ -334,6 +350,25 @@ class InitialChecklistFilterV2Enhanced:
 
         return final_decision, all_results
 
+    def worker_args(self) -> Dict:
+        """Constructor arguments that rebuild this filter in a spawned pool worker (see filters.batch)."""
+        return {'platform_guide': self.platform_guide, 'pattern_core': self.pattern_core}
+
+    def assess_many(self, opps: Iterable[Dict], workers: Optional[int] = None) -> Iterator[Tuple[str, Decision, List[CheckResult]]]:
+        """
+        Assess many opportunities on a process pool (see filters.batch).
+
+        Args:
+            opps: Opportunities to assess
+            workers: Worker processes (default: CPU count; 1 runs in this process)
+
+        Returns:
+            Iterator of (opportunity id, final decision, check results), in input order
+        """
+        for opp_id, (decision, results) in assess_in_pool(
+                self, opps, self.extract_text_from_opportunity, self.ASSESSMENT_FIELDS, workers):
+            yield opp_id, decision, results
+
     def generate_assessment_report(self, opp: Dict) -> Dict:
         """Generate a comprehensive assessment report."""
         decision, results = self.assess_opportunity(opp)
@@ -1,6 +1,8 @@
 import os
+import sys
 import json
 import logging
+from collections import deque
 from dotenv import load_dotenv
 
 # Import our custom modules
@@ -18,6 +20,13 @@ load_dotenv()
 # Get configuration from environment variables
 SAVED_SEARCH_ID = os.getenv('SAVED_SEARCH_ID', 'g6eFIE5ftdvpSvP-u1UJ-')
 OUTPUT_DIR = 'output'
+# Test runs stop after this many opportunities; pass --full to walk the whole saved search
+TEST_RUN_LIMIT = 100
+# Processes assessing opportunities in parallel (unset: one per CPU)
+ASSESS_WORKERS = int(os.getenv('SOS_ASSESS_WORKERS', '0')) or None
+# Threads searching one opportunity's hard stop patterns concurrently (0: one check after another);
+# only patterns compiled for RE2 are overlapped, so this needs the optional google-re2 package
+PHASE1_WORKERS = int(os.getenv('SOS_PHASE1_WORKERS', '0'))
 
 
 def main():
@@ -33,42 +42,44 @@ def main():
     try:
         # --- Step 1: Initialize Clients ---
         api_client = EnhancedHigherGovClient()
-        filter_logic = InitialChecklistFilterV2()
+        filter_logic = InitialChecklistFilterV2(phase1_workers=PHASE1_WORKERS)
         logging.info("API Client and V2 Filter Logic initialized successfully.")
 
         # --- Step 2: Fetch Opportunities ---
         logging.info(f"Fetching opportunities from saved search ID: {SAVED_SEARCH_ID}")
-        # Use the correct HigherGov API endpoint structure
-        search_params = {
-            'api_key': api_client.api_key,
-            'search_id': SAVED_SEARCH_ID,
-            'page_size': 100,  # Get 100 at a time
-            'source_type': 'sam'  # Federal opportunities
-        }
-        # Use the correct endpoint path
-        response_data = api_client._get('opportunity/', params=search_params)
-        
-        opportunities = response_data.get('results', [])
-        if not opportunities:
-            logging.warning("No opportunities found for the given saved search. Exiting.")
-            return
-
-        logging.info(f"Found {len(opportunities)} opportunities to process.")
+        # Stream the saved search page by page (next page is prefetched while we assess)
+        max_opportunities = None if '--full' in sys.argv else TEST_RUN_LIMIT
+        opportunities = api_client.iter_saved_search_opportunities(
+            SAVED_SEARCH_ID,
+            page_size=100,
+            max_opportunities=max_opportunities,
+            source_type='sam'  # Federal opportunities
+        )
 
         # --- Step 3: Process Each Opportunity ---
-        for i, opp in enumerate(opportunities, 1):
+        # Opportunities handed to the assessment pool, in order, until their result comes back
+        in_flight = deque()
+
+        def queued(opps):
+            for opp in opps:
+                in_flight.append(opp)
+                yield opp
+
+        # --- Step 4: Assess with V2 Filter (process pool, results in input order) ---
+        assessments = filter_logic.assess_many(queued(opportunities), workers=ASSESS_WORKERS)
+        processed_count = 0
+        for i, (_, final_decision, detailed_results) in enumerate(assessments, 1):
+            opp = in_flight.popleft()
             opp_id = opp.get('source_id', 'UnknownID')
             opp_title = opp.get('title', 'Unknown Title')
+            processed_count += 1
             
             print("\n" + "="*80)
-            logging.info(f"Processing Opportunity {i}/{len(opportunities)}: {opp_title} ({opp_id})")
+            logging.info(f"Processing Opportunity {i}: {opp_title} ({opp_id})")
             
             # This would be the place to fetch full document text if not already in the opp object
             # For now, we rely on the text extracted by the filter's method.
             
-            # --- Step 4: Assess with V2 Filter ---
-            final_decision, detailed_results = filter_logic.assess_opportunity(opp)
-            
             # --- Step 5: Report Results ---
             print(f"\nFINAL DECISION: [{final_decision.value}]")
             print("-"*20)
@@ -87,7 +98,7 @@ def main():
                 'opportunity_id': opp_id,
                 'opportunity_title': opp_title,
                 'final_decision': final_decision.value,
-                'assessment_details': [res.__dict__ for res in detailed_results],
+                'assessment_details': [res.to_dict() for res in detailed_results],
                 'original_opportunity': opp # Save the original data for reference
             }
 
@@ -96,6 +107,11 @@ def main():
                 json.dump(output_data, f, indent=4, default=str) # Use default=str for datetime objects
             logging.info(f"Detailed results saved to {file_path}")
 
+        if not processed_count:
+            logging.warning("No opportunities found for the given saved search.")
+        else:
+            logging.info(f"Processed {processed_count} opportunities.")
+
     except Exception as e:
         logging.error(f"An unexpected error occurred in the main pipeline: {e}", exc_info=True)
 
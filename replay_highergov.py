@@ -0,0 +1,115 @@
+"""
+HigherGov record/replay tool
+Record a saved search (pages, document listings, attachments) once, then replay it
+locally for offline benchmarking and load tests.
+
+    python replay_highergov.py record --max-pages 2 --max-docs 5 [--incremental]
+    python replay_highergov.py serve --latency-ms 150 --jitter-ms 50 --bandwidth-kbps 4096 --error-rate 0.02
+
+Then point the pipeline at the replay server:
+
+    HIGHERGOV_BASE_URL=http://127.0.0.1:8765 HIGHERGOV_API_KEY=replay python "import os.py"
+
+--incremental records the pages newest-first, as INCREMENTAL_SYNC runs request them. The
+server answers a request whose ordering or include_* flags were not recorded with the
+recorded variant of the same page, so either recording replays for every entry point.
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+from dotenv import load_dotenv
+
+from api_clients.highergov_client_enhanced import EnhancedHigherGovClient
+from api_clients.highergov_replay import HigherGovRecorder, ReplayServer
+
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def record(args):
+    """Capture a saved search from the real API into the fixture directory."""
+    client = EnhancedHigherGovClient()
+    recorder = HigherGovRecorder(client, args.fixture_dir)
+    search_id = args.search_id or os.getenv('SAVED_SEARCH_ID')
+    if not search_id:
+        print("ERROR: pass --search-id or set SAVED_SEARCH_ID in .env")
+        return 1
+
+    # The same params the pipeline sends, so its page requests replay exactly
+    params = {'source_type': 'sam', 'include_ai_summary': True}
+    if args.incremental:
+        params['ordering'] = '-captured_date'
+    counts = recorder.record_saved_search(
+        search_id,
+        page_size=args.page_size,
+        max_pages=args.max_pages,
+        max_docs=args.max_docs,
+        **params
+    )
+    for opportunity_id in args.opportunity:
+        recorder.record_endpoint(f"opportunity/{opportunity_id}")
+
+    print(f"Recorded {counts['pages']} pages, {counts['opportunities']} opportunities "
+          f"and {counts['files']} attachments into {args.fixture_dir}")
+    return 0
+
+
+def serve(args):
+    """Replay the fixture directory until interrupted."""
+    server = ReplayServer(
+        args.fixture_dir,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        bandwidth_kbps=args.bandwidth_kbps,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    print(f"Replaying {len(server.index)} routes from {args.fixture_dir} on {server.base_url}")
+    print(f"Run the pipeline with HIGHERGOV_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Replay stats: {server.stats}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay HigherGov API traffic")
+    parser.add_argument('--fixture-dir', default=os.path.join('fixtures', 'highergov'))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help="capture a saved search from the real API")
+    record_parser.add_argument('--search-id', help="saved search ID (defaults to SAVED_SEARCH_ID)")
+    record_parser.add_argument('--page-size', type=int, default=100)
+    record_parser.add_argument('--max-pages', type=int, default=None)
+    record_parser.add_argument('--max-docs', type=int, default=10, help="attachments recorded per opportunity")
+    record_parser.add_argument('--incremental', action='store_true',
+                               help="record newest-first pages, as INCREMENTAL_SYNC requests them")
+    record_parser.add_argument('--opportunity', action='append', default=[],
+                               help="also record opportunity/<id> (repeatable)")
+    record_parser.set_defaults(func=record)
+
+    serve_parser = commands.add_parser('serve', help="replay recorded fixtures locally")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.add_argument('--latency-ms', type=float, default=0)
+    serve_parser.add_argument('--jitter-ms', type=float, default=0)
+    serve_parser.add_argument('--bandwidth-kbps', type=float, default=0, help="0 = unlimited")
+    serve_parser.add_argument('--error-rate', type=float, default=0, help="fraction of requests answered 429/500/503")
+    serve_parser.add_argument('--seed', type=int, default=None)
+    serve_parser.set_defaults(func=serve)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
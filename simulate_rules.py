@@ -0,0 +1,115 @@
+"""
+What-if simulation of a rule pack change over the archived assessments.
+
+    python simulate_rules.py candidate_pack.json [--archive cache/match_archive.sqlite] [--limit N] [--show 20]
+    python simulate_rules.py --backfill output [--archive cache/match_archive.sqlite]
+
+Copy rules/hard_stops.json, edit the patterns (e.g. \\bEAR\\b or military\\s+specification)
+and pass the copy: every opportunity in the match archive (filled by the pipeline, see
+filters/rule_simulator.py) is re-assessed under the current pack and under the copy, as of
+the day it was first assessed, and the decisions are compared. Patterns the edit did not
+touch are answered from the archived match index, so only the edited ones search the
+stored texts. Nothing is downloaded or extracted.
+
+--backfill archives the assessments the pipeline saved as JSON in a directory
+(output/<id>.json with the full analysis text), for records assessed before the archive
+existed. Records rejected by the metadata pre-screen have no document text and are skipped.
+"""
+
+import os
+import sys
+import glob
+import json
+import logging
+from datetime import date
+
+from filters.initial_checklist_v2 import CheckResult, Decision, InitialChecklistFilterV2
+from filters.rule_pack import RulePack
+from filters.rule_simulator import MatchArchive, RuleSimulator
+
+DEFAULT_ARCHIVE = os.path.join('cache', 'match_archive.sqlite')
+
+
+def option(args, name, default):
+    return type(default)(args[args.index(name) + 1]) if name in args else default
+
+
+def decision_from(value) -> Decision:
+    """Decision from a saved value ("NO-GO", or "Decision.NO_GO" as json.dump(default=str) writes it)."""
+    if isinstance(value, str) and value.startswith('Decision.'):
+        return Decision[value.split('.', 1)[1]]
+    return Decision(value)
+
+
+def backfill(archive: MatchArchive, directory: str) -> None:
+    filter_logic = InitialChecklistFilterV2()
+    archived = skipped = 0
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                saved = json.load(f)
+            opp = saved['original_opportunity']
+        except (OSError, ValueError, KeyError, TypeError):
+            skipped += 1
+            continue
+        text = opp.get('full_analysis_text')
+        if not saved.get('rag_processed', True) or not text:
+            skipped += 1
+            continue
+        results = [CheckResult(detail['check_name'], decision_from(detail['decision']), detail['reason'],
+                               detail.get('quote', ''))
+                   for detail in saved.get('assessment_details', [])]
+        archive.record(saved['opportunity_id'], opp, text, decision_from(saved['final_decision']), results,
+                       filter_logic, assessed_on=date.fromtimestamp(os.path.getmtime(path)))
+        archived += 1
+    print(f"Archived {archived} assessments from {directory} ({skipped} skipped); {len(archive)} in {archive.path}")
+
+
+def main():
+    args = sys.argv[1:]
+    logging.disable(logging.INFO)
+    packs = [arg for arg in args if arg.endswith('.json') and os.path.isfile(arg)]
+    if not packs and '--backfill' not in args:
+        sys.exit(__doc__)
+    archive = MatchArchive(option(args, '--archive', DEFAULT_ARCHIVE))
+    if '--backfill' in args:
+        backfill(archive, option(args, '--backfill', 'output'))
+        return
+
+    candidate = RulePack.load(packs[0])
+    limit = option(args, '--limit', 0) or None
+    simulator = RuleSimulator(archive)
+    report = simulator.simulate(candidate, limit=limit)
+    if not report.records:
+        sys.exit(f"No archived assessments in {archive.path} (run the pipeline, or --backfill output)")
+
+    print(f"{len(report.records)} archived opportunities re-assessed in {report.seconds:.2f}s: "
+          f"{report.restored} pattern results taken from the archive, {report.searched} searches of stored text")
+    print(f"Baseline: {simulator.baseline_pack.path}   Candidate: {candidate.path}\n")
+
+    decisions = [Decision.GO.value, Decision.NEEDS_ANALYSIS.value, Decision.NO_GO.value]
+    table = report.diff_table()
+    header = f"{'baseline / candidate':<22}" + ''.join(f"{decision:>16}" for decision in decisions) + f"{'total':>8}"
+    print(header)
+    print('-' * len(header))
+    for baseline in decisions:
+        row = [table[(baseline, candidate_decision)] for candidate_decision in decisions]
+        print(f"{baseline:<22}" + ''.join(f"{count:>16}" for count in row) + f"{sum(row):>8}")
+    print('-' * len(header))
+    totals = [sum(table[(baseline, decision)] for baseline in decisions) for decision in decisions]
+    print(f"{'total':<22}" + ''.join(f"{count:>16}" for count in totals) + f"{sum(totals):>8}")
+
+    changed = report.changed()
+    print(f"\n{len(changed)} of {len(report.records)} change decision or deciding check")
+    for record in changed[:option(args, '--show', 20)]:
+        note = '  (text stops at a streamed hard stop)' if record.partial else ''
+        print(f"  {record.opp_id}: {record.baseline} [{record.baseline_check or '-'}] -> "
+              f"{record.candidate} [{record.candidate_check or '-'}] {record.candidate_reason}{note}")
+    drifted = report.drifted()
+    if drifted:
+        print(f"\n{len(drifted)} records are decided differently by the current rules than when archived "
+              f"(rules or checks changed since), e.g. {', '.join(record.opp_id for record in drifted[:3])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""
+Regex worst-case performance suite for the filter patterns.
+Feeds adversarial ~1 MB inputs (keyword floods, endless name runs, random PDF-like noise)
+to every compiled pattern of the checklist filters and fails if any pattern takes longer
+than the time budget on any input, or if its time grows faster than the input (each input
+is also timed at a quarter of its size: linear patterns take ~4x longer on the full input,
+backtracking ones 16x or more). Each pattern runs in a child process, so a catastrophically
+backtracking pattern is killed and reported instead of hanging the run. Extent patterns, which
+are only ever matched at a known start on a bounded slice, are timed per match() instead.
+Also checks that check 2 (sole source) still reaches the labeled decisions and reasons.
+
+    python test_regex_performance.py
+    python -m pytest test_regex_performance.py
+
+Environment overrides: REGEX_TIME_BUDGET (seconds, default 2.0; 4.0 on RE2), REGEX_INPUT_BYTES
+(default 1 MiB), REGEX_FUZZ_SEED (default 1234). SOS_REGEX_BACKEND=re times the patterns on
+the stdlib engine even when google-re2 is installed.
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import multiprocessing
+from typing import Dict, List, Tuple
+
+from filters.initial_checklist_v2 import InitialChecklistFilterV2, Decision
+from filters.sos_official_filter import SOSFilter
+from filters.regex_backend import COMPILED_TYPES, DEFAULT_BACKEND, CompiledPattern
+from filters.linear_patterns import EXTENT_MAX
+
+# The google-re2 binding spends a few microseconds of Python per match, so match-dense floods
+# take longer on RE2 than on re (still linear: at most one match per character)
+DEFAULT_TIME_BUDGET = '4.0' if DEFAULT_BACKEND.engine == 're2' else '2.0'
+TIME_BUDGET = float(os.getenv('REGEX_TIME_BUDGET', DEFAULT_TIME_BUDGET))
+INPUT_BYTES = int(os.getenv('REGEX_INPUT_BYTES', str(1024 * 1024)))
+FUZZ_SEED = int(os.getenv('REGEX_FUZZ_SEED', '1234'))
+# A pattern still running this long past the budget is killed (and fails)
+KILL_AFTER = TIME_BUDGET * 5 + 5
+# Full-size time / quarter-size time above this is super-linear; below GROWTH_MIN_SECONDS
+# the timings are too small to compare
+GROWTH_LIMIT = 8.0
+GROWTH_MIN_SECONDS = 0.2
+
+# Extent patterns (RulePack.extent) are never searched: a check match()es them once, at the start
+# of a match, on at most EXTENT_MAX characters. They are timed that way, at the first
+# ANCHORED_STARTS offsets of each input, against a budget per match() call
+ANCHORED_PATTERNS = ('InitialChecklistFilterV2.sole_source_extent_regex',)
+ANCHORED_STARTS = 64
+ANCHORED_TIME_BUDGET = TIME_BUDGET / 20
+
+# Check 2 examples with the decision and reason they must keep. The later ones have a repeated
+# leading phrase or a company name run past the bounded name length: the follow-up patterns must
+# still see the quote the unbounded patterns gave (see _sole_source_quote)
+SOLE_SOURCE_LABELED_EXAMPLES = [
+    ("This requirement is sole source to Lockheed Martin Corporation for C-130 parts.", Decision.NO_GO, "Sole source to"),
+    ("The item will be procured single source to Acme Aerospace Inc under FAR 6.302-1.", Decision.NO_GO, "Sole source to"),
+    ("Parts are only available from General Electric Company per the approved source list.", Decision.NO_GO, "Sole source to"),
+    ("This is a sole source procurement for F-16 landing gear.", Decision.NO_GO, "Absolute sole source"),
+    ("This procurement is sole source due to urgency.", Decision.NO_GO, "Absolute sole source"),
+    ("Parts shall be manufactured, tested and inspected in accordance with Boeing Company drawing number 12345.", Decision.NO_GO, "Manufacturer-specific requirement"),
+    ("Manufacture in accordance with Sikorsky Aircraft Corporation drawing number 70400-08100.", Decision.NO_GO, "Manufacturer-specific requirement"),
+    ("Bell Textron Inc. drawing number 412-040-100 applies to this NSN.", Decision.NO_GO, "Manufacturer-specific requirement"),
+    ("The item is a proprietary design of Honeywell International Inc and no data is available.", Decision.NO_GO, "Proprietary design restriction"),
+    ("The Government intends to sole source this requirement. Only known source is Collins.", Decision.NO_GO, "Actual restriction"),
+    ("Notice of intent to sole source to Boeing for KC-46 spares.", Decision.PASS, "Normal government award"),
+    ("The Government intends to award on a sole source basis; interested parties may respond.", Decision.PASS, "Standard sole source language"),
+    ("Brand name or equal items are acceptable for this aviation requirement.", Decision.PASS, "Brand name or equal"),
+    ("Offer parts that are or equal to the specified hydraulic pump.", Decision.PASS, "Brand name or equal"),
+    ("Justification: only one responsible source and no other supplies will satisfy.", Decision.PASS, "Standard sole source language"),
+    ("A brand name justification is attached for the avionics display.", Decision.PASS, "Standard sole source language"),
+    ("Full and open competition. All responsible sources may submit a quote for aircraft parts.", Decision.PASS, "No sole source restrictions"),
+    ("RFQ for C-130 aircraft spare parts. All responsible sources may submit quotes. Government owns technical data.", Decision.PASS, "No sole source restrictions"),
+    ("Intent to sole source to Boeing for KC-46 Pegasus spare parts. Brand name or equal may be acceptable.", Decision.PASS, "Normal government award"),
+    ("Brand name or equal: none. No brand name or equal, this is a sole source procurement.", Decision.NO_GO, "Absolute sole source"),
+    ("Brand name or equal: N/A. No brand name or equal - sole source to Acme Corp.", Decision.NO_GO, "Sole source to"),
+    ("This requirement is sole source to Boeing Company and its authorized repair stations and distributors in "
+     "the United States and Canada, including Source One Spares LLC", Decision.PASS, "Standard sole source language"),
+    ("Parts are only available from Bell Textron Inc and its authorized distributors and repair stations in the "
+     "United States including Source One Spares LLC. This is a sole source procurement.",
+     Decision.NO_GO, "Absolute sole source"),
+    ("Parts are only available from Bell Textron Inc and its authorized distributors and repair stations in the "
+     "United States including Source One Spares LLC. Other sole source items follow.",
+     Decision.PASS, "Standard sole source language"),
+]
+
+
+def filter_patterns() -> Dict[str, CompiledPattern]:
+    """Every compiled pattern held by the checklist filters, keyed by owner and attribute."""
+    patterns: Dict[str, CompiledPattern] = {}
+    seen = set()
+
+    def add(name, regex):
+        key = (regex.pattern, getattr(regex, 'flags', 0))
+        if key not in seen:
+            seen.add(key)
+            patterns[name] = regex
+
+    for owner in (InitialChecklistFilterV2(), SOSFilter()):
+        prefix = type(owner).__name__
+        for attribute, value in sorted(vars(owner).items()):
+            if isinstance(value, COMPILED_TYPES):
+                add(f"{prefix}.{attribute}", value)
+            elif isinstance(value, (list, tuple)):
+                for position, item in enumerate(value):
+                    if isinstance(item, COMPILED_TYPES):
+                        add(f"{prefix}.{attribute}[{position}]", item)
+        scan_engine = getattr(owner, 'scan_engine', None)
+        if scan_engine is not None:
+            for name, regex in scan_engine.patterns.items():
+                add(f"{prefix}.scan_engine[{name}]", regex)
+    return patterns
+
+
+def _repeat(unit: str, size: int) -> str:
+    return (unit * (size // max(len(unit), 1) + 1))[:size]
+
+
+def _top_level_alternatives(pattern: str) -> List[str]:
+    """Split a pattern on '|' outside groups and character classes."""
+    alternatives, current = [], []
+    depth, in_class, escaped = 0, False, False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            alternatives.append(''.join(current))
+            current = []
+            continue
+        current.append(char)
+    alternatives.append(''.join(current))
+    return alternatives
+
+
+def _words(pattern: str) -> List[str]:
+    """Literal words of a pattern, with escapes such as \\s and \\b removed."""
+    return re.findall(r'[A-Za-z]{2,}', re.sub(r'\\[A-Za-z]', ' ', pattern))
+
+
+# Alternatives with a repeated wildcard or character class (".*", "[...]+", ".{0,500}") can backtrack
+_REPEATED_RUN = re.compile(r'(?:\.|\])[*+{]')
+
+
+def adversarial_inputs(regex: CompiledPattern, size: int, seed: int) -> Dict[str, str]:
+    """Inputs built to make this pattern backtrack: floods of its own words that never complete a match."""
+    rng = random.Random(seed)
+    words = _words(regex.pattern) or ['source']
+    vocabulary = words + ['the', 'parts', 'aircraft', 'shall', 'be', 'Inc', 'Company', 'drawing', 'number', 'source']
+
+    noise_chars = 'abcdefghijklmnopqrstuvwxyz ABCDEFGHIJKLMNOPQRSTUVWXYZ,.&-/()0123456789\n'
+    pdf_words = []
+    length = 0
+    while length < size:
+        word = rng.choice(vocabulary)
+        if rng.random() < 0.05:
+            word += rng.choice(['.', ',', ' -', ' 12', '\n'])
+        pdf_words.append(word)
+        length += len(word) + 1
+
+    inputs = {
+        'name_run': _repeat('abc def ghi jkl, mno. ', size),
+        'suffix_flood': _repeat('Acme Inc Company Corp LLC ', size),
+        'words_flood': _repeat(' '.join(words) + ' , ', size),
+        'random_chars': ''.join(rng.choice(noise_chars) for _ in range(size)),
+        'pdf_noise': ' '.join(pdf_words)[:size],
+    }
+
+    # Per risky alternative: its leading word alone, and all its words but the last, repeated
+    # on one line so every partial match runs to the end of the input before failing
+    for position, alternative in enumerate(_top_level_alternatives(regex.pattern)):
+        alternative_words = _words(alternative)
+        if not _REPEATED_RUN.search(alternative) or not alternative_words:
+            continue
+        inputs[f'alt{position}_anchor_flood'] = _repeat(alternative_words[0] + ' ', size)
+        inputs[f'alt{position}_partial_flood'] = _repeat(' '.join(alternative_words[:-1] or alternative_words) + ' ', size)
+        inputs[f'alt{position}_partial_lines'] = _repeat(' '.join(alternative_words[:-1] or alternative_words) + '\n', size)
+    return inputs
+
+
+def _scan_seconds(regex: CompiledPattern, text: str) -> float:
+    start = time.perf_counter()
+    for _ in regex.finditer(text):
+        pass
+    return time.perf_counter() - start
+
+
+def _anchored_seconds(regex: CompiledPattern, text: str) -> float:
+    """Slowest single match() of at most EXTENT_MAX characters at the first ANCHORED_STARTS offsets."""
+    slowest = 0.0
+    for start in range(min(ANCHORED_STARTS, len(text))):
+        started = time.perf_counter()
+        regex.match(text, start, min(len(text), start + EXTENT_MAX))
+        slowest = max(slowest, time.perf_counter() - started)
+    return slowest
+
+
+def _time_pattern(regex: CompiledPattern, size: int, seed: int, connection, anchored: bool = False) -> None:
+    """
+    Child process: time one full scan (finditer) of every adversarial input and of its first
+    quarter; anchored patterns report their slowest match() for both.
+    """
+    for input_name, text in adversarial_inputs(regex, size, seed).items():
+        connection.send((input_name, None, None))  # started
+        if anchored:
+            seconds = _anchored_seconds(regex, text)
+            connection.send((input_name, seconds, seconds))
+            continue
+        quarter = _scan_seconds(regex, text[:len(text) // 4])
+        connection.send((input_name, quarter, _scan_seconds(regex, text)))
+    connection.close()
+
+
+def measure(regex: CompiledPattern, size: int = INPUT_BYTES, seed: int = FUZZ_SEED,
+            anchored: bool = False) -> List[Tuple[str, float, float]]:
+    """
+    (input name, quarter-size seconds, full-size seconds) per adversarial input;
+    float('inf') if the pattern had to be killed. anchored: time match() calls instead of scans.
+    """
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_time_pattern, args=(regex, size, seed, sender, anchored))
+    process.start()
+    sender.close()
+
+    timings = []
+    current = None
+    while True:
+        if not receiver.poll(KILL_AFTER):
+            process.kill()
+            timings.append((current or 'input generation', float('inf'), float('inf')))
+            break
+        try:
+            input_name, quarter, full = receiver.recv()
+        except EOFError:
+            break
+        if full is None:
+            current = input_name
+        else:
+            timings.append((input_name, quarter, full))
+            current = None
+    process.join()
+    return timings
+
+
+def _growth(quarter: float, full: float) -> float:
+    if full == float('inf'):
+        return full
+    if full < GROWTH_MIN_SECONDS:
+        return 0.0
+    return full / max(quarter, 1e-9)
+
+
+def budget_violations() -> List[str]:
+    violations = []
+    for name, regex in filter_patterns().items():
+        if name in ANCHORED_PATTERNS:
+            timings = measure(regex, size=EXTENT_MAX + ANCHORED_STARTS, anchored=True)
+            worst_input, _, worst = max(timings, key=lambda item: item[2])
+            status = 'OK  ' if worst <= ANCHORED_TIME_BUDGET else 'SLOW'
+            print(f"{status} {worst:8.3f}s  {DEFAULT_BACKEND.engine_of(regex):3}  {name}  (worst input: {worst_input}; per match())")
+            if worst > ANCHORED_TIME_BUDGET:
+                violations.append(f"{name}: {worst:.3f}s per match() on {worst_input} (budget {ANCHORED_TIME_BUDGET}s)")
+            continue
+        timings = measure(regex)
+        worst_input, _, worst = max(timings, key=lambda item: item[2])
+        growth_input, quarter, full = max(timings, key=lambda item: _growth(item[1], item[2]))
+        growth = _growth(quarter, full)
+        status = 'OK  ' if worst <= TIME_BUDGET and growth <= GROWTH_LIMIT else 'SLOW'
+        print(f"{status} {worst:8.3f}s  {DEFAULT_BACKEND.engine_of(regex):3}  {name}  (worst input: {worst_input}; growth x{growth:.1f})")
+        if worst > TIME_BUDGET:
+            violations.append(f"{name}: {worst:.3f}s on {worst_input} (budget {TIME_BUDGET}s)")
+        elif growth > GROWTH_LIMIT:
+            violations.append(f"{name}: {quarter:.3f}s -> {full:.3f}s on {growth_input} at 4x the input (super-linear)")
+    return violations
+
+
+def test_filter_patterns_within_budget():
+    violations = budget_violations()
+    assert not violations, "Patterns over the time budget:\n" + "\n".join(violations)
+
+
+def test_sole_source_labeled_decisions():
+    filter_logic = InitialChecklistFilterV2()
+    mismatches = []
+    for text, expected, reason in SOLE_SOURCE_LABELED_EXAMPLES:
+        result = filter_logic.check_2_sole_source(text)
+        if result.decision != expected or not result.reason.startswith(reason):
+            mismatches.append(f"{expected.value} ({reason}...) expected, got {result.decision.value} ({result.reason}): {text}")
+    assert not mismatches, "\n".join(mismatches)
+
+
+if __name__ == "__main__":
+    print(f"=== REGEX WORST-CASE SUITE ({INPUT_BYTES:,} byte inputs, {TIME_BUDGET}s budget, {DEFAULT_BACKEND.engine} backend) ===")
+    failures = budget_violations()
+    try:
+        test_sole_source_labeled_decisions()
+        print("\nLabeled sole source decisions: OK")
+    except AssertionError as e:
+        failures.append(f"Labeled decisions changed:\n{e}")
+    if failures:
+        print("\nFAILED:\n" + "\n".join(failures))
+        sys.exit(1)
+    print("\nAll filter patterns within budget")
@@ -0,0 +1,99 @@
+"""
+Circuit breaker behaviour of the HigherGov client's request loop.
+A half-open trial must be released on every outcome: a 4xx answer closes the circuit
+(the API is up, the request was wrong) and an unexpected exception counts as a failure,
+so the breaker never stays half-open with a trial that will never report back.
+
+    python test_resilience.py
+    python -m pytest test_resilience.py
+"""
+
+import sys
+
+import requests
+
+from api_clients.highergov_client_enhanced import EnhancedHigherGovClient
+from api_clients.resilience import CircuitBreaker, CircuitOpenError
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class FakeSession:
+    """Answers each GET with the next scripted status code, or raises it if it is an exception."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return FakeResponse(outcome)
+
+
+def half_open_client(trial_outcome):
+    """A client whose breaker has just been opened by 5xx answers and is due a trial."""
+    client = EnhancedHigherGovClient(api_key='test', max_retries=0, requests_per_second=1000)
+    client.circuit_breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    client.session = FakeSession([503, 503, trial_outcome, 200])
+    for _ in range(2):
+        try:
+            client._send_with_retries('http://api.test/opportunity/', {})
+        except Exception:
+            pass
+    assert client.circuit_breaker.state == 'open'
+    return client
+
+
+def test_half_open_trial_4xx_closes_circuit():
+    client = half_open_client(404)
+    try:
+        client._send_with_retries('http://api.test/opportunity/', {})
+        raise AssertionError("a 404 must still raise HTTPError")
+    except requests.exceptions.HTTPError:
+        pass
+    assert client.circuit_breaker.state == 'closed'
+    assert client._send_with_retries('http://api.test/opportunity/', {}).status_code == 200
+
+
+def test_half_open_trial_unexpected_exception_counts_as_failure():
+    client = half_open_client(ValueError("malformed response"))
+    client.circuit_breaker.reset_timeout = 60
+    client.circuit_breaker._opened_at -= 60
+    try:
+        client._send_with_retries('http://api.test/opportunity/', {})
+        raise AssertionError("the unexpected exception must propagate")
+    except ValueError:
+        pass
+    # The trial reported back as a failure: the circuit re-opened instead of staying half-open
+    assert client.circuit_breaker.state == 'open'
+    assert not client.circuit_breaker._trial_in_flight
+    try:
+        client._send_with_retries('http://api.test/opportunity/', {})
+        raise AssertionError("a re-opened circuit must fail fast")
+    except CircuitOpenError:
+        pass
+    assert client.session.calls == 3
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_half_open_trial_4xx_closes_circuit,
+                 test_half_open_trial_unexpected_exception_counts_as_failure):
+        try:
+            test()
+            print(f"PASS {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
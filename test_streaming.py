@@ -0,0 +1,73 @@
+"""
+Early NO-GO of the streaming assessment (filters/streaming.py).
+A definitive hard stop found in the text received so far must be reported with the result
+list the batch path builds on that text: the Phase 0 gates first, so an expired or
+non-aviation opportunity keeps its Phase 0 reason, then the Phase 1 checks in order.
+
+    python test_streaming.py
+    python -m pytest test_streaming.py
+"""
+
+import sys
+import logging
+
+from filters.initial_checklist_v2 import Decision, InitialChecklistFilterV2
+from filters.streaming import EARLY_EXIT_NOTE, StreamingAssessment
+
+logging.disable(logging.INFO)
+
+FILTER = InitialChecklistFilterV2()
+DESCRIPTION = 'RFQ for aircraft landing gear actuator spare parts.'
+HARD_STOP = '\nFactory new only. No refurbished parts.'
+
+
+def stream(opp, sections):
+    assessment = StreamingAssessment(FILTER, opp)
+    stopped = [assessment.feed(section) for section in sections]
+    return assessment, stopped
+
+
+def summary(results):
+    return [(result.check_name, result.decision, result.reason.replace(EARLY_EXIT_NOTE, ''))
+            for result in results]
+
+
+def test_early_no_go_keeps_phase_0_results():
+    opp = {'due_date': '2099-01-01'}
+    assessment, stopped = stream(opp, [DESCRIPTION, HARD_STOP, '\nNever read.'])
+    assert stopped == [False, True, True]
+    assert assessment.cancel.is_set()
+    decision, results = assessment.result()
+    assert decision == Decision.NO_GO
+    assert [result.check_name[:3] for result in results[:3]] == ['0.1', '0.2', '0.3']
+    assert results[-1].reason.endswith(EARLY_EXIT_NOTE)
+    assert summary(results) == summary(FILTER.assess_opportunity(opp, text=assessment.text)[1])
+
+
+def test_early_no_go_reports_expired_opportunity_first():
+    opp = {'due_date': '2001-01-01'}
+    assessment, _ = stream(opp, [DESCRIPTION, HARD_STOP])
+    decision, results = assessment.result()
+    assert decision == Decision.NO_GO
+    assert [(result.check_name[:3], result.decision) for result in results] == \
+        [('0.1', Decision.PASS), ('0.2', Decision.NO_GO)]
+
+
+def test_text_is_the_sections_in_order():
+    assessment, _ = stream({'due_date': '2099-01-01'}, [DESCRIPTION, '\nSecond.', '\nThird.'])
+    assert not assessment.early_exit
+    assert assessment.text == DESCRIPTION + '\nSecond.\nThird.'
+
+
+if __name__ == "__main__":
+    failed = 0
+    for test in (test_early_no_go_keeps_phase_0_results,
+                 test_early_no_go_reports_expired_opportunity_first,
+                 test_text_is_the_sections_in_order):
+        try:
+            test()
+            print(f"PASS {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)